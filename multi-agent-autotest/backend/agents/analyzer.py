@@ -1,38 +1,172 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
-from prompts.loader import render
+from agents.llm import ainvoke, model_for
+from prompts.loader import render, template_hash
+from tools.ast_analyzer import VERSION as AST_VERSION, extract_functions
+from tools.cache import get_cache, sha256
+import asyncio
 import json
 import os
 
+# Chamadas simultâneas ao LLM feitas por um mesmo run do Analisador
+CONCURRENCY = int(os.getenv("ANALYZER_CONCURRENCY", "8"))
+CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
 
-def analyze_code(state: dict) -> dict:
+# Modos do Analisador:
+#   - llm: o LLM extrai tudo a partir do código (analyzer.j2)
+#   - hybrid: estrutura via `ast`, o LLM completa descrição e edge cases
+#   - fast: apenas `ast`, sem chamada ao LLM
+MODE = os.getenv("ANALYZER_MODE", "hybrid")
+TEMPLATES = {"llm": "analyzer.j2", "hybrid": "analyzer_enrich.j2"}
+
+
+async def _invoke(
+    semaphore: asyncio.Semaphore,
+    filename: str,
+    prompt: str
+) -> list | None:
+    """
+    Chama o LLM (timeout e retry ficam em agents/llm.py) e devolve a lista
+    `functions` da resposta. Retorna None em caso de falha definitiva ou de
+    resposta inválida — JSON malformado ou fora do formato
+    {"functions": [{...}, ...]}.
+    """
+    async with semaphore:
+        try:
+            response = await ainvoke("analyzer", [HumanMessage(content=prompt)])
+        except Exception as e:
+            print(f"[Analyzer] LLM call failed for {filename}: {e!r}")
+            return None
+
+    try:
+        parsed = json.loads(response.content)
+    except (json.JSONDecodeError, TypeError):
+        print(f"[Analyzer] Failed to parse response for {filename}")
+        return None
+    functions = parsed.get("functions") if isinstance(parsed, dict) else None
+    if not isinstance(functions, list) or not all(isinstance(f, dict) for f in functions):
+        print(f"[Analyzer] Unexpected response format for {filename}")
+        return None
+    return functions
+
+
+def _merge_enrichment(functions: list[dict], enriched: list[dict]) -> list[dict]:
+    # Casa as respostas do LLM com as funções extraídas por (classe, nome)
+    by_key = {(f.get("class"), f.get("name")): f for f in enriched}
+    merged = []
+    for function in functions:
+        extra = by_key.get((function["class"], function["name"]), {})
+        merged.append({
+            **function,
+            "description": extra.get("description") or function["description"],
+            "edge_cases": extra.get("edge_cases") or function["edge_cases"],
+        })
+    return merged
+
+
+async def _analyze_file(
+    semaphore: asyncio.Semaphore,
+    filename: str,
+    content: str,
+    mode: str
+) -> tuple[list, bool]:
+    """
+    Analisa um único arquivo no modo configurado.
+
+    No modo hybrid, arquivos que o `ast` não consegue parsear caem para o
+    modo llm. Se o enriquecimento pelo LLM falhar, ficam as funções
+    extraídas pelo `ast`, sem descrição nem edge cases do LLM.
+
+    Retorna as funções e se a análise está completa (e pode ir para o cache).
+    """
+    if mode == "hybrid":
+        try:
+            functions = extract_functions(content)
+        except SyntaxError:
+            mode = "llm"
+
+    if mode == "hybrid":
+        if not functions:
+            return functions, True
+        prompt = render(
+            "analyzer_enrich.j2",
+            filename=filename,
+            content=content,
+            functions=functions
+        )
+        enriched = await _invoke(semaphore, filename, prompt)
+        if enriched is None:
+            return functions, False
+        return _merge_enrichment(functions, enriched), True
+
+    # Renderiza o prompt com as variáveis do arquivo atual
+    prompt = render("analyzer.j2", filename=filename, content=content)
+    functions = await _invoke(semaphore, filename, prompt)
+    return functions or [], functions is not None
+
+
+async def analyze_code(state: dict) -> dict:
     """
     Agente Analisador — lê os arquivos .py e produz um mapa estruturado.
 
+    Em ANALYZER_MODE=hybrid (padrão) nome, parâmetros, tipos e dependências
+    saem do `ast` e o LLM só preenche descrição e edge cases; em fast o LLM
+    não é chamado; em llm o comportamento é o original (analyzer.j2).
+
+    Os arquivos são analisados em paralelo (até ANALYZER_CONCURRENCY chamadas
+    simultâneas ao LLM), então o tempo da etapa acompanha o arquivo mais lento
+    e não a soma de todos. A ordem de `analysis` segue a ordem de `files`.
+
+    Arquivos já analisados (mesmo conteúdo, mesma versão do prompt e do
+    tools/ast_analyzer.py e mesmo modelo) vêm do cache persistente em
+    tools/cache.py.
+
     Recebe do state:
         - files: dict[str, str] — {nome_arquivo: conteúdo}
 
     Adiciona ao state:
         - analysis: dict[str, list] — {nome_arquivo: [funções analisadas]}
     """
-    llm = ChatOpenAI(
-    model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-    temperature=0
-    )
     files: dict[str, str] = state["files"]
-    analysis = {}
 
-    for filename, content in files.items():
-        # Renderiza o prompt com as variáveis do arquivo atual
-        prompt = render("analyzer.j2", filename=filename, content=content)
+    if MODE == "fast":
+        # Sem LLM não há o que cachear: a extração leva milissegundos
+        analysis = {}
+        for filename, content in files.items():
+            try:
+                analysis[filename] = extract_functions(content)
+            except SyntaxError:
+                print(f"[Analyzer] Failed to parse {filename}")
+                analysis[filename] = []
+        return {**state, "analysis": analysis}
 
-        response = llm.invoke([HumanMessage(content=prompt)])
+    model = model_for("analyzer")
+    semaphore = asyncio.Semaphore(CONCURRENCY)
 
-        try:
-            parsed = json.loads(response.content)
-            analysis[filename] = parsed["functions"]
-        except json.JSONDecodeError:
-            analysis[filename] = []
-            print(f"[Analyzer] Failed to parse response for {filename}")
+    # Cache por conteúdo: mesmo arquivo + mesma versão do prompt (e, no modo
+    # hybrid, da extração via ast) + mesmo modelo reaproveita a análise
+    # anterior sem chamar o LLM. O cache é SQLite: leitura e gravação rodam
+    # fora do event loop
+    cache = get_cache("analysis", CACHE_MAX_ENTRIES)
+    prompt_version = template_hash(TEMPLATES[MODE])
+    ast_version = AST_VERSION if MODE == "hybrid" else ""
+    keys = {
+        filename: sha256(sha256(content), MODE, prompt_version, ast_version, model)
+        for filename, content in files.items()
+    }
+    cached = await asyncio.to_thread(
+        lambda: {filename: cache.get(key) for filename, key in keys.items()}
+    )
+
+    pending = [filename for filename, value in cached.items() if value is None]
+    results = await asyncio.gather(*(
+        _analyze_file(semaphore, filename, files[filename], MODE)
+        for filename in pending
+    ))
+    for filename, (functions, complete) in zip(pending, results):
+        if complete:
+            await asyncio.to_thread(cache.set, keys[filename], functions)
+        cached[filename] = functions
+
+    analysis = {filename: cached[filename] for filename in files}
 
-    return {**state, "analysis": analysis}
\ No newline at end of file
+    return {**state, "analysis": analysis}
@@ -1,11 +1,22 @@
 from langgraph.graph import StateGraph, END
 from typing import TypedDict
+from dataclasses import asdict
 from agents.analyzer import analyze_code
 from agents.writer import write_tests
 from agents.reviewer import review_coverage
-from tools.executor import run_tests
-import tempfile
-import shutil
+from agents import llm
+from tools import metrics
+from tools.coverage_html import save_sources
+from tools.dependencies import resolve as resolve_dependencies
+from tools.executor import TESTS_FILE, run_tests
+from tools.impact import plan_delta
+from tools.line_ranges import LineRanges, to_json
+from tools.sandbox import backend_name, get_backend
+from tools.shards import load_durations
+from tools.workspace import materialize
+import asyncio
+import os
+import time
 import uuid
 from pathlib import Path
 
@@ -20,65 +31,156 @@ class AgentState(TypedDict):
     review_reason: str
     generated_tests: str
     coverage_pct: float
-    uncovered_lines: dict[str, list[int]]
+    uncovered_lines: dict[str, LineRanges]
     tests_passed: int
     tests_failed: int
+    failed_tests: list[str]
+    test_errors: str | None
     report_url: str
     report: dict
+    metrics: dict[str, dict]
+    report_dirs: list[str]
 
 
-# Pasta fixa onde os reports HTML ficam salvos
-REPORTS_DIR = Path(__file__).parent.parent / "reports"
-REPORTS_DIR.mkdir(exist_ok=True)
+# Pasta onde os reports HTML ficam salvos
+REPORTS_DIR = Path(os.getenv("REPORTS_DIR", Path(__file__).parent.parent / "reports"))
+REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def execute_tests(state: AgentState) -> AgentState:
-    code_dir = tempfile.mkdtemp()
-
+async def execute_tests(state: AgentState) -> AgentState:
     # Diretório nomeado com UUID para não sobrescrever runs anteriores
     run_id = uuid.uuid4().hex[:8]
     tests_dir = REPORTS_DIR / f"run_{run_id}"
-    tests_dir.mkdir(exist_ok=True)
-
-    try:
-        # Salva o código do usuário
-        for filename, content in state["files"].items():
-            filepath = Path(code_dir) / filename
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            filepath.write_text(content)
-
-        # Salva os testes gerados
-        tests_file = tests_dir / "test_generated.py"
-        tests_file.write_text(state["generated_tests"])
-
-        result = run_tests(code_dir, str(tests_dir))
-
-        report = {
-            "coverage_pct": result.coverage_pct,
-            "uncovered_lines": result.uncovered_lines,
-            "iteration": state["iteration"] + 1,
-            "review_reason": state.get("review_reason", ""),
-            "tests_code": state["generated_tests"],
-            "success": result.success,
-            "error": result.error_output,
-            "tests_passed": result.tests_passed,
-            "tests_failed": result.tests_failed,
-            "report_url": f"/reports/run_{run_id}/htmlcov/index.html",
-            "failed_tests": result.failed_tests or []
-        }
-
-        return {
-            **state,
-            "coverage_pct": result.coverage_pct,
-            "uncovered_lines": result.uncovered_lines,
-            "iteration": state["iteration"] + 1,
-            "tests_passed": result.tests_passed,
-            "tests_failed": result.tests_failed,
-            "report_url": f"/reports/run_{run_id}/htmlcov/index.html",
-            "report": report
+    await asyncio.to_thread(tests_dir.mkdir, exist_ok=True)
+
+    # Código do usuário: o workspace é montado na primeira iteração e
+    # reaproveitado nas seguintes (só o arquivo de testes muda)
+    workspace, written = await asyncio.to_thread(materialize, state["files"])
+    code_dir = str(workspace)
+
+    # Pacotes de terceiros importados pelo código, instalados no sandbox
+    dependencies = await resolve_dependencies(state["files"], backend_name())
+    backend = get_backend(dependencies=dependencies)
+
+    # Salva os testes gerados
+    tests_file = tests_dir / TESTS_FILE
+    await asyncio.to_thread(tests_file.write_text, state["generated_tests"])
+
+    # A partir da segunda iteração roda só os testes novos ou alterados,
+    # sobre o coverage da iteração anterior. As durações dela balanceiam
+    # os shards (SANDBOX_SHARDS)
+    delta, durations = None, {}
+    if state.get("report_dirs"):
+        previous_dir = Path(state["report_dirs"][-1])
+        # Leitura do .coverage e do junit.xml anteriores: fora do event loop
+        delta = await asyncio.to_thread(plan_delta, previous_dir, TESTS_FILE, state["generated_tests"])
+        durations = await asyncio.to_thread(load_durations, previous_dir / "junit.xml")
+
+    result = await run_tests(code_dir, str(tests_dir), backend, delta=delta, durations=durations)
+
+    # Fontes ao lado do .coverage: o HTML só é gerado se o report for aberto
+    await asyncio.to_thread(save_sources, tests_dir, state["files"])
+
+    # Testes e artefatos do pytest (coverage.xml, junit.xml, htmlcov)
+    written += await asyncio.to_thread(_tree_size, tests_dir)
+
+    # Linhas que a iteração cobriu em relação à anterior
+    previous = state.get("uncovered_lines", {})
+    newly_covered = {
+        filename: lines - result.uncovered_lines.get(filename, LineRanges())
+        for filename, lines in previous.items()
+    }
+
+    report = {
+        "coverage_pct": result.coverage_pct,
+        "uncovered_lines": to_json(result.uncovered_lines),
+        "newly_covered_lines": to_json({f: l for f, l in newly_covered.items() if l}),
+        "iteration": state["iteration"] + 1,
+        "review_reason": state.get("review_reason", ""),
+        "tests_code": state["generated_tests"],
+        "success": result.success,
+        "error": result.error_output,
+        "tests_passed": result.tests_passed,
+        "tests_failed": result.tests_failed,
+        "report_url": f"/reports/run_{run_id}/htmlcov/index.html",
+        "failed_tests": result.failed_tests or [],
+        "timings": result.timings,
+        "tests_run": result.tests_run,
+        "shards": result.shards,
+        "dependencies": {"installed": dependencies.requirements, "missing": dependencies.missing},
+        "files": {
+            filename: {**asdict(summary), "missing": str(summary.missing)}
+            for filename, summary in result.files.items()
+        },
+        "bytes_written": written
+    }
+
+    return {
+        **state,
+        "coverage_pct": result.coverage_pct,
+        "uncovered_lines": result.uncovered_lines,
+        "iteration": state["iteration"] + 1,
+        "tests_passed": result.tests_passed,
+        "tests_failed": result.tests_failed,
+        # O escritor descarta ou regenera os testes quebrados na próxima iteração
+        "failed_tests": result.failed_tests or [],
+        "test_errors": result.error_output,
+        "report_url": f"/reports/run_{run_id}/htmlcov/index.html",
+        "report": report,
+        # Pastas de todas as iterações, compactadas no fim do job
+        "report_dirs": [*state.get("report_dirs", []), str(tests_dir)]
+    }
+
+
+def _tree_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def instrumented(name: str, node):
+    """
+    Envolve um nó do grafo medindo tempo de parede e uso do LLM (latência,
+    chamadas e tokens) e, no executor, as fases do sandbox e os bytes
+    gravados. Os valores são somados por nó em state["metrics"] — que vai
+    para o relatório final — e exportados em /api/metrics.
+    """
+    async def run(state: AgentState) -> AgentState:
+        inicio = time.perf_counter()
+        with llm.track() as usage:
+            result = await node(state)
+        wall = time.perf_counter() - inicio
+
+        node_metrics = dict(state.get("metrics", {}).get(name, {}))
+        values = {
+            "calls": 1,
+            "wall_s": wall,
+            "llm_calls": usage.calls,
+            "llm_cache_hits": usage.cache_hits,
+            "llm_retries": usage.retries,
+            "llm_latency_s": usage.latency_total,
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
         }
-    finally:
-        shutil.rmtree(code_dir, ignore_errors=True)
+        if name == "executor":
+            report = result.get("report", {})
+            timings = report.get("timings", {})
+            values.update({
+                "sandbox_queue_s": timings.get("queue", 0.0),
+                "sandbox_startup_s": timings.get("startup", 0.0),
+                "sandbox_tests_s": timings.get("tests", 0.0),
+                "bytes_written": report.get("bytes_written", 0),
+            })
+            for phase in ("queue", "lease", "startup", "tests", "combine", "merge",
+                          "parse_coverage", "parse_junit"):
+                if phase in timings:
+                    metrics.sandbox_phase.observe(timings[phase], phase=phase)
+            metrics.bytes_written.inc(report.get("bytes_written", 0))
+        for key, value in values.items():
+            node_metrics[key] = round(node_metrics.get(key, 0) + value, 3)
+
+        metrics.node_duration.observe(wall, node=name)
+        return {**result, "metrics": {**state.get("metrics", {}), name: node_metrics}}
+
+    return run
 
 
 def should_continue(state: AgentState) -> str:
@@ -90,10 +192,10 @@ def should_continue(state: AgentState) -> str:
 def build_graph() -> StateGraph:
     graph = StateGraph(AgentState)
 
-    graph.add_node("analyzer", analyze_code)
-    graph.add_node("writer", write_tests)
-    graph.add_node("executor", execute_tests)
-    graph.add_node("reviewer", review_coverage)
+    graph.add_node("analyzer", instrumented("analyzer", analyze_code))
+    graph.add_node("writer", instrumented("writer", write_tests))
+    graph.add_node("executor", instrumented("executor", execute_tests))
+    graph.add_node("reviewer", instrumented("reviewer", review_coverage))
 
     graph.set_entry_point("analyzer")
     graph.add_edge("analyzer", "writer")
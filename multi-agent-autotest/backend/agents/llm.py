@@ -0,0 +1,315 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from pathlib import Path
+from tools.cache import get_cache, sha256
+from tools.limits import llm_limit
+from tools import metrics
+import asyncio
+import httpx
+import json
+import os
+import threading
+import time
+
+# Configuração das chamadas ao LLM, compartilhada por todos os agentes
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or None  # ex: servidor fake dos benchmarks
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_KEEPALIVE = float(os.getenv("LLM_KEEPALIVE", "60"))
+
+# Cache de respostas do LLM por (modelo, temperatura, prompt):
+#   - cache: usa o cache em disco (padrão) — só para temperatura 0; com
+#     amostragem, repetir o prompt deve poder trazer outra resposta
+#   - off: sempre chama o LLM
+#   - record: como cache, e grava cada resposta em LLM_FIXTURES_DIR
+#   - replay: responde só a partir de LLM_FIXTURES_DIR, sem rede
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "cache")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_FIXTURES_DIR = Path(os.getenv("LLM_FIXTURES_DIR", Path(__file__).parent.parent / "fixtures" / "llm"))
+
+# Temperatura de cada agente. O modelo vem de LLM_MODEL_<AGENTE> ou, se
+# ausente, de OPENAI_MODEL
+AGENTS = {
+    "analyzer": 0,
+    "writer": 0.2,
+    "reviewer": 0,  # decisão binária
+}
+
+
+def model_for(agent: str) -> str:
+    return os.getenv(f"LLM_MODEL_{agent.upper()}") or os.getenv("OPENAI_MODEL", "gpt-4o")
+
+
+_http_lock = threading.Lock()
+_http_clients: tuple[httpx.Client, httpx.AsyncClient] | None = None
+
+
+def _http() -> tuple[httpx.Client, httpx.AsyncClient]:
+    # Um pool de conexões HTTP por processo: as conexões (e o handshake TLS)
+    # são reaproveitadas entre chamadas, agentes e runs
+    global _http_clients
+    with _http_lock:
+        if _http_clients is None:
+            limits = httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE
+            )
+            _http_clients = (
+                httpx.Client(limits=limits, timeout=LLM_TIMEOUT),
+                httpx.AsyncClient(limits=limits, timeout=LLM_TIMEOUT),
+            )
+        return _http_clients
+
+
+def _openai(model: str, temperature: float) -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+
+    sync_client, async_client = _http()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        base_url=LLM_BASE_URL,
+        timeout=LLM_TIMEOUT,
+        max_retries=0,  # os retries são feitos (e contados) em ainvoke
+        stream_usage=True,
+        http_client=sync_client,
+        http_async_client=async_client
+    )
+
+
+# Fábricas de modelos por provedor: factory(model, temperature) -> BaseChatModel.
+# Benchmarks e testes registram aqui um LLM fake com register_provider
+PROVIDERS = {"openai": _openai}
+
+_models: dict[tuple[str, str, float], BaseChatModel] = {}
+_models_lock = threading.Lock()
+
+
+def register_provider(name: str, factory) -> None:
+    PROVIDERS[name] = factory
+    with _models_lock:
+        _models.clear()
+
+
+def get_llm(agent: str) -> BaseChatModel:
+    """
+    Devolve o modelo do agente, criado uma única vez por processo para cada
+    (provedor, modelo, temperatura) e reutilizado em todas as chamadas.
+    """
+    key = (LLM_PROVIDER, model_for(agent), AGENTS[agent])
+    with _models_lock:
+        if key not in _models:
+            if LLM_PROVIDER not in PROVIDERS:
+                raise ValueError(f"LLM_PROVIDER desconhecido: {LLM_PROVIDER}")
+            _models[key] = PROVIDERS[LLM_PROVIDER](key[1], key[2])
+        return _models[key]
+
+
+class ReplayMissError(LookupError):
+    """Prompt sem resposta gravada em LLM_FIXTURES_DIR no modo replay."""
+
+
+def cache_key(model: str, temperature: float, messages: list[BaseMessage]) -> str:
+    prompt = "\n".join(f"{m.type}: {m.content}" for m in messages)
+    return sha256(model, repr(float(temperature)), sha256(prompt))
+
+
+def _fixture_path(key: str) -> Path:
+    return LLM_FIXTURES_DIR / f"{key}.json"
+
+
+def _record_fixture(key: str, agent: str, model: str, temperature: float,
+                    messages: list[BaseMessage], entry: dict) -> None:
+    # Um JSON por resposta, legível e fácil de versionar junto com o benchmark
+    LLM_FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    fixture = {
+        "agent": agent,
+        "model": model,
+        "temperature": temperature,
+        "prompt": [{"type": m.type, "content": m.content} for m in messages],
+        **entry,
+    }
+    tmp = _fixture_path(key).with_suffix(".tmp")
+    tmp.write_text(json.dumps(fixture, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(_fixture_path(key))
+
+
+def _cached(temperature: float) -> bool:
+    # record e replay são pedidos explicitamente: valem para qualquer temperatura
+    if LLM_CACHE_MODE in ("record", "replay"):
+        return True
+    return LLM_CACHE_MODE == "cache" and temperature == 0
+
+
+def _lookup(key: str) -> dict | None:
+    if LLM_CACHE_MODE == "replay":
+        path = _fixture_path(key)
+        if not path.exists():
+            raise ReplayMissError(f"Sem fixture para o prompt {key[:12]} em {LLM_FIXTURES_DIR}")
+        return json.loads(path.read_text(encoding="utf-8"))
+    if LLM_CACHE_MODE in ("cache", "record"):
+        return get_cache("llm", LLM_CACHE_MAX_ENTRIES).get(key)
+    return None
+
+
+def _store(key: str, agent: str, model: str, temperature: float,
+           messages: list[BaseMessage], entry: dict) -> None:
+    get_cache("llm", LLM_CACHE_MAX_ENTRIES).set(key, entry)
+    if LLM_CACHE_MODE == "record":
+        _record_fixture(key, agent, model, temperature, messages, entry)
+
+
+@dataclass
+class AgentMetrics:
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    retries: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+_metrics: dict[str, AgentMetrics] = {}
+_metrics_lock = threading.Lock()
+
+# Métricas do nó do grafo em execução (ver track), isoladas por run
+_tracked: ContextVar[AgentMetrics | None] = ContextVar("llm_tracked", default=None)
+
+
+@contextmanager
+def track():
+    """
+    Acumula as chamadas ao LLM feitas dentro do bloco — inclusive por tasks
+    criadas nele — em um AgentMetrics próprio, sem misturar com outros runs.
+    """
+    tracked = AgentMetrics()
+    token = _tracked.set(tracked)
+    try:
+        yield tracked
+    finally:
+        _tracked.reset(token)
+
+
+def _add(target: AgentMetrics, latency: float | None, values: dict) -> None:
+    if latency is not None:
+        target.latency_total += latency
+        target.latency_max = max(target.latency_max, latency)
+    for name, value in values.items():
+        setattr(target, name, getattr(target, name) + value)
+
+
+def _record(agent: str, **values) -> None:
+    latency = values.pop("latency", None)
+    with _metrics_lock:
+        _add(_metrics.setdefault(agent, AgentMetrics()), latency, values)
+        tracked = _tracked.get()
+        if tracked is not None:
+            _add(tracked, latency, values)
+
+    if latency is not None:
+        metrics.llm_latency.observe(latency, agent=agent)
+    for result in ("calls", "cache_hits", "errors", "retries"):
+        if values.get(result):
+            metrics.llm_calls.inc(values[result], agent=agent, result=result)
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if values.get(kind):
+            metrics.llm_tokens.inc(values[kind], agent=agent, kind=kind.split("_")[0])
+
+
+def usage(message: BaseMessage) -> tuple[int, int]:
+    """Tokens (prompt, completion) informados pelo provedor, ou (0, 0)."""
+    metadata = getattr(message, "usage_metadata", None) or {}
+    return metadata.get("input_tokens", 0), metadata.get("output_tokens", 0)
+
+
+async def ainvoke(agent: str, messages: list[BaseMessage]) -> BaseMessage:
+    """
+    Chama o LLM do agente respeitando o limite global de concorrência, com
+    timeout por tentativa e retry com backoff exponencial.
+
+    Respostas para o mesmo (modelo, temperatura, prompt) vêm do cache em
+    disco ou, em LLM_CACHE_MODE=replay, das fixtures gravadas — sem ocupar
+    o limite de concorrência nem a rede. Agentes com temperatura acima de 0
+    só usam o cache em record/replay. A leitura e a gravação do cache e das
+    fixtures rodam fora do event loop.
+
+    Latência, tokens, erros e retries ficam registrados por agente (stats()).
+    Dispara a exceção da última tentativa se todas falharem.
+    """
+    model, temperature = model_for(agent), AGENTS[agent]
+    key = cache_key(model, temperature, messages)
+    cached = await asyncio.to_thread(_lookup, key) if _cached(temperature) else None
+    if cached is not None:
+        _record(agent, cache_hits=1)
+        return AIMessage(content=cached["content"])
+
+    llm = get_llm(agent)
+    async with llm_limit:
+        for tentativa in range(LLM_RETRIES + 1):
+            inicio = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(llm.ainvoke(messages), timeout=LLM_TIMEOUT)
+            except Exception as e:
+                if tentativa == LLM_RETRIES:
+                    _record(agent, errors=1)
+                    raise
+                print(f"[LLM] {agent}: tentativa {tentativa + 1} falhou ({e!r}), repetindo")
+                _record(agent, retries=1)
+                await asyncio.sleep(2 ** tentativa)
+                continue
+
+            prompt_tokens, completion_tokens = usage(response)
+            if LLM_CACHE_MODE in ("cache", "record") and _cached(temperature):
+                entry = {
+                    "content": response.content,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens
+                }
+                await asyncio.to_thread(_store, key, agent, model, temperature, messages, entry)
+            _record(
+                agent,
+                calls=1,
+                latency=time.perf_counter() - inicio,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens
+            )
+            return response
+
+
+def summary(values: AgentMetrics) -> dict:
+    data = asdict(values)
+    data["latency_avg"] = round(values.latency_total / values.calls, 3) if values.calls else 0.0
+    data["latency_total"] = round(values.latency_total, 3)
+    data["latency_max"] = round(values.latency_max, 3)
+    return data
+
+
+def stats() -> dict:
+    """Métricas acumuladas das chamadas ao LLM, por agente."""
+    with _metrics_lock:
+        result = {}
+        for agent, agent_metrics in _metrics.items():
+            data = summary(agent_metrics)
+            data["model"] = model_for(agent)
+            result[agent] = data
+        return result
+
+
+async def aclose() -> None:
+    """Fecha o pool de conexões HTTP (shutdown da API)."""
+    global _http_clients
+    with _http_lock:
+        clients, _http_clients = _http_clients, None
+    with _models_lock:
+        _models.clear()
+    if clients is not None:
+        clients[0].close()
+        await clients[1].aclose()
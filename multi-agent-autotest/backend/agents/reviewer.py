@@ -1,17 +1,17 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
+from agents.llm import ainvoke
 from prompts.loader import render
+from tools.review_rules import decide
 import json
-import os
 
 
-def review_coverage(state: dict) -> dict:
+async def review_coverage(state: dict) -> dict:
     """
     Agente Revisor — analisa o resultado do coverage e decide se itera ou encerra.
 
     Recebe do state:
         - coverage_pct: float — cobertura atual
-        - uncovered_lines: dict[str, list[int]] — linhas não cobertas
+        - uncovered_lines: dict[str, LineRanges] — linhas não cobertas
         - iteration: int — iteração atual
         - threshold: float — meta de cobertura configurada pelo usuário
         - max_iterations: int — limite de iterações
@@ -19,11 +19,16 @@ def review_coverage(state: dict) -> dict:
     Adiciona ao state:
         - should_iterate: bool — decisão do revisor
         - review_reason: str — justificativa da decisão
+
+    As regras do reviewer.j2 são aplicadas localmente (tools/review_rules.py);
+    o LLM só é chamado quando todas as linhas restantes estão em código com
+    dependências externas, caso em que a decisão exige julgamento.
     """
-    llm = ChatOpenAI(
-    model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-    temperature=0  # decisão binária
-    )
+    decision = decide(state)
+    if decision is not None:
+        should_iterate, reason = decision
+        return {**state, "should_iterate": should_iterate, "review_reason": reason}
+
     prompt = render(
         "reviewer.j2",
         coverage_pct=state["coverage_pct"],
@@ -33,7 +38,7 @@ def review_coverage(state: dict) -> dict:
         max_iterations=state["max_iterations"]
     )
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await ainvoke("reviewer", [HumanMessage(content=prompt)])
 
     try:
         parsed = json.loads(response.content)
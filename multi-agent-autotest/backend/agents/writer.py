@@ -1,8 +1,12 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
+from agents.llm import ainvoke
 from prompts.loader import render
+from tools.merge_tests import drop_tests, merge_tests, parses, test_names
+from tools.slicing import filter_analysis, slice_context
 import re
-import os
+
+# Trecho final da saída de erro do pytest que vai para o prompt
+MAX_ERROR_CHARS = 3000
 
 
 def _corrigir_imports(code: str) -> str:
@@ -84,35 +88,81 @@ def _corrigir_mocks(code: str) -> str:
     return code
 
 
-def write_tests(state: dict) -> dict:
+def _failed_names(failed_tests: list[str]) -> set[str]:
+    # "TestX::test_y[1]: mensagem" → "TestX::test_y"
+    return {entry.split(": ", 1)[0].split("[")[0] for entry in failed_tests}
+
+
+async def write_tests(state: dict) -> dict:
     """
     Agente Escritor — gera ou complementa os testes pytest.
 
+    Na primeira iteração o LLM gera o arquivo de testes completo. Nas seguintes
+    ele responde apenas com as novas funções de teste para as linhas não
+    cobertas, que são incorporadas ao módulo existente por `merge_tests`
+    (com deduplicação por nome e por AST) — os testes que já passavam nunca
+    são descartados nem pagos de novo. Nessas iterações o prompt recebe apenas
+    o recorte do código em torno das linhas não cobertas (tools/slicing.py).
+
+    Testes que falharam na execução anterior são removidos do módulo antes do
+    merge e voltam ao prompt com a mensagem de erro, para serem reescritos.
+    Se o módulo não chegou a rodar (erro de import ou de coleta) ou nenhum
+    teste passou, o arquivo é gerado do zero com o erro no prompt.
+
     Recebe do state:
         - files: dict[str, str] — código fonte original
         - analysis: dict[str, list] — mapa gerado pelo Analisador
         - iteration: int — número da iteração atual
         - coverage_pct: float — cobertura da iteração anterior (0.0 na primeira)
-        - uncovered_lines: dict[str, list[int]] — linhas não cobertas (vazio na primeira)
+        - uncovered_lines: dict[str, LineRanges] — linhas não cobertas (vazio na primeira)
+        - generated_tests: str — módulo de testes acumulado (vazio na primeira)
+        - failed_tests: list[str] — "teste: mensagem" das falhas da execução anterior
+        - test_errors: str | None — saída do pytest quando a execução anterior falhou
 
     Adiciona ao state:
         - generated_tests: str — código Python dos testes gerados
     """
-    llm = ChatOpenAI(
-        model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-        temperature=0.2
-    )
+    # Só dá para complementar um módulo que é Python válido e que rodou; caso
+    # contrário o arquivo é gerado do zero
+    existing = state.get("generated_tests", "")
+    failed_tests = state.get("failed_tests") or []
+    errors = (state.get("test_errors") or "")[-MAX_ERROR_CHARS:]
+    failed = _failed_names(failed_tests)
+    names = set(test_names(existing))
+    # Falha fora dos testes do módulo (ex: "test_generated" na coleta) ou
+    # nenhum teste passando: não há o que aproveitar
+    broken = bool(errors) or bool(failed - names) or (bool(names) and names <= failed)
+    incremental = state["iteration"] > 1 and bool(existing) and parses(existing) and not broken
+    if incremental and failed:
+        existing = drop_tests(existing, failed)
+        print(f"[Writer] {len(failed)} testes com falha removidos para serem reescritos")
+    elif state["iteration"] > 1 and broken:
+        print("[Writer] Execução anterior quebrada — gerando os testes do zero")
+
+    # Nas iterações seguintes o prompt leva só o código em torno das linhas
+    # não cobertas, em vez de todos os arquivos e da análise completa
+    files = state["files"]
+    analysis = state["analysis"]
+    uncovered_lines = state.get("uncovered_lines", {})
+    sliced = incremental and bool(uncovered_lines)
+    if sliced:
+        files, kept = slice_context(files, uncovered_lines)
+        analysis = filter_analysis(analysis, files, kept)
 
     prompt = render(
         "writer.j2",
-        files=state["files"],
-        analysis=state["analysis"],
+        files=files,
+        analysis=analysis,
+        sliced=sliced,
         iteration=state["iteration"],
         coverage_pct=state.get("coverage_pct", 0.0),
-        uncovered_lines=state.get("uncovered_lines", {})
+        uncovered_lines=uncovered_lines,
+        existing_tests=test_names(existing) if incremental else [],
+        failed_tests=failed_tests if state["iteration"] > 1 else [],
+        errors=errors if state["iteration"] > 1 else ""
     )
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await ainvoke("writer", [HumanMessage(content=prompt)])
 
     # Remove markdown code fences independente do formato
     generated_tests = response.content.strip()
@@ -120,10 +170,13 @@ def write_tests(state: dict) -> dict:
     generated_tests = re.sub(r'\n```$', '', generated_tests)
     generated_tests = generated_tests.strip()
 
-    # Injeta imports faltantes que o LLM esqueceu de incluir
-    generated_tests = _corrigir_imports(generated_tests)
-
     # Corrige padrões problemáticos de mock
     generated_tests = _corrigir_mocks(generated_tests)
 
-    return {**state, "generated_tests": generated_tests}
\ No newline at end of file
+    if incremental:
+        generated_tests = merge_tests(existing, generated_tests)
+
+    # Injeta imports faltantes que o LLM esqueceu de incluir
+    generated_tests = _corrigir_imports(generated_tests)
+
+    return {**state, "generated_tests": generated_tests}
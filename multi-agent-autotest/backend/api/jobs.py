@@ -0,0 +1,222 @@
+import asyncio
+import bisect
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from agents.graph import agent_graph
+from tools import metrics
+from tools.retention import compact_run
+
+# Nós do grafo cujos eventos são repassados ao cliente
+NODES = ("analyzer", "writer", "executor", "reviewer")
+
+# Jobs finalizados ficam disponíveis para consulta por esse tempo (segundos)
+JOB_TTL = 3600
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = "queued"
+    events: list[dict] = field(default_factory=list)
+    report: dict | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    published: int = 0  # eventos publicados; o próximo recebe esse seq
+    _changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    def _coalesce(self, node: str) -> None:
+        # Troca os tokens do nó (desde o seu node_start) por um único evento
+        # com o texto completo, no seq do último token: o histórico guarda um
+        # evento por execução do nó, não um por token
+        tokens = []
+        for i in range(len(self.events) - 1, -1, -1):
+            event = self.events[i]
+            if event.get("node") != node:
+                continue
+            if event["type"] != "token" or event.get("coalesced"):
+                break
+            tokens.append(i)
+        if len(tokens) < 2:
+            return
+        tokens.reverse()
+        last = self.events[tokens[-1]]
+        merged = {
+            **last,
+            "content": "".join(self.events[i]["content"] for i in tokens),
+            "coalesced": True,
+            "first_seq": self.events[tokens[0]]["seq"],
+        }
+        for i in reversed(tokens[:-1]):
+            del self.events[i]
+        self.events[self.events.index(last)] = merged
+
+    async def publish(self, event: dict, status: str | None = None) -> None:
+        """Adiciona um evento e, opcionalmente, muda o status no mesmo passo."""
+        event = {"seq": self.published, "ts": round(time.time(), 3), **event}
+        async with self._changed:
+            if event["type"] == "node_end":
+                self._coalesce(event["node"])
+            self.published += 1
+            self.events.append(event)
+            if status is not None:
+                self.status = status
+                if self.finished:
+                    self.finished_at = time.time()
+            self._changed.notify_all()
+
+    async def stream(self, start: int = 0):
+        """
+        Gera os eventos do job a partir do seq `start`, esperando pelos
+        próximos até o job terminar. Quem conecta depois recebe o histórico
+        completo — com os tokens de cada nó já encerrado num único evento
+        `coalesced`, cujo conteúdo substitui (não complementa) o que o
+        cliente tiver recebido desde `first_seq`.
+        """
+        next_seq = start
+        while True:
+            async with self._changed:
+                while next_seq >= self.published and not self.finished:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=15)
+                    except asyncio.TimeoutError:
+                        break
+                index = bisect.bisect_left(self.events, next_seq, key=lambda e: e["seq"])
+                pending = self.events[index:]
+            if not pending and not self.finished:
+                # Sem eventos novos: mantém a conexão viva através de proxies
+                yield None
+                continue
+            for event in pending:
+                yield event
+            if pending:
+                next_seq = pending[-1]["seq"] + 1
+            if self.finished and next_seq >= self.published:
+                return
+
+    async def wait(self) -> None:
+        """Espera o job terminar (done ou error)."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.finished)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+    def summary(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "report": self.report,
+            "error": self.error,
+            "events": self.published,
+        }
+
+
+_jobs: dict[str, Job] = {}
+
+
+def create_job() -> Job:
+    """Registra um job novo; a execução é agendada por api/scheduler.py."""
+    _prune()
+    job = Job(id=uuid.uuid4().hex[:12])
+    _jobs[job.id] = job
+    return job
+
+
+def get_job(job_id: str) -> Job | None:
+    return _jobs.get(job_id)
+
+
+def _prune() -> None:
+    agora = time.time()
+    for job_id, job in list(_jobs.items()):
+        if job.finished_at and agora - job.finished_at > JOB_TTL:
+            del _jobs[job_id]
+
+
+def _node_summary(node: str, output: dict) -> dict:
+    # Resumo enviado ao cliente no fim de cada nó — o state completo
+    # (código, testes, análise) seria grande demais para cada evento
+    if node == "analyzer":
+        analysis = output.get("analysis", {})
+        return {"files": len(analysis), "functions": sum(len(f) for f in analysis.values())}
+    if node == "writer":
+        return {"iteration": output.get("iteration"), "tests_chars": len(output.get("generated_tests", ""))}
+    if node == "executor":
+        report = output.get("report", {})
+        return {
+            "iteration": report.get("iteration"),
+            "coverage_pct": report.get("coverage_pct"),
+            "tests_passed": report.get("tests_passed"),
+            "tests_failed": report.get("tests_failed"),
+            "success": report.get("success"),
+            "report_url": report.get("report_url"),
+            "timings": report.get("timings", {}),
+        }
+    if node == "reviewer":
+        return {"should_iterate": output.get("should_iterate"), "reason": output.get("review_reason")}
+    return {}
+
+
+async def run_job(job: Job, initial_state: dict) -> None:
+    """
+    Executa o grafo de agentes publicando eventos por nó:
+        - node_start / node_end de cada agente (com resumo do resultado)
+        - token: tokens do Escritor conforme o LLM gera; no node_end eles
+          viram um único evento com o texto completo (ver Job.stream)
+        - done (com o relatório final) ou error
+    """
+    await job.publish({"type": "status", "status": "running"}, status="running")
+    report: dict = {}
+    run_metrics: dict = {}
+    report_dirs: list[str] = []
+
+    try:
+        async for event in agent_graph.astream_events(initial_state, version="v2"):
+            kind = event["event"]
+            name = event.get("name")
+            node = event.get("metadata", {}).get("langgraph_node")
+
+            if kind == "on_chain_start" and name in NODES and node == name:
+                await job.publish({"type": "node_start", "node": name})
+
+            elif kind == "on_chain_end" and name in NODES and node == name:
+                output = event["data"].get("output") or {}
+                run_metrics = output.get("metrics", run_metrics)
+                if name == "executor":
+                    report = output.get("report", report)
+                    report_dirs = output.get("report_dirs", report_dirs)
+                await job.publish({
+                    "type": "node_end",
+                    "node": name,
+                    "data": _node_summary(name, output)
+                })
+
+            elif kind == "on_chat_model_stream" and node == "writer":
+                content = event["data"]["chunk"].content
+                if content:
+                    await job.publish({"type": "token", "node": node, "content": content})
+
+        # Métricas de todos os nós, inclusive do Revisor da última iteração
+        report = {**report, "metrics": run_metrics}
+        try:
+            await asyncio.to_thread(compact_run, report_dirs)
+        except Exception as e:
+            print(f"[Jobs] Falha ao compactar reports do job {job.id}: {e!r}")
+        job.report = report
+        metrics.runs.inc(status="done")
+        await job.publish({"type": "done", "report": report}, status="done")
+
+    except Exception as e:
+        metrics.runs.inc(status="error")
+        job.error = str(e)
+        await job.publish({"type": "error", "detail": str(e)}, status="error")
+
+
+def format_sse(event: dict | None) -> str:
+    if event is None:
+        return ": keepalive\n\n"
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
@@ -1,9 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
+from agents.llm import aclose as close_llm_clients
+from agents.graph import REPORTS_DIR
 from api.routes import router
+from tools.coverage_html import ensure_html
+from tools.retention import gc_loop
+from tools.pool import all_pools, get_pool
+from tools.sandbox import PooledSandbox, get_backend
 from dotenv import load_dotenv
-from pathlib import Path
+import asyncio
 
 load_dotenv()
 
@@ -20,9 +27,57 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-# Serve os reports HTML do coverage como arquivos estáticos
-REPORTS_DIR = Path(__file__).parent.parent / "reports"
-REPORTS_DIR.mkdir(exist_ok=True)
+@app.get("/reports/{run_id}/htmlcov/{path:path}")
+async def coverage_html(run_id: str, path: str):
+    """
+    HTML do coverage, gerado na primeira requisição a partir do .coverage do
+    run e servido do disco nas seguintes.
+    """
+    report_dir = (REPORTS_DIR / run_id).resolve()
+    if report_dir.parent != REPORTS_DIR.resolve() or not report_dir.is_dir():
+        raise HTTPException(status_code=404, detail="Report não encontrado.")
+
+    html_dir = await asyncio.to_thread(ensure_html, report_dir)
+    if html_dir is None:
+        raise HTTPException(status_code=404, detail="Report sem dados de cobertura.")
+
+    file = (html_dir / (path or "index.html")).resolve()
+    if not file.is_relative_to(html_dir.resolve()) or not file.is_file():
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado.")
+    return FileResponse(file)
+
+
+# Serve os demais arquivos dos reports (testes, XMLs) como arquivos estáticos
 app.mount("/reports", StaticFiles(directory=str(REPORTS_DIR)), name="reports")
 
-app.include_router(router, prefix="/api")
\ No newline at end of file
+app.include_router(router, prefix="/api")
+
+
+@app.on_event("startup")
+def warm_sandbox_pool():
+    # Sobe os workers do sandbox antes da primeira requisição
+    pool = get_pool()
+    if pool is not None and isinstance(get_backend(), PooledSandbox):
+        pool.warm()
+
+
+@app.on_event("shutdown")
+def stop_sandbox_pool():
+    for pool in all_pools():
+        pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_llm_pool():
+    await close_llm_clients()
+
+
+@app.on_event("startup")
+async def start_reports_gc():
+    # Referência guardada no app para a task não ser coletada
+    app.state.reports_gc = asyncio.create_task(gc_loop(REPORTS_DIR))
+
+
+@app.on_event("shutdown")
+async def stop_reports_gc():
+    app.state.reports_gc.cancel()
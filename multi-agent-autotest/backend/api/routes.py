@@ -1,7 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
-from agents.graph import agent_graph
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Header
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from agents import llm
+from api.jobs import format_sse, get_job
+from api.scheduler import QueueFullError, scheduler
+from tools import metrics
+from tools.archive import ArchiveError, _clean_path, extract_sources, is_archive
+from tools.cache import all_stats
+from tools.limits import llm_limit, sandbox_limit
 from pathlib import Path
+import asyncio
 import os
 
 router = APIRouter()
@@ -15,9 +22,26 @@ def health():
     return {"status": "ok"}
 
 
+@router.get("/cache/stats")
+def cache_stats():
+    """
+    Tamanho e contadores de hit/miss dos caches persistentes.
+    """
+    return all_stats()
+
+
+@router.get("/llm/stats")
+def llm_stats():
+    """
+    Chamadas, latência, tokens e retries do LLM por agente.
+    """
+    return llm.stats()
+
+
 @router.post("/analyze")
 async def analyze(
-    files: list[UploadFile] = File(...),
+    files: list[UploadFile] = File(default=[]),
+    archive: UploadFile | None = File(default=None),
     threshold: float = Form(default=80.0),
     max_iterations: int = Form(default=5)
 ):
@@ -27,26 +51,191 @@ async def analyze(
 
     Args:
         files: lista de arquivos .py enviados pelo React
+        archive: projeto inteiro como .zip ou .tar.gz (opcional, em vez
+            de ou junto com `files`)
         threshold: meta de cobertura (padrão 80%)
         max_iterations: limite de iterações do loop (padrão 5)
     """
 
-    # Valida se todos os arquivos são .py
+    initial_state = await _initial_state(files, threshold, max_iterations, archive)
+
+    # Passa pela mesma fila dos jobs e espera o loop encerrar
+    job = _submit(initial_state)
+    await job.wait()
+    if job.status == "error":
+        raise HTTPException(status_code=500, detail=job.error)
+    return JSONResponse(content=job.report)
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    files: list[UploadFile] = File(default=[]),
+    archive: UploadFile | None = File(default=None),
+    threshold: float = Form(default=80.0),
+    max_iterations: int = Form(default=5)
+):
+    """
+    Versão assíncrona do /analyze — enfileira o grafo de agentes e retorna
+    o id do job imediatamente. Aceita os mesmos arquivos (.py ou um
+    projeto compactado em `archive`). O progresso é acompanhado por
+    GET /jobs/{job_id}/events (Server-Sent Events).
+
+    Com a fila cheia responde 429 com Retry-After.
+    """
+    initial_state = await _initial_state(files, threshold, max_iterations, archive)
+
+    job = _submit(initial_state)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "queue_position": scheduler.position(job)
+    }
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """
+    Status do job, posição na fila e, quando concluído, o relatório final.
+    """
+    job = _get_job_or_404(job_id)
+    return {**job.summary(), "queue_position": scheduler.position(job)}
+
+
+@router.get("/scheduler/stats")
+def scheduler_stats():
+    """
+    Ocupação da fila de runs e dos limites de LLM e sandbox.
+    """
+    return {
+        "runs": scheduler.stats(),
+        "llm": llm_limit.stats(),
+        "sandbox": sandbox_limit.stats()
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Métricas no formato do Prometheus: duração por nó, latência e tokens do
+    LLM, fases do sandbox, ocupação da fila e dos limites e caches.
+    """
+    runs = scheduler.stats()
+    limits = {"llm": llm_limit.stats(), "sandbox": sandbox_limit.stats()}
+    caches = all_stats()
+    gauges = {
+        "autotest_runs_queued": ("Runs esperando na fila", {(): runs["queued"]}),
+        "autotest_runs_running": ("Runs em execução", {(): runs["running"]}),
+        "autotest_limit_in_use": ("Vagas ocupadas nos limites globais", {
+            (("limit", name),): value["in_use"] for name, value in limits.items()
+        }),
+        "autotest_limit_waiting": ("Chamadas esperando vaga nos limites globais", {
+            (("limit", name),): value["waiting"] for name, value in limits.items()
+        }),
+        "autotest_cache_entries": ("Entradas nos caches persistentes", {
+            (("cache", name),): value["entries"] for name, value in caches.items()
+        }),
+        "autotest_cache_hits": ("Hits dos caches persistentes neste processo", {
+            (("cache", name),): value["hits"] for name, value in caches.items()
+        }),
+        "autotest_cache_misses": ("Misses dos caches persistentes neste processo", {
+            (("cache", name),): value["misses"] for name, value in caches.items()
+        }),
+    }
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4")
+
+
+def _submit(initial_state: dict):
+    try:
+        return scheduler.submit(initial_state)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Fila de execução cheia ({scheduler.max_queue} jobs). Tente novamente em {e.retry_after}s.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, last_event_id: int | None = Header(default=None)):
+    """
+    Stream SSE com os eventos do job: node_start, node_end, token, done e error.
+    Reconexões com o header Last-Event-ID continuam de onde pararam.
+    """
+    job = _get_job_or_404(job_id)
+    start = last_event_id + 1 if last_event_id is not None else 0
+
+    async def stream():
+        async for event in job.stream(start):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _get_job_or_404(job_id: str):
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' não encontrado.")
+    return job
+
+
+async def _initial_state(
+    files: list[UploadFile],
+    threshold: float,
+    max_iterations: int,
+    archive: UploadFile | None = None
+) -> dict:
+    """
+    Valida e lê os arquivos enviados e monta o state inicial do grafo.
+    """
+    if not files and archive is None:
+        raise HTTPException(status_code=400, detail="Nenhum arquivo enviado.")
+
+    # Valida se todos os arquivos são .py e normaliza os nomes pelas mesmas
+    # regras do projeto compactado: o nome vira caminho no workspace e no
+    # HTML do coverage, então "../x.py" ou "/etc/x.py" não podem passar
+    paths: list[str] = []
     for file in files:
         if not file.filename.endswith(".py"):
             raise HTTPException(
                 status_code=400,
                 detail=f"Arquivo '{file.filename}' não é um arquivo Python válido."
             )
+        try:
+            path = _clean_path(file.filename)
+        except ArchiveError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if path is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Arquivo '{file.filename}' está num diretório ignorado."
+            )
+        paths.append(path)
 
-    # Lê o conteúdo de cada arquivo enviado
+    # Projeto compactado: extraído em streaming a partir do arquivo
+    # temporário do upload, fora do event loop
     files_content: dict[str, str] = {}
-    for file in files:
+    if archive is not None:
+        if not is_archive(archive.filename):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Arquivo '{archive.filename}' não é um .zip, .tar.gz ou .tar."
+            )
+        try:
+            files_content = await asyncio.to_thread(extract_sources, archive.file, archive.filename)
+        except ArchiveError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Lê o conteúdo de cada arquivo enviado
+    for file, path in zip(files, paths):
         content = await file.read()
-        files_content[file.filename] = content.decode("utf-8")
+        files_content[path] = content.decode("utf-8")
 
     # Monta o state inicial do grafo
-    initial_state = {
+    return {
         "files": files_content,
         "threshold": threshold,
         "max_iterations": max_iterations,
@@ -59,11 +248,3 @@ async def analyze(
         "uncovered_lines": {},
         "report": {}
     }
-
-    try:
-        # Invoca o grafo — isso é bloqueante até o loop encerrar
-        final_state = await agent_graph.ainvoke(initial_state)
-        return JSONResponse(content=final_state["report"])
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import time
+from api.jobs import Job, create_job, run_job
+
+
+class QueueFullError(Exception):
+    """Fila de jobs cheia — o cliente deve tentar de novo depois."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Fila cheia, tente novamente em {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Scheduler:
+    """
+    Fila limitada de runs do grafo de agentes.
+
+    Até `concurrency` runs executam ao mesmo tempo; os demais esperam na fila,
+    que aceita no máximo `max_queue` jobs. Com a fila cheia `submit` dispara
+    QueueFullError com uma estimativa de espera, usada no Retry-After.
+    Os limites de chamadas ao LLM e ao sandbox ficam em tools/limits.py.
+    """
+
+    def __init__(self, max_queue: int, concurrency: int):
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue | None = None
+        self._waiting: list[Job] = []
+        self._workers: list[asyncio.Task] = []
+        self._running = 0
+        # Média móvel da duração dos runs, usada para estimar a espera
+        self._avg_duration = 60.0
+
+    def _ensure_started(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            job, initial_state = await self._queue.get()
+            self._waiting.remove(job)
+            self._running += 1
+            inicio = time.monotonic()
+            try:
+                await run_job(job, initial_state)
+            finally:
+                self._running -= 1
+                duracao = time.monotonic() - inicio
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duracao
+                self._queue.task_done()
+
+    def estimated_wait(self, position: int) -> int:
+        """Segundos estimados até um job na posição `position` começar."""
+        rodadas = -(-position // self.concurrency)
+        return max(1, int(rodadas * self._avg_duration))
+
+    def submit(self, initial_state: dict) -> Job:
+        self._ensure_started()
+        if len(self._waiting) >= self.max_queue:
+            raise QueueFullError(self.estimated_wait(len(self._waiting) + 1))
+
+        job = create_job()
+        self._waiting.append(job)
+        self._queue.put_nowait((job, initial_state))
+        return job
+
+    def position(self, job: Job) -> int | None:
+        """Posição do job na fila (1 = próximo a executar), None se não está na fila."""
+        try:
+            return self._waiting.index(job) + 1
+        except ValueError:
+            return None
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._waiting),
+            "running": self._running,
+            "max_queue": self.max_queue,
+            "concurrency": self.concurrency,
+            "avg_run_seconds": round(self._avg_duration, 1),
+        }
+
+
+scheduler = Scheduler(
+    max_queue=int(os.getenv("JOB_QUEUE_SIZE", "20")),
+    concurrency=int(os.getenv("RUN_CONCURRENCY", "2"))
+)
@@ -0,0 +1,54 @@
+"""
+Corpora sintéticos para os benchmarks.
+
+Cada módulo tem funções com o mesmo formato, para que o LLM fake
+(benchmarks/fake_llm.py) consiga gerar testes determinísticos para elas:
+a primeira geração cobre só o caminho principal e as iterações seguintes
+cobrem os ramos restantes, exercitando o loop do grafo.
+"""
+
+FUNCTION_TEMPLATE = '''
+
+def {name}(x: int) -> int:
+    """Ajusta x em relação ao limite {limit}."""
+    if x > {limit}:
+        excedente = x - {limit}
+        return excedente * {factor}
+    if x < 0:
+        raise ValueError("x não pode ser negativo")
+    return x + {factor}
+'''
+
+
+def build_module(index: int, functions: int, seed: int = 0) -> str:
+    header = f'"""Módulo sintético {index} do corpus de benchmark."""\n'
+    body = "".join(
+        FUNCTION_TEMPLATE.format(
+            name=f"func_{index}_{n}",
+            limit=(index * 7 + n * 3 + seed * 11) % 50 + 1,
+            factor=n + 2
+        )
+        for n in range(functions)
+    )
+    return header + body
+
+
+def build_corpus(files: int, functions: int = 5, seed: int = 0) -> dict[str, str]:
+    """
+    Gera um projeto com `files` módulos de `functions` funções cada, no
+    formato do state do grafo: {nome_arquivo: conteúdo}. Projetos com mais
+    de 10 arquivos são divididos em pacotes de até 100 módulos.
+
+    Sementes diferentes geram conteúdos diferentes, para medir runs sem
+    aproveitar os caches de análise e de respostas do LLM.
+    """
+    corpus: dict[str, str] = {}
+    for index in range(files):
+        if files > 10:
+            package = f"pkg_{index // 100:02d}"
+            corpus.setdefault(f"{package}/__init__.py", "")
+            filename = f"{package}/mod_{index:04d}.py"
+        else:
+            filename = f"mod_{index:04d}.py"
+        corpus[filename] = build_module(index, functions, seed)
+    return corpus
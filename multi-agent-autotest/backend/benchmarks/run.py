@@ -0,0 +1,182 @@
+"""
+Benchmark ponta a ponta do grafo de agentes.
+
+Roda o `agent_graph` completo contra corpora sintéticos de tamanho
+crescente, com o LLM fake (benchmarks/fake_llm.py) e o sandbox local, e
+mede por tamanho:
+    - latência média de cada nó (analyzer, writer, executor, reviewer)
+    - iterações e cobertura final
+    - tokens de prompt e de resposta por run
+    - pico de memória (RSS do processo e dos subprocessos do pytest)
+    - throughput em runs por minuto
+
+Uso (a partir de backend/):
+    python -m benchmarks.run --sizes 1 10 100 1000 --runs 3 --output bench.json
+
+Para comparar antes/depois de uma mudança de performance, rode o mesmo
+comando nas duas versões e compare os JSONs.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# A configuração dos agentes é lida no import: precisa vir antes deles
+_workdir = tempfile.mkdtemp(prefix="autotest_bench_")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("LLM_CACHE_MODE", "off")
+os.environ.setdefault("SANDBOX_BACKEND", "local")
+os.environ.setdefault("CACHE_DIR", os.path.join(_workdir, "cache"))
+os.environ.setdefault("REPORTS_DIR", os.path.join(_workdir, "reports"))
+
+import asyncio
+import shutil
+from agents import llm
+from agents.graph import agent_graph
+from benchmarks.corpus import build_corpus
+from benchmarks.fake_llm import FakeChatModel
+
+NODES = ("analyzer", "writer", "executor", "reviewer")
+
+
+def _initial_state(files: dict[str, str], threshold: float, max_iterations: int) -> dict:
+    # Mesmo formato montado por api/routes.py
+    return {
+        "files": files,
+        "threshold": threshold,
+        "max_iterations": max_iterations,
+        "iteration": 1,
+        "should_iterate": True,
+        "review_reason": "",
+        "analysis": {},
+        "generated_tests": "",
+        "coverage_pct": 0.0,
+        "uncovered_lines": {},
+        "report": {}
+    }
+
+
+async def _run_once(state: dict) -> dict:
+    """Executa o grafo uma vez, cronometrando cada nó pelos updates do stream."""
+    nodes = {node: 0.0 for node in NODES}
+    final = state
+    inicio = anterior = time.perf_counter()
+    async for update in agent_graph.astream(state, stream_mode="updates"):
+        agora = time.perf_counter()
+        # O grafo é sequencial: o tempo desde o update anterior é do nó atual
+        for node, output in update.items():
+            nodes[node] = nodes.get(node, 0.0) + agora - anterior
+            final = output
+        anterior = agora
+    return {
+        "total": time.perf_counter() - inicio,
+        "nodes": nodes,
+        "iterations": final["iteration"] - 1,
+        "coverage_pct": final["coverage_pct"],
+    }
+
+
+def _tokens() -> tuple[int, int]:
+    stats = llm.stats().values()
+    return (
+        sum(s["prompt_tokens"] for s in stats),
+        sum(s["completion_tokens"] for s in stats),
+    )
+
+
+def _peak_memory_mb() -> tuple[float, float]:
+    # ru_maxrss é em KB no Linux e só cresce: é o pico até o momento
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return round(own, 1), round(children, 1)
+
+
+async def benchmark(size: int, args: argparse.Namespace) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run(seed: int) -> dict:
+        # Com --warm todos os runs usam o mesmo corpus e aproveitam os caches
+        files = build_corpus(size, args.functions, seed=0 if args.warm else seed)
+        async with semaphore:
+            return await _run_once(_initial_state(files, args.threshold, args.max_iterations))
+
+    tokens_before = _tokens()
+    inicio = time.perf_counter()
+    runs = await asyncio.gather(*(run(seed) for seed in range(args.runs)))
+    wall = time.perf_counter() - inicio
+    prompt_tokens, completion_tokens = (
+        after - before for after, before in zip(_tokens(), tokens_before)
+    )
+    rss, children_rss = _peak_memory_mb()
+
+    return {
+        "files": size,
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "wall_s": round(wall, 3),
+        "run_avg_s": round(sum(r["total"] for r in runs) / len(runs), 3),
+        "nodes_avg_s": {
+            node: round(sum(r["nodes"][node] for r in runs) / len(runs), 3)
+            for node in NODES
+        },
+        "iterations_avg": round(sum(r["iterations"] for r in runs) / len(runs), 2),
+        "coverage_avg": round(sum(r["coverage_pct"] for r in runs) / len(runs), 2),
+        "prompt_tokens_per_run": prompt_tokens // len(runs),
+        "completion_tokens_per_run": completion_tokens // len(runs),
+        "peak_rss_mb": rss,
+        "peak_children_rss_mb": children_rss,
+        "runs_per_minute": round(len(runs) / wall * 60, 2),
+    }
+
+
+def _print_row(result: dict) -> None:
+    nodes = " ".join(f"{node}={result['nodes_avg_s'][node]:.2f}s" for node in NODES)
+    print(
+        f"[Bench] {result['files']:>5} arquivos | run {result['run_avg_s']:.2f}s | {nodes} | "
+        f"iter {result['iterations_avg']} | cov {result['coverage_avg']}% | "
+        f"tokens {result['prompt_tokens_per_run']}/{result['completion_tokens_per_run']} | "
+        f"rss {result['peak_rss_mb']}MB (+{result['peak_children_rss_mb']}MB) | "
+        f"{result['runs_per_minute']} runs/min"
+    )
+
+
+async def main(args: argparse.Namespace) -> list[dict]:
+    llm.register_provider("fake", lambda model, temperature: FakeChatModel(latency=args.llm_latency))
+    results = []
+    for size in args.sizes:
+        result = await benchmark(size, args)
+        _print_row(result)
+        results.append(result)
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ponta a ponta do grafo de agentes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="número de arquivos de cada corpus")
+    parser.add_argument("--functions", type=int, default=5, help="funções por arquivo")
+    parser.add_argument("--runs", type=int, default=3, help="runs por tamanho")
+    parser.add_argument("--concurrency", type=int, default=1, help="runs simultâneos")
+    parser.add_argument("--threshold", type=float, default=80.0)
+    parser.add_argument("--max-iterations", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="latência simulada por chamada ao LLM fake (segundos)")
+    parser.add_argument("--warm", action="store_true",
+                        help="repete o mesmo corpus, medindo com os caches aquecidos")
+    parser.add_argument("--output", help="arquivo JSON com os resultados")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        results = asyncio.run(main(args))
+    finally:
+        shutil.rmtree(_workdir, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"argv": sys.argv[1:], "results": results}, f, indent=2)
+        print(f"[Bench] Resultados salvos em {args.output}")
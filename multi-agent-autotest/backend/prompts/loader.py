@@ -1,5 +1,6 @@
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
+import hashlib
 
 # Aponta para a pasta /prompts independente de onde o código é chamado
 PROMPTS_DIR = Path(__file__).parent
@@ -23,4 +24,15 @@ def render(template_name: str, **kwargs) -> str:
         String com o prompt renderizado
     """
     template = env.get_template(template_name)
-    return template.render(**kwargs)
\ No newline at end of file
+    return template.render(**kwargs)
+
+
+def template_hash(template_name: str) -> str:
+    """
+    Hash SHA-256 do código-fonte de um template.
+
+    Usado como versão do prompt em chaves de cache: qualquer edição no .j2
+    invalida automaticamente as respostas geradas com a versão anterior.
+    """
+    source, _, _ = env.loader.get_source(env, template_name)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
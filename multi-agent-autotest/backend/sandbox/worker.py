@@ -0,0 +1,207 @@
+"""
+Worker residente do sandbox.
+
+Roda dentro do container `autotest-sandbox` e fica esperando jobs pelo stdin,
+um JSON por linha. O pytest, o pytest-cov e o coverage são importados uma única
+vez aqui — cada job roda em um processo filho (fork), então o estado dos
+módulos testados nunca vaza de um job para o outro.
+
+Formato do job:
+    {"files": {caminho: conteúdo}, "tests": {caminho: conteúdo},
+     "args": ["{tests}", "--cov={code}", ...], "timeout": 120}
+
+Formato da resposta (uma linha no stdout):
+    {"returncode": int, "stdout": str, "stderr": str, "timed_out": bool,
+     "recycle": bool, "artifacts": base64(tar.gz do diretório de testes)}
+
+Cada job roda num grupo de processos próprio, morto inteiro ao final do job
+(não só no timeout). Se algum processo sobreviver — ex: um teste que chamou
+setsid() —, a resposta pede a reciclagem do worker: todos os jobs rodam com
+o mesmo uid, e um processo remanescente enxergaria os arquivos dos próximos.
+"""
+import base64
+import io
+import json
+import os
+import shutil
+import signal
+import sys
+import tarfile
+import tempfile
+import time
+
+# Pré-carrega o que cada execução precisaria importar do zero
+import coverage  # noqa: F401
+import pytest
+import pytest_cov  # noqa: F401
+
+
+def _write_tree(root: str, files: dict[str, str]) -> None:
+    for relpath, content in files.items():
+        path = os.path.normpath(os.path.join(root, relpath))
+        if not path.startswith(root + os.sep):
+            raise ValueError(f"Caminho inválido: {relpath}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def _pack(directory: str) -> str:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        tar.add(directory, arcname=".")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _run_child(code_dir: str, tests_dir: str, args: list[str], out_path: str, err_path: str) -> None:
+    # Processo filho: redireciona stdout/stderr para arquivos, já que o
+    # stdout do worker é o canal do protocolo. Sessão própria: o grupo
+    # inteiro (inclusive processos em background dos testes) é morto no fim
+    os.setsid()
+    out_fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    err_fd = os.open(err_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    os.chdir(code_dir)
+    sys.path.insert(0, code_dir)
+    os.environ["PYTHONPATH"] = code_dir
+    os.environ["COVERAGE_FILE"] = os.path.join(tests_dir, ".coverage")
+    try:
+        code = pytest.main(args)
+    except BaseException:
+        code = 3
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(int(code))
+
+
+def _reap() -> None:
+    # Recolhe filhos encerrados (e órfãos herdados, quando o worker é o PID 1)
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _ancestors() -> set[int]:
+    pids, pid = set(), os.getpid()
+    while pid > 0 and pid not in pids:
+        pids.add(pid)
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                pid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            break
+    return pids
+
+
+def _stray_processes() -> list[int]:
+    """Processos vivos no container além do próprio worker (e seus pais)."""
+    own = _ancestors()
+    stray = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit() or int(entry) in own:
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                state = f.read().rsplit(")", 1)[1].split()[0]
+        except (OSError, IndexError):
+            continue
+        if state != "Z":
+            stray.append(int(entry))
+    return stray
+
+
+def _kill_group(pgid: int) -> list[int]:
+    # Mata o grupo do job e espera os processos sumirem; devolve o que sobrou
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    deadline = time.monotonic() + 1.0
+    while True:
+        _reap()
+        stray = _stray_processes()
+        if not stray or time.monotonic() > deadline:
+            return stray
+        time.sleep(0.02)
+
+
+def _run_job(job: dict) -> dict:
+    job_dir = tempfile.mkdtemp(prefix="job_")
+    code_dir = os.path.join(job_dir, "code")
+    tests_dir = os.path.join(job_dir, "tests")
+    out_path = os.path.join(job_dir, "stdout.txt")
+    err_path = os.path.join(job_dir, "stderr.txt")
+    os.makedirs(code_dir)
+    os.makedirs(tests_dir)
+
+    try:
+        _write_tree(code_dir, job.get("files", {}))
+        _write_tree(tests_dir, job.get("tests", {}))
+        args = [a.format(code=code_dir, tests=tests_dir) for a in job["args"]]
+        timeout = float(job.get("timeout", 120))
+
+        pid = os.fork()
+        if pid == 0:
+            _run_child(code_dir, tests_dir, args, out_path, err_path)
+
+        deadline = time.monotonic() + timeout
+        timed_out = False
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            if time.monotonic() > deadline:
+                os.killpg(pid, signal.SIGKILL)
+                _, status = os.waitpid(pid, 0)
+                timed_out = True
+                break
+            time.sleep(0.01)
+
+        # Terminado ou não, nada do job sobrevive a ele
+        stray = _kill_group(pid)
+
+        with open(out_path, encoding="utf-8", errors="replace") as f:
+            stdout = f.read()
+        with open(err_path, encoding="utf-8", errors="replace") as f:
+            stderr = f.read()
+
+        return {
+            "returncode": os.waitstatus_to_exitcode(status),
+            "stdout": stdout,
+            "stderr": stderr,
+            "timed_out": timed_out,
+            "recycle": bool(stray),
+            "artifacts": _pack(tests_dir)
+        }
+    finally:
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+
+def main() -> None:
+    # Sinaliza para o host que o worker está pronto para receber jobs
+    print(json.dumps({"ready": True}), flush=True)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = _run_job(json.loads(line))
+        except Exception as e:
+            response = {
+                "returncode": -1,
+                "stdout": "",
+                "stderr": f"[Worker] {e}",
+                "timed_out": False,
+                "recycle": True,
+                "artifacts": ""
+            }
+        print(json.dumps(response), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Os módulos do backend (agents, tools, api) são importados a partir da raiz
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
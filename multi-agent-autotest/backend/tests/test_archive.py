@@ -0,0 +1,109 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from tools.archive import ArchiveError, _clean_path, extract_sources
+
+
+def _zip(members: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def _tar(members: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("mod.py", "mod.py"),
+    ("pkg/mod.py", "pkg/mod.py"),
+    ("pkg\\sub\\mod.py", "pkg/sub/mod.py"),
+    ("./pkg//mod.py", "pkg/mod.py"),
+    ("pkg/../mod.py", "mod.py"),
+])
+def test_clean_path_normalizes(name, expected):
+    assert _clean_path(name) == expected
+
+
+@pytest.mark.parametrize("name", ["../x.py", "/etc/x.py", "pkg/../../x.py", "..\\x.py"])
+def test_clean_path_rejects_paths_outside_project(name):
+    with pytest.raises(ArchiveError):
+        _clean_path(name)
+
+
+@pytest.mark.parametrize("name", [
+    "README.md",
+    "pkg/data.json",
+    ".git/hooks/x.py",
+    "pkg/__pycache__/mod.py",
+    "venv/lib/mod.py",
+])
+def test_clean_path_skips_non_sources(name):
+    assert _clean_path(name) is None
+
+
+def test_extract_zip_strips_single_root():
+    fileobj = _zip({
+        "projeto-main/pkg/__init__.py": b"",
+        "projeto-main/pkg/mod.py": b"x = 1\n",
+        "projeto-main/README.md": b"# projeto",
+    })
+    assert extract_sources(fileobj, "projeto.zip") == {
+        "pkg/__init__.py": "",
+        "pkg/mod.py": "x = 1\n",
+    }
+
+
+def test_extract_keeps_root_that_is_a_package():
+    fileobj = _zip({"pkg/__init__.py": b"", "pkg/mod.py": b"x = 1\n"})
+    assert set(extract_sources(fileobj, "pkg.zip")) == {"pkg/__init__.py", "pkg/mod.py"}
+
+
+def test_extract_tar_gz():
+    fileobj = _tar({"app.py": b"print(1)\n", "lib/util.py": b"y = 2\n"})
+    assert extract_sources(fileobj, "app.tar.gz") == {
+        "app.py": "print(1)\n",
+        "lib/util.py": "y = 2\n",
+    }
+
+
+def test_extract_rejects_traversal():
+    fileobj = _tar({"app.py": b"", "../evil.py": b"x = 1\n"})
+    with pytest.raises(ArchiveError):
+        extract_sources(fileobj, "app.tar")
+
+
+def test_extract_rejects_non_utf8():
+    with pytest.raises(ArchiveError):
+        extract_sources(_zip({"mod.py": "é".encode("latin-1")}), "mod.zip")
+
+
+def test_extract_without_sources():
+    with pytest.raises(ArchiveError):
+        extract_sources(_zip({"README.md": b"nada"}), "docs.zip")
+
+
+def test_extract_file_size_limit(monkeypatch):
+    monkeypatch.setattr("tools.archive.MAX_FILE_BYTES", 10)
+    with pytest.raises(ArchiveError):
+        extract_sources(_zip({"mod.py": b"x = 1234567890\n"}), "mod.zip")
+
+
+def test_extract_file_count_limit(monkeypatch):
+    monkeypatch.setattr("tools.archive.MAX_FILES", 2)
+    fileobj = _zip({f"m{i}.py": b"" for i in range(3)})
+    with pytest.raises(ArchiveError):
+        extract_sources(fileobj, "many.zip")
@@ -0,0 +1,134 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from tools import impact
+from tools.impact import DeltaRun, merge_junit, plan_delta
+
+TESTS_FILE = "test_generated.py"
+
+BASE = '''import pytest
+from mod import soma
+
+
+def test_soma():
+    assert soma(1, 2) == 3
+
+
+class TestSoma:
+    def test_zero(self):
+        assert soma(0, 0) == 0
+
+    def test_negativo(self):
+        assert soma(-1, -1) == -2
+'''
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    (tmp_path / TESTS_FILE).write_text(BASE)
+    (tmp_path / ".coverage").write_bytes(b"")
+    (tmp_path / "junit.xml").write_text("<testsuites/>")
+    return tmp_path
+
+
+def test_new_and_changed_tests_run(baseline):
+    current = BASE.replace("soma(0, 0) == 0", "soma(0, 1) == 1") + '''
+
+def test_grande():
+    assert soma(10**9, 1) == 10**9 + 1
+'''
+    delta = plan_delta(baseline, TESTS_FILE, current)
+    assert delta.run == ["TestSoma::test_zero", "test_grande"]
+    assert delta.drop == ["TestSoma::test_zero"]
+
+
+def test_formatting_and_comments_are_ignored(baseline):
+    current = BASE.replace("def test_soma():", "# comentário\ndef test_soma( ):")
+    assert plan_delta(baseline, TESTS_FILE, current) is None
+
+
+def test_removed_test_is_dropped(baseline):
+    current = BASE.replace(
+        "    def test_negativo(self):\n        assert soma(-1, -1) == -2\n", ""
+    ) + "\n\ndef test_novo():\n    assert soma(2, 2) == 4\n"
+    delta = plan_delta(baseline, TESTS_FILE, current)
+    assert delta.run == ["test_novo"]
+    assert delta.drop == ["TestSoma::test_negativo"]
+
+
+def test_class_context_change_reruns_its_methods(baseline):
+    current = BASE.replace("class TestSoma:", "class TestSoma:\n    fator = 2\n")
+    delta = plan_delta(baseline, TESTS_FILE, current)
+    assert set(delta.run) == {"TestSoma::test_zero", "TestSoma::test_negativo"}
+
+
+def test_support_change_runs_everything(baseline):
+    current = BASE.replace("import pytest\n", "") + "\n\ndef test_novo():\n    pass\n"
+    assert plan_delta(baseline, TESTS_FILE, current) is None
+
+
+def test_new_autouse_fixture_runs_everything(baseline):
+    current = BASE + '''
+
+@pytest.fixture(autouse=True)
+def limpa():
+    yield
+
+
+def test_novo():
+    pass
+'''
+    assert plan_delta(baseline, TESTS_FILE, current) is None
+
+
+def test_without_baseline_files(baseline):
+    (baseline / "junit.xml").unlink()
+    assert plan_delta(baseline, TESTS_FILE, BASE + "\n\ndef test_novo():\n    pass\n") is None
+
+
+def test_full_selection(baseline, monkeypatch):
+    monkeypatch.setattr(impact, "TEST_SELECTION", "full")
+    assert plan_delta(baseline, TESTS_FILE, BASE + "\n\ndef test_novo():\n    pass\n") is None
+
+
+def _junit(path, cases):
+    suite = "".join(
+        f'<testcase classname="{classname}" name="{name}" time="{time}">{body}</testcase>'
+        for classname, name, time, body in cases
+    )
+    path.write_text(f'<testsuites><testsuite name="pytest">{suite}</testsuite></testsuites>')
+
+
+def test_merge_junit(tmp_path):
+    baseline_dir = tmp_path / "base"
+    tests_dir = tmp_path / "run"
+    baseline_dir.mkdir()
+    tests_dir.mkdir()
+    _junit(baseline_dir / "junit.xml", [
+        ("test_generated", "test_soma", "0.1", ""),
+        ("test_generated.TestSoma", "test_zero[1]", "0.2", ""),
+        ("test_generated.TestSoma", "test_negativo", "0.3", "<failure/>"),
+    ])
+    _junit(tests_dir / "junit.xml", [
+        ("test_generated.TestSoma", "test_zero[1]", "0.4", "<failure/>"),
+        ("test_generated", "test_grande", "0.5", "<skipped/>"),
+    ])
+    delta = DeltaRun(baseline_dir=baseline_dir, run=["TestSoma::test_zero", "test_grande"],
+                     drop=["TestSoma::test_zero"])
+
+    merge_junit(delta, tests_dir)
+
+    suite = ET.parse(tests_dir / "junit.xml").find("testsuite")
+    names = [(case.get("classname"), case.get("name")) for case in suite.iter("testcase")]
+    assert names == [
+        ("test_generated", "test_soma"),
+        ("test_generated.TestSoma", "test_negativo"),
+        ("test_generated.TestSoma", "test_zero[1]"),
+        ("test_generated", "test_grande"),
+    ]
+    assert suite.get("tests") == "4"
+    assert suite.get("failures") == "2"
+    assert suite.get("skipped") == "1"
+    assert suite.get("errors") == "0"
+    assert suite.get("time") == "1.300"
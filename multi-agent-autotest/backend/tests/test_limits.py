@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+
+from tools.limits import Limit
+
+
+def test_sync_acquire_and_release():
+    limit = Limit("teste", 2)
+    with limit:
+        with limit:
+            assert limit.stats() == {"size": 2, "in_use": 2, "waiting": 0}
+    assert limit.stats() == {"size": 2, "in_use": 0, "waiting": 0}
+
+
+def test_async_waiters_are_fifo():
+    limit = Limit("teste", 1)
+    order = []
+
+    async def worker(i):
+        async with limit:
+            order.append(i)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        async with limit:
+            tasks = [asyncio.create_task(worker(i)) for i in range(5)]
+            await asyncio.sleep(0.01)
+            assert limit.waiting == 5
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == [0, 1, 2, 3, 4]
+    assert limit.stats() == {"size": 1, "in_use": 0, "waiting": 0}
+
+
+def test_cancelled_waiter_leaves_queue():
+    limit = Limit("teste", 1)
+    order = []
+
+    async def worker(i):
+        async with limit:
+            order.append(i)
+
+    async def main():
+        async with limit:
+            first = asyncio.create_task(worker(0))
+            second = asyncio.create_task(worker(1))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            await asyncio.sleep(0.01)
+            assert limit.waiting == 1
+        await second
+        assert first.cancelled()
+
+    asyncio.run(main())
+    assert order == [1]
+    assert limit.stats() == {"size": 1, "in_use": 0, "waiting": 0}
+
+
+def test_cancelled_after_hand_off_returns_slot():
+    limit = Limit("teste", 1)
+
+    async def main():
+        await limit.__aenter__()
+        waiter = asyncio.create_task(limit.__aenter__())
+        await asyncio.sleep(0.01)
+        # A vaga é entregue e a task é cancelada antes de acordar
+        await limit.__aexit__(None, None, None)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+        assert waiter.cancelled()
+
+    asyncio.run(main())
+    assert limit.stats() == {"size": 1, "in_use": 0, "waiting": 0}
+
+
+def test_threads_and_tasks_share_slots():
+    limit = Limit("teste", 1)
+    order = []
+    holding = threading.Event()
+    release = threading.Event()
+
+    def thread_holder():
+        with limit:
+            holding.set()
+            release.wait()
+            order.append("thread")
+
+    async def main():
+        holder = threading.Thread(target=thread_holder)
+        holder.start()
+        await asyncio.to_thread(holding.wait)
+        task = asyncio.create_task(_task())
+        await asyncio.sleep(0.01)
+        assert limit.waiting == 1
+        release.set()
+        await task
+        holder.join()
+
+    async def _task():
+        async with limit:
+            order.append("task")
+
+    asyncio.run(main())
+    assert order == ["thread", "task"]
+    assert limit.stats() == {"size": 1, "in_use": 0, "waiting": 0}
+
+
+def test_thread_waits_for_task():
+    limit = Limit("teste", 1)
+    order = []
+
+    def thread_waiter():
+        with limit:
+            order.append("thread")
+
+    async def main():
+        async with limit:
+            waiter = threading.Thread(target=thread_waiter)
+            waiter.start()
+            while limit.waiting == 0:
+                await asyncio.sleep(0.001)
+            time.sleep(0.01)
+            order.append("task")
+        await asyncio.to_thread(waiter.join)
+
+    asyncio.run(main())
+    assert order == ["task", "thread"]
@@ -0,0 +1,69 @@
+import pytest
+from tools.line_ranges import LineRanges, to_json
+
+
+def test_merges_overlapping_and_adjacent_ranges():
+    lines = LineRanges([(10, 12), (1, 3), (4, 5), (11, 20), (30, 29)])
+    assert lines.ranges == ((1, 5), (10, 20))
+
+
+def test_from_lines_compresses_consecutive_lines():
+    assert LineRanges.from_lines([5, 1, 2, 3, 7]).ranges == ((1, 3), (5, 5), (7, 7))
+
+
+@pytest.mark.parametrize("text, ranges", [
+    ("12-40, 55, 60-71", ((12, 40), (55, 55), (60, 71))),
+    ("3,1-2", ((1, 3),)),
+    ("", ()),
+    (" 7 , ", ((7, 7),)),
+])
+def test_parse(text, ranges):
+    assert LineRanges.parse(text).ranges == ranges
+
+
+def test_str_roundtrips_through_parse():
+    lines = LineRanges([(12, 40), (55, 55), (60, 71)])
+    assert str(lines) == "12-40, 55, 60-71"
+    assert LineRanges.parse(str(lines)) == lines
+
+
+def test_union():
+    a = LineRanges([(1, 3), (10, 12)])
+    b = LineRanges([(4, 6), (11, 15), (20, 20)])
+    assert (a | b).ranges == ((1, 6), (10, 15), (20, 20))
+
+
+def test_intersection():
+    a = LineRanges([(1, 10), (20, 30)])
+    b = LineRanges([(5, 22), (28, 40)])
+    assert (a & b).ranges == ((5, 10), (20, 22), (28, 30))
+    assert not a & LineRanges([(11, 19)])
+
+
+def test_difference():
+    a = LineRanges([(1, 10), (20, 30)])
+    b = LineRanges([(3, 4), (8, 21), (30, 35)])
+    assert (a - b).ranges == ((1, 2), (5, 7), (22, 29))
+    assert not a - a
+    assert a - LineRanges() == a
+
+
+def test_set_operations_match_python_sets():
+    a = LineRanges.parse("1-5, 9, 12-20, 40-42")
+    b = LineRanges.parse("3-10, 15, 19-41")
+    assert set(a | b) == set(a) | set(b)
+    assert set(a & b) == set(a) & set(b)
+    assert set(a - b) == set(a) - set(b)
+
+
+def test_len_contains_and_intersects():
+    lines = LineRanges.parse("1-3, 10-12")
+    assert len(lines) == 6
+    assert 2 in lines and 11 in lines
+    assert 5 not in lines and 0 not in lines and 13 not in lines
+    assert lines.intersects(4, 10)
+    assert not lines.intersects(4, 9)
+
+
+def test_to_json():
+    assert to_json({"a.py": LineRanges.parse("1-2, 5")}) == {"a.py": "1-2, 5"}
@@ -0,0 +1,96 @@
+import ast
+from tools.merge_tests import drop_tests, merge_tests, parses
+from tools import merge_tests as merging
+
+EXISTING = '''import pytest
+from calc import add
+
+
+@pytest.fixture
+def numbers():
+    return [1, 2]
+
+
+def test_add():
+    assert add(1, 2) == 3
+
+
+class TestAdd:
+    def test_zero(self):
+        assert add(0, 0) == 0
+'''
+
+
+def test_test_names_lists_functions_and_class_methods():
+    assert merging.test_names(EXISTING) == ["test_add", "TestAdd::test_zero"]
+    assert merging.test_names("def test_(:") == []
+
+
+def test_parses():
+    assert parses(EXISTING)
+    assert not parses("def broken(:")
+
+
+def test_merge_into_empty_module_returns_delta():
+    assert merge_tests("", "def test_a():\n    pass\n") == "def test_a():\n    pass\n"
+
+
+def test_merge_appends_new_tests_and_imports():
+    delta = "from calc import sub\n\n\ndef test_sub():\n    assert sub(2, 1) == 1\n"
+    merged = merge_tests(EXISTING, delta)
+    assert parses(merged)
+    assert merging.test_names(merged) == ["test_add", "TestAdd::test_zero", "test_sub"]
+    lines = merged.splitlines()
+    assert lines.index("from calc import sub") == lines.index("from calc import add") + 1
+
+
+def test_merge_drops_duplicates_and_renames_clashes():
+    delta = (
+        "def test_same_body():\n    assert add(1, 2) == 3\n\n\n"
+        "def test_add():\n    assert add(2, 2) == 4\n"
+    )
+    merged = merge_tests(EXISTING, delta)
+    assert merging.test_names(merged) == ["test_add", "TestAdd::test_zero", "test_add_2"]
+
+
+def test_merge_keeps_existing_fixture_on_name_clash():
+    delta = "@pytest.fixture\ndef numbers():\n    return [3]\n"
+    merged = merge_tests(EXISTING, delta)
+    assert "return [3]" not in merged
+
+
+def test_merge_adds_methods_to_existing_class():
+    delta = (
+        "class TestAdd:\n"
+        "    def test_zero(self):\n        assert add(0, 0) == 0\n\n"
+        "    def test_negative(self):\n        assert add(-1, -1) == -2\n"
+    )
+    merged = merge_tests(EXISTING, delta)
+    assert merging.test_names(merged) == ["test_add", "TestAdd::test_zero", "TestAdd::test_negative"]
+    assert sum(isinstance(node, ast.ClassDef) for node in ast.parse(merged).body) == 1
+
+
+def test_merge_reindents_methods_to_the_existing_class():
+    delta = "class TestAdd:\n  def test_two(self):\n      assert add(1, 1) == 2\n"
+    merged = merge_tests(EXISTING, delta)
+    assert "    def test_two(self):\n        assert add(1, 1) == 2" in merged
+
+
+def test_merge_with_invalid_delta_keeps_existing():
+    assert merge_tests(EXISTING, "def test_(:") == EXISTING
+
+
+def test_drop_tests_removes_functions_and_methods():
+    dropped = drop_tests(EXISTING, {"test_add"})
+    assert merging.test_names(dropped) == ["TestAdd::test_zero"]
+    assert "def numbers" in dropped
+
+
+def test_drop_tests_removes_emptied_class():
+    dropped = drop_tests(EXISTING, {"TestAdd::test_zero"})
+    assert "class TestAdd" not in dropped
+    assert merging.test_names(dropped) == ["test_add"]
+
+
+def test_drop_tests_without_matches_is_a_noop():
+    assert drop_tests(EXISTING, {"test_missing"}) == EXISTING
@@ -0,0 +1,106 @@
+from tools.line_ranges import LineRanges
+from tools.review_rules import classify_lines, decide
+
+SOURCE = '''import os
+import requests
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+
+
+class Base(ABC):
+    @abstractmethod
+    def run(self):
+        ...
+
+
+def build(p, x):
+    path = os.path.join(p, x)
+    if x == "z":
+        return 1
+    if os.path.exists(path):
+        size = 2
+        return size
+    try:
+        response = requests.get(path)
+    except requests.RequestException:
+        return None
+    return response
+
+
+@dataclass
+class Loan:
+    loan_date: date
+    days: int = 7
+
+    def late(self, today: date) -> bool:
+        return today > self.loan_date
+
+
+if __name__ == "__main__":
+    build(".", "a")
+'''
+
+
+def _lines(*texts: str) -> LineRanges:
+    source = SOURCE.splitlines()
+    return LineRanges.from_lines(source.index(text) + 1 for text in texts)
+
+
+def test_pure_branch_in_function_with_io_is_logic():
+    lines = _lines('    if x == "z":', "        return 1")
+    assert classify_lines(SOURCE, lines)["logic"] == lines
+
+
+def test_statements_and_blocks_using_dependencies_are_external():
+    lines = _lines(
+        "    path = os.path.join(p, x)",
+        "        size = 2",
+        "        response = requests.get(path)",
+        "        return None",
+    )
+    classified = classify_lines(SOURCE, lines)
+    assert classified["external"] == lines
+    assert not classified["logic"]
+
+
+def test_type_annotations_are_not_external():
+    lines = _lines("    loan_date: date", "        return today > self.loan_date")
+    assert classify_lines(SOURCE, lines)["logic"] == lines
+
+
+def test_abstract_methods_and_main_guard_are_trivial():
+    lines = _lines("        ...", '    build(".", "a")')
+    assert classify_lines(SOURCE, lines)["trivial"] == lines
+
+
+def _state(coverage_pct: float, lines: LineRanges, iteration: int = 1) -> dict:
+    return {
+        "coverage_pct": coverage_pct,
+        "threshold": 80.0,
+        "iteration": iteration,
+        "max_iterations": 3,
+        "files": {"mod.py": SOURCE},
+        "uncovered_lines": {"mod.py": lines} if lines else {},
+    }
+
+
+def test_decide_stops_at_threshold_and_max_iterations():
+    assert decide(_state(85.0, _lines("        return 1")))[0] is False
+    assert decide(_state(50.0, _lines("        return 1"), iteration=3))[0] is False
+
+
+def test_decide_iterates_on_uncovered_logic():
+    assert decide(_state(50.0, _lines("        return 1")))[0] is True
+
+
+def test_decide_iterates_without_coverage():
+    assert decide(_state(0.0, LineRanges()))[0] is True
+
+
+def test_decide_stops_when_only_trivial_lines_remain():
+    assert decide(_state(50.0, _lines("        ...")))[0] is False
+
+
+def test_decide_defers_to_llm_when_only_external_lines_remain():
+    assert decide(_state(50.0, _lines("        response = requests.get(path)"))) is None
@@ -0,0 +1,65 @@
+import pytest
+
+from tools import shards
+from tools.shards import load_durations, plan_shards
+
+
+@pytest.fixture(autouse=True)
+def min_tests(monkeypatch):
+    monkeypatch.setattr(shards, "MIN_TESTS_PER_SHARD", 2)
+
+
+def _loads(groups, durations):
+    return [sum(durations[name] for name in group) for group in groups]
+
+
+def test_few_tests_stay_in_one_group():
+    tests = ["test_a", "test_b", "test_c"]
+    assert plan_shards(tests, {}, shards=4) == [tests]
+
+
+def test_single_shard():
+    tests = [f"test_{i}" for i in range(10)]
+    assert plan_shards(tests, {}, shards=1) == [tests]
+
+
+def test_groups_are_balanced():
+    durations = {"test_a": 8.0, "test_b": 7.0, "test_c": 6.0, "test_d": 5.0,
+                 "test_e": 4.0, "test_f": 2.0}
+    groups = plan_shards(list(durations), durations, shards=2)
+    assert len(groups) == 2
+    assert sorted(name for group in groups for name in group) == sorted(durations)
+    # LPT: 8+5+4 e 7+6+2 (o ótimo seria 16 e 16)
+    assert sorted(_loads(groups, durations)) == [15.0, 17.0]
+
+
+def test_group_count_limited_by_min_tests():
+    tests = [f"test_{i}" for i in range(5)]
+    assert len(plan_shards(tests, {}, shards=8)) == 2
+
+
+def test_unknown_tests_use_average():
+    durations = {"test_lento": 10.0, "test_rapido": 2.0}
+    tests = ["test_lento", "test_rapido", "test_novo1", "test_novo2"]
+    groups = plan_shards(tests, durations, shards=2)
+    # Os novos contam 6 s cada: o lento fica sozinho com o rápido
+    assert sorted(groups) == [["test_lento", "test_rapido"], ["test_novo1", "test_novo2"]]
+
+
+def test_load_durations_sums_parametrizations(tmp_path):
+    junit = tmp_path / "junit.xml"
+    junit.write_text(
+        '<testsuites><testsuite name="pytest">'
+        '<testcase classname="test_generated" name="test_a[1]" time="0.5"/>'
+        '<testcase classname="test_generated" name="test_a[2]" time="0.25"/>'
+        '<testcase classname="test_generated.TestX" name="test_b" time="1.0"/>'
+        '</testsuite></testsuites>'
+    )
+    assert load_durations(junit) == {"test_a": 0.75, "TestX::test_b": 1.0}
+
+
+def test_load_durations_missing_or_invalid(tmp_path):
+    assert load_durations(tmp_path / "junit.xml") == {}
+    broken = tmp_path / "broken.xml"
+    broken.write_text("<testsuites><testcase")
+    assert load_durations(broken) == {}
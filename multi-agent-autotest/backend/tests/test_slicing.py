@@ -0,0 +1,102 @@
+from tools.line_ranges import LineRanges
+from tools.slicing import filter_analysis, match_file, slice_context
+
+SOURCE = '''import json
+import os
+
+LIMIT = 10
+UNUSED = 3
+
+
+def helper(x):
+    return x * 2
+
+
+def target(x):
+    if x > LIMIT:
+        return helper(x)
+    return json.dumps(x)
+
+
+def other():
+    return os.getcwd()
+
+
+class Account:
+    kind = "basic"
+
+    def __init__(self, balance):
+        self.balance = balance
+
+    def withdraw(self, amount):
+        if amount > self.balance:
+            raise ValueError("saldo")
+        self.balance -= amount
+
+    def deposit(self, amount):
+        self.balance += amount
+'''
+
+
+def _line(text: str) -> int:
+    return SOURCE.splitlines().index(text) + 1
+
+
+def test_match_file():
+    files = {"pkg/mod.py": "", "main.py": ""}
+    assert match_file(files, "pkg/mod.py") == "pkg/mod.py"
+    assert match_file(files, "mod.py") == "pkg/mod.py"
+    assert match_file(files, "src/main.py") == "main.py"
+    assert match_file(files, "missing.py") is None
+
+
+def test_slice_keeps_enclosing_function_callees_and_used_globals():
+    line = _line("        return helper(x)")
+    sliced, kept = slice_context({"mod.py": SOURCE}, {"mod.py": LineRanges([(line, line)])})
+    text = sliced["mod.py"]
+    assert "def target" in text and "def helper" in text
+    assert "import json" in text and "LIMIT = 10" in text
+    assert "def other" not in text and "UNUSED" not in text and "import os" not in text
+    assert kept == {(None, "target"), (None, "helper")}
+
+
+def test_slice_marks_original_line_numbers():
+    line = _line("def helper(x):")
+    sliced, _ = slice_context({"mod.py": SOURCE}, {"mod.py": LineRanges([(line, line + 1)])})
+    assert f"# linhas {line}-{line + 1}" in sliced["mod.py"]
+
+
+def test_slice_of_method_keeps_class_header_and_init():
+    line = _line('            raise ValueError("saldo")')
+    sliced, kept = slice_context({"mod.py": SOURCE}, {"mod.py": LineRanges([(line, line)])})
+    text = sliced["mod.py"]
+    assert "class Account:" in text and 'kind = "basic"' in text
+    assert "def __init__" in text and "def withdraw" in text
+    assert "def deposit" not in text
+    assert kept == {("Account", "withdraw"), ("Account", "__init__")}
+
+
+def test_unparseable_file_is_kept_whole():
+    files = {"bad.py": "def broken(:\n"}
+    sliced, kept = slice_context(files, {"bad.py": LineRanges([(1, 1)])})
+    assert sliced == files and not kept
+
+
+def test_files_without_uncovered_lines_are_left_out():
+    sliced, _ = slice_context({"mod.py": SOURCE, "b.py": "x = 1\n"}, {"b.py": LineRanges()})
+    assert sliced == {}
+
+
+def test_filter_analysis_keeps_only_sliced_functions():
+    analysis = {
+        "mod.py": [
+            {"class": None, "name": "target"},
+            {"class": None, "name": "other"},
+            {"class": "Account", "name": "withdraw"},
+        ],
+        "b.py": [{"class": None, "name": "f"}],
+    }
+    kept = {(None, "target"), ("Account", "withdraw")}
+    assert filter_analysis(analysis, {"mod.py": ""}, kept) == {
+        "mod.py": [{"class": None, "name": "target"}, {"class": "Account", "name": "withdraw"}]
+    }
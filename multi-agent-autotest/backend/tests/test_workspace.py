@@ -0,0 +1,86 @@
+import os
+import time
+
+import pytest
+
+from tools import workspace
+from tools.workspace import collect, materialize
+
+FILES = {"mod.py": "x = 1\n", "pkg/util.py": "y = 2\n"}
+
+
+@pytest.fixture(autouse=True)
+def workspace_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "BLOBS_DIR", tmp_path / "blobs")
+    monkeypatch.setattr(workspace, "TREES_DIR", tmp_path / "trees")
+
+
+def _read(tree):
+    return {name: (tree / name).read_text() for name in FILES}
+
+
+def test_materialize_writes_files_once():
+    tree, written = materialize(FILES)
+    assert _read(tree) == FILES
+    assert written == sum(len(content) for content in FILES.values())
+
+    again, written = materialize(dict(reversed(FILES.items())))
+    assert again == tree
+    assert written == 0
+
+
+def test_identical_contents_share_blob():
+    tree, written = materialize({"a.py": "z = 0\n", "b.py": "z = 0\n"})
+    assert written == len("z = 0\n")
+    assert (tree / "a.py").stat().st_ino == (tree / "b.py").stat().st_ino
+
+
+def test_different_files_get_another_tree():
+    tree, _ = materialize(FILES)
+    other, written = materialize({**FILES, "mod.py": "x = 2\n"})
+    assert other != tree
+    # Só o arquivo alterado gera um blob novo
+    assert written == len("x = 2\n")
+
+
+def test_altered_workspace_is_rebuilt():
+    tree, _ = materialize(FILES)
+    # Escrita pelo hardlink: altera também o blob compartilhado
+    os.chmod(tree / "mod.py", 0o644)
+    (tree / "mod.py").write_text("x = 'alterado'\n")
+
+    rebuilt, written = materialize(FILES)
+    assert rebuilt == tree
+    assert written == len(FILES["mod.py"])
+    assert _read(rebuilt) == FILES
+
+
+def test_missing_file_in_workspace_is_rebuilt():
+    tree, _ = materialize(FILES)
+    (tree / "pkg" / "util.py").unlink()
+    rebuilt, _ = materialize(FILES)
+    assert _read(rebuilt) == FILES
+
+
+def test_collect_removes_idle_trees_and_unused_blobs(monkeypatch):
+    tree, _ = materialize(FILES)
+    assert collect() == {"removed_trees": 0, "removed_blobs": 0}
+
+    old = time.time() - 3600
+    os.utime(tree, (old, old))
+    for blob in workspace.BLOBS_DIR.glob("*/*"):
+        os.utime(blob, (old, old))
+    monkeypatch.setattr(workspace, "MAX_IDLE", 60)
+
+    assert collect() == {"removed_trees": 1, "removed_blobs": len(FILES)}
+    assert not tree.exists()
+    assert not list(workspace.BLOBS_DIR.glob("*/*"))
+
+
+def test_collect_keeps_blobs_in_use(monkeypatch):
+    materialize(FILES)
+    old = time.time() - 3600
+    for blob in workspace.BLOBS_DIR.glob("*/*"):
+        os.utime(blob, (old, old))
+    monkeypatch.setattr(workspace, "MAX_IDLE", 60)
+    assert collect() == {"removed_trees": 0, "removed_blobs": 0}
@@ -0,0 +1,142 @@
+import os
+import posixpath
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator
+
+# Limites do upload de projetos compactados
+MAX_ARCHIVE_BYTES = int(float(os.getenv("ARCHIVE_MAX_MB", "50")) * 1024 * 1024)
+MAX_MEMBERS = int(os.getenv("ARCHIVE_MAX_MEMBERS", "10000"))   # entradas lidas do arquivo
+MAX_FILES = int(os.getenv("ARCHIVE_MAX_FILES", "1000"))        # fontes .py extraídas
+MAX_FILE_BYTES = int(float(os.getenv("ARCHIVE_MAX_FILE_KB", "1024")) * 1024)
+MAX_TOTAL_BYTES = int(float(os.getenv("ARCHIVE_MAX_TOTAL_MB", "50")) * 1024 * 1024)
+
+# Diretórios que não são código do projeto
+IGNORED_DIRS = {"__pycache__", "node_modules", "site-packages", "venv", "env"}
+
+ARCHIVE_SUFFIXES = (".zip", ".tar.gz", ".tgz", ".tar")
+CHUNK = 64 * 1024
+
+
+class ArchiveError(ValueError):
+    """Arquivo compactado inválido ou acima dos limites."""
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _clean_path(name: str) -> str | None:
+    # Caminho relativo e normalizado dentro do projeto; None para o que não
+    # é fonte Python do projeto
+    path = posixpath.normpath(name.replace("\\", "/"))
+    if path.startswith("/") or path == ".." or path.startswith("../"):
+        raise ArchiveError(f"Caminho inválido no arquivo: '{name}'")
+    parts = path.split("/")
+    if not path.endswith(".py"):
+        return None
+    if any(part.startswith(".") or part in IGNORED_DIRS for part in parts[:-1]):
+        return None
+    return path
+
+
+def _read_limited(stream: BinaryIO, name: str) -> bytes:
+    # Lê em blocos e para no limite: o tamanho declarado no cabeçalho não é
+    # confiável (zip bomb)
+    chunks, size = [], 0
+    while chunk := stream.read(CHUNK):
+        size += len(chunk)
+        if size > MAX_FILE_BYTES:
+            raise ArchiveError(f"'{name}' excede {MAX_FILE_BYTES // 1024} KB")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _zip_members(fileobj: BinaryIO) -> Iterator[tuple[str, BinaryIO]]:
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile as e:
+        raise ArchiveError(f"Zip inválido: {e}")
+    with archive:
+        for count, info in enumerate(archive.infolist(), start=1):
+            if count > MAX_MEMBERS:
+                raise ArchiveError(f"Arquivo com mais de {MAX_MEMBERS} entradas")
+            if info.is_dir():
+                continue
+            with archive.open(info) as stream:
+                yield info.filename, stream
+
+
+def _tar_members(fileobj: BinaryIO) -> Iterator[tuple[str, BinaryIO]]:
+    try:
+        # Modo stream ("r|*"): membros lidos em sequência, sem seek
+        archive = tarfile.open(fileobj=fileobj, mode="r|*")
+    except tarfile.TarError as e:
+        raise ArchiveError(f"Tar inválido: {e}")
+    with archive:
+        try:
+            for count, member in enumerate(archive, start=1):
+                if count > MAX_MEMBERS:
+                    raise ArchiveError(f"Arquivo com mais de {MAX_MEMBERS} entradas")
+                # Links, dispositivos e diretórios são ignorados
+                if not member.isfile():
+                    continue
+                stream = archive.extractfile(member)
+                if stream is not None:
+                    yield member.name, stream
+        except tarfile.TarError as e:
+            raise ArchiveError(f"Tar inválido: {e}")
+
+
+def _strip_root(files: dict[str, str]) -> dict[str, str]:
+    # "projeto-main/pkg/mod.py" → "pkg/mod.py" quando tudo está sob uma única
+    # pasta raiz que não é ela mesma um pacote
+    roots = {path.split("/", 1)[0] for path in files}
+    if len(roots) != 1 or any("/" not in path for path in files):
+        return files
+    root = roots.pop()
+    if f"{root}/__init__.py" in files:
+        return files
+    return {path.split("/", 1)[1]: content for path, content in files.items()}
+
+
+def extract_sources(fileobj: BinaryIO, filename: str) -> dict[str, str]:
+    """
+    Extrai as fontes .py de um projeto enviado como .zip, .tar.gz ou .tar.
+
+    O arquivo é lido em streaming a partir de `fileobj` (o arquivo temporário
+    do upload, que vai para o disco acima de 1 MB): só as fontes Python
+    aceitas ficam em memória. A estrutura de pacotes é preservada, sem a
+    pasta raiz única que o GitHub e afins colocam no arquivo. Caches,
+    ambientes virtuais e diretórios ocultos são ignorados.
+
+    Limites: tamanho do arquivo compactado, número de entradas, número de
+    fontes, tamanho de cada fonte e tamanho total extraído. Qualquer violação,
+    caminho fora do projeto ou fonte que não seja UTF-8 dispara ArchiveError.
+    """
+    fileobj.seek(0, os.SEEK_END)
+    if fileobj.tell() > MAX_ARCHIVE_BYTES:
+        raise ArchiveError(f"Arquivo excede {MAX_ARCHIVE_BYTES // (1024 * 1024)} MB")
+    fileobj.seek(0)
+
+    members = _zip_members(fileobj) if filename.lower().endswith(".zip") else _tar_members(fileobj)
+    files: dict[str, str] = {}
+    total = 0
+    for name, stream in members:
+        path = _clean_path(name)
+        if path is None:
+            continue
+        if len(files) >= MAX_FILES:
+            raise ArchiveError(f"Projeto com mais de {MAX_FILES} arquivos .py")
+        content = _read_limited(stream, name)
+        total += len(content)
+        if total > MAX_TOTAL_BYTES:
+            raise ArchiveError(f"Fontes excedem {MAX_TOTAL_BYTES // (1024 * 1024)} MB extraídos")
+        try:
+            files[path] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            raise ArchiveError(f"'{name}' não está em UTF-8")
+
+    if not files:
+        raise ArchiveError("Nenhum arquivo .py encontrado no arquivo enviado")
+    return _strip_root(files)
@@ -0,0 +1,211 @@
+import ast
+import hashlib
+from pathlib import Path
+
+# Versão da extração para chaves de cache: qualquer edição neste módulo
+# invalida as análises feitas com a versão anterior
+VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+# Módulos cujo uso indica uma dependência externa, por categoria
+EXTERNAL_MODULES = {
+    "http": {"requests", "httpx", "urllib", "urllib3", "aiohttp", "http"},
+    "database": {"sqlite3", "psycopg2", "psycopg", "pymysql", "sqlalchemy",
+                 "pymongo", "motor", "asyncpg"},
+    "cache": {"redis", "memcache", "pymemcache"},
+    "filesystem": {"os", "pathlib", "shutil", "glob", "tempfile", "io"},
+    "subprocess": {"subprocess"},
+    "network": {"socket", "smtplib", "ftplib", "paramiko"},
+    "clock": {"time", "datetime"},
+    "random": {"random", "secrets", "uuid"},
+}
+
+# Chamadas a builtins que também indicam dependência externa
+EXTERNAL_BUILTINS = {"open": "filesystem", "input": "stdin"}
+
+# Casos de borda derivados mecanicamente do tipo do parâmetro
+EDGE_CASES_BY_TYPE = {
+    "str": ["string vazia"],
+    "int": ["zero", "número negativo"],
+    "float": ["zero", "número negativo"],
+    "list": ["lista vazia"],
+    "dict": ["dicionário vazio"],
+    "set": ["conjunto vazio"],
+    "tuple": ["tupla vazia"],
+    "bool": ["True e False"],
+}
+
+
+def _category(module: str) -> str | None:
+    root = module.split(".")[0]
+    for category, modules in EXTERNAL_MODULES.items():
+        if root in modules:
+            return category
+    return None
+
+
+def imported_names(tree: ast.Module) -> dict[str, str]:
+    """Mapeia cada nome importado no módulo para a categoria de dependência."""
+    names: dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                category = _category(alias.name)
+                if category:
+                    names[(alias.asname or alias.name).split(".")[0]] = category
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            category = _category(node.module)
+            if category:
+                for alias in node.names:
+                    names[alias.asname or alias.name] = category
+    return names
+
+
+def _infer_type(default: ast.expr | None) -> str:
+    # Sem anotação, infere o tipo a partir do valor padrão quando houver
+    if isinstance(default, ast.Constant):
+        if default.value is None:
+            return "Any | None"
+        return type(default.value).__name__
+    if isinstance(default, (ast.List, ast.ListComp)):
+        return "list"
+    if isinstance(default, (ast.Dict, ast.DictComp)):
+        return "dict"
+    if isinstance(default, ast.Tuple):
+        return "tuple"
+    return "Any"
+
+
+def _parameters(func: ast.FunctionDef | ast.AsyncFunctionDef,
+                is_method: bool) -> list[dict]:
+    args = func.args
+    positional = args.posonlyargs + args.args
+    defaults: list[ast.expr | None] = (
+        [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    )
+    pairs = list(zip(positional, defaults))
+    pairs += list(zip(args.kwonlyargs, args.kw_defaults))
+
+    parameters = []
+    for i, (arg, default) in enumerate(pairs):
+        if is_method and i == 0 and arg.arg in ("self", "cls"):
+            continue
+        annotation = ast.unparse(arg.annotation) if arg.annotation else _infer_type(default)
+        parameters.append({"name": arg.arg, "type": annotation})
+    if args.vararg:
+        parameters.append({"name": f"*{args.vararg.arg}", "type": "tuple"})
+    if args.kwarg:
+        parameters.append({"name": f"**{args.kwarg.arg}", "type": "dict"})
+    return parameters
+
+
+def _return_type(func: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    if func.returns:
+        return ast.unparse(func.returns)
+    returns = [
+        node for node in ast.walk(func)
+        if isinstance(node, ast.Return) and node.value is not None
+    ]
+    if not returns:
+        return "None"
+    if all(isinstance(r.value, ast.Compare) or (
+        isinstance(r.value, ast.Constant) and isinstance(r.value.value, bool)
+    ) for r in returns):
+        return "bool"
+    return "Any"
+
+
+def _walk_code(root: ast.AST):
+    # ast.walk sem as anotações de tipo (parâmetros, retorno e AnnAssign):
+    # `d: date` não executa nada de `datetime`
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        yield node
+        for name, value in ast.iter_fields(node):
+            if name in ("annotation", "returns"):
+                continue
+            if isinstance(value, ast.AST):
+                pending.append(value)
+            elif isinstance(value, list):
+                pending.extend(item for item in value if isinstance(item, ast.AST))
+
+
+def dependencies(func: ast.AST, imported: dict[str, str]) -> list[str]:
+    """
+    Categorias de dependência externa usadas dentro de um nó do AST. Nomes
+    que só aparecem em anotações de tipo não contam.
+    """
+    found: list[str] = []
+    for node in _walk_code(func):
+        category = None
+        if isinstance(node, ast.Name):
+            category = imported.get(node.id)
+            if category is None and isinstance(node.ctx, ast.Load):
+                category = EXTERNAL_BUILTINS.get(node.id)
+        if category and category not in found:
+            found.append(category)
+    return found
+
+
+def _edge_cases(func: ast.FunctionDef | ast.AsyncFunctionDef,
+                parameters: list[dict]) -> list[str]:
+    cases: list[str] = []
+    for param in parameters:
+        base = param["type"].split("[")[0].strip()
+        for case in EDGE_CASES_BY_TYPE.get(base, []):
+            case = f"{param['name']}: {case}"
+            if case not in cases:
+                cases.append(case)
+        if "None" in param["type"] or "Optional" in param["type"]:
+            cases.append(f"{param['name']}: None como input")
+
+    for node in ast.walk(func):
+        if isinstance(node, ast.Raise) and node.exc is not None:
+            exc = node.exc.func if isinstance(node.exc, ast.Call) else node.exc
+            case = f"dispara {ast.unparse(exc)}"
+            if case not in cases:
+                cases.append(case)
+    return cases
+
+
+def _describe(func: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    docstring = ast.get_docstring(func)
+    if not docstring:
+        return ""
+    return docstring.strip().splitlines()[0]
+
+
+def extract_functions(content: str) -> list[dict]:
+    """
+    Extrai as funções e métodos de um arquivo Python usando `ast`, no mesmo
+    formato de `functions` pedido pelo analyzer.j2.
+
+    Nome, classe, parâmetros, tipos, retorno e dependências externas são
+    extraídos mecanicamente. `description` vem da docstring e `edge_cases`
+    são derivados dos tipos dos parâmetros e das exceções disparadas — campos
+    que o modo híbrido do Analisador refina com o LLM.
+
+    Dispara SyntaxError se o arquivo não puder ser parseado.
+    """
+    tree = ast.parse(content)
+    imported = imported_names(tree)
+    functions: list[dict] = []
+
+    def visit(body: list[ast.stmt], class_name: str | None) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                visit(node.body, node.name)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                parameters = _parameters(node, is_method=class_name is not None)
+                functions.append({
+                    "name": node.name,
+                    "class": class_name,
+                    "parameters": parameters,
+                    "return_type": _return_type(node),
+                    "description": _describe(node),
+                    "external_dependencies": dependencies(node, imported),
+                    "edge_cases": _edge_cases(node, parameters),
+                })
+
+    visit(tree.body, None)
+    return functions
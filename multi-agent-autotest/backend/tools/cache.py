@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Pasta onde ficam os caches persistentes
+CACHE_DIR = Path(os.getenv("CACHE_DIR", Path(__file__).parent.parent / ".cache"))
+
+
+def sha256(*parts: str) -> str:
+    """Hash SHA-256 das partes, separadas para evitar colisões por concatenação."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Cache chave → JSON persistido em SQLite, com despejo LRU.
+
+    Cada leitura atualiza o último acesso da entrada; quando o número de
+    entradas passa de `max_entries`, as acessadas há mais tempo são removidas.
+    Os contadores de hit/miss são do processo atual.
+    """
+
+    def __init__(self, name: str, max_entries: int):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(CACHE_DIR / f"{name}.sqlite3"),
+            check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._db.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, accessed_at)"
+                " VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            self._db.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed_at DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_caches: dict[str, DiskCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, max_entries: int) -> DiskCache:
+    """Retorna o cache `name` do processo, abrindo-o na primeira chamada."""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = DiskCache(name, max_entries)
+        return _caches[name]
+
+
+def all_stats() -> dict[str, dict]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
@@ -0,0 +1,101 @@
+import gzip
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Fontes do run gravadas junto com o .coverage, num único arquivo
+SOURCES_FILE = "sources.json.gz"
+DATA_FILE = ".coverage"
+HTML_DIR = "htmlcov"
+TIMEOUT = 120
+
+# Lock por report com o número de threads usando-o: sai do dicionário
+# quando a última termina, então não cresce com cada report já servido
+_locks: dict[str, tuple[threading.Lock, int]] = {}
+_locks_lock = threading.Lock()
+
+
+def save_sources(report_dir: Path, files: dict[str, str]) -> None:
+    """Grava o código do usuário no report, para gerar o HTML depois."""
+    with gzip.open(report_dir / SOURCES_FILE, "wt", encoding="utf-8") as f:
+        json.dump(files, f)
+
+
+@contextmanager
+def _lock(report_dir: Path):
+    key = str(report_dir)
+    with _locks_lock:
+        lock, users = _locks.get(key, (threading.Lock(), 0))
+        _locks[key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _locks_lock:
+            lock, users = _locks[key]
+            if users == 1:
+                del _locks[key]
+            else:
+                _locks[key] = (lock, users - 1)
+
+
+def ensure_html(report_dir: Path) -> Path | None:
+    """
+    Gera o HTML do coverage de um report na primeira vez que ele é pedido.
+
+    Usa o .coverage e as fontes gravados pelo executor; o resultado fica em
+    htmlcov/ e as próximas requisições o servem direto. Retorna None se o
+    report não tem dados de coverage.
+    """
+    html_dir = report_dir / HTML_DIR
+    if (html_dir / "index.html").exists():
+        return html_dir
+
+    with _lock(report_dir):
+        if (html_dir / "index.html").exists():
+            return html_dir
+        data_file = report_dir / DATA_FILE
+        sources_file = report_dir / SOURCES_FILE
+        if not data_file.exists() or not sources_file.exists():
+            return None
+
+        with gzip.open(sources_file, "rt", encoding="utf-8") as f:
+            files: dict[str, str] = json.load(f)
+
+        # O .coverage tem caminhos relativos à raiz do código (relative_files):
+        # o relatório roda com as fontes restauradas como diretório atual
+        workdir = Path(tempfile.mkdtemp(prefix="htmlcov_"))
+        tmp_html = report_dir / f"{HTML_DIR}.tmp"
+        try:
+            for filename, content in files.items():
+                path = workdir / filename
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content, encoding="utf-8")
+
+            result = subprocess.run(
+                [
+                    sys.executable, "-m", "coverage", "html",
+                    f"--data-file={data_file.resolve()}",
+                    f"--directory={tmp_html.resolve()}",
+                    "--ignore-errors"
+                ],
+                cwd=workdir,
+                capture_output=True,
+                text=True,
+                timeout=TIMEOUT
+            )
+            if result.returncode != 0:
+                print(f"[CoverageHTML] Falha ao gerar HTML de {report_dir.name}: {result.stderr}")
+                return None
+            tmp_html.replace(html_dir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+            shutil.rmtree(tmp_html, ignore_errors=True)
+
+    print(f"[CoverageHTML] HTML gerado sob demanda para {report_dir.name}")
+    return html_dir
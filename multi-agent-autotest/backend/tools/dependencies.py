@@ -0,0 +1,301 @@
+import ast
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from tools.cache import CACHE_DIR, sha256
+from tools.pool import SANDBOX_IMAGE
+
+# "auto": instala no sandbox os pacotes de terceiros importados pelo código;
+# "off": sandbox só com pytest e pytest-cov
+MODE = os.getenv("SANDBOX_DEPS", "auto")
+
+# Wheels baixados uma única vez (com rede, no host) e instalados sem rede
+WHEELHOUSE_DIR = Path(os.getenv("WHEELHOUSE_DIR", CACHE_DIR / "wheelhouse"))
+SITES_DIR = CACHE_DIR / "sites"
+
+# Plataforma da imagem do sandbox, para baixar wheels compatíveis com ela
+SANDBOX_PYTHON_VERSION = os.getenv("SANDBOX_PYTHON_VERSION", "3.11")
+SANDBOX_PLATFORM = os.getenv("SANDBOX_PLATFORM", "manylinux2014_x86_64")
+
+TIMEOUT = int(os.getenv("SANDBOX_DEPS_TIMEOUT", "600"))
+
+# Índice de onde os pacotes são baixados (ex: um mirror interno revisado) e
+# os únicos pacotes que podem ser instalados (separados por vírgula). Nada
+# fora da lista é instalado: vazia, o sandbox roda só com a imagem base
+INDEX_URL = os.getenv("SANDBOX_DEPS_INDEX_URL", "")
+ALLOWED = {
+    name.strip().lower()
+    for name in os.getenv("SANDBOX_DEPS_ALLOWED", "").split(",")
+    if name.strip()
+}
+
+# Nome do import → nome do pacote no PyPI, quando diferem
+DISTRIBUTIONS = {
+    "attr": "attrs",
+    "bs4": "beautifulsoup4",
+    "cv2": "opencv-python-headless",
+    "dateutil": "python-dateutil",
+    "dotenv": "python-dotenv",
+    "jose": "python-jose",
+    "jwt": "PyJWT",
+    "magic": "python-magic",
+    "MySQLdb": "mysqlclient",
+    "PIL": "Pillow",
+    "psycopg2": "psycopg2-binary",
+    "serial": "pyserial",
+    "skimage": "scikit-image",
+    "sklearn": "scikit-learn",
+    "yaml": "PyYAML",
+    "zmq": "pyzmq",
+}
+
+# Já presentes na imagem do sandbox
+PREINSTALLED = {"pytest", "_pytest", "pytest_cov", "coverage", "pluggy", "iniconfig", "packaging"}
+
+_locks: dict[str, threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+# Ambientes já preparados (completos) neste processo: iterações e runs
+# seguintes do mesmo projeto não voltam ao pip nem ao Docker
+_resolved: dict[tuple, "Dependencies"] = {}
+
+
+@dataclass
+class Dependencies:
+    """Pacotes de terceiros do projeto e onde o sandbox os encontra."""
+    requirements: list[str] = field(default_factory=list)  # instalados
+    missing: list[str] = field(default_factory=list)       # sem wheel disponível
+    image: str = SANDBOX_IMAGE      # backends docker e pool
+    site_dir: str | None = None     # backend local (entra no PYTHONPATH)
+
+
+def detect_requirements(files: dict[str, str]) -> list[str]:
+    """
+    Pacotes de terceiros importados pelo código, pelo AST.
+
+    Ignora a biblioteca padrão, imports relativos, os módulos e pacotes do
+    próprio projeto e o que já vem na imagem do sandbox. Nomes de import são
+    traduzidos para o nome do pacote no PyPI (ex: yaml → PyYAML).
+    """
+    local = set()
+    for filename in files:
+        parts = Path(filename).with_suffix("").parts
+        local.update(parts)
+
+    modules = set()
+    for content in files.values():
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules.add(node.module.split(".")[0])
+
+    third_party = modules - set(sys.stdlib_module_names) - local - PREINSTALLED - {"__future__"}
+    return sorted(DISTRIBUTIONS.get(module, module) for module in third_party)
+
+
+def _lock(key: str) -> threading.Lock:
+    with _locks_lock:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _pip(*args: str, timeout: float = TIMEOUT) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "pip", *args, "--disable-pip-version-check", "--quiet"],
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+
+def _allowed(requirement: str) -> bool:
+    return requirement.lower() in ALLOWED
+
+
+def _fetch(requirement: str, wheelhouse: Path, docker: bool) -> list[str] | None:
+    # Baixa o pacote (e dependências) para o wheelhouse e devolve os wheels
+    # que ele usa, ou None se não houver. Só wheels binários: um sdist
+    # executaria o setup.py do pacote no host durante o build. Para o
+    # sandbox em container os wheels são os da plataforma da imagem
+    with _lock(f"fetch:{wheelhouse}:{requirement.lower()}"):
+        marker = wheelhouse / ".fetched" / requirement.lower()
+        if marker.exists() and (wheels := marker.read_text().split()):
+            return wheels
+        wheelhouse.mkdir(parents=True, exist_ok=True)
+        # Diretório próprio: o pip copia para ele também as dependências que
+        # já estavam no wheelhouse, e o conjunto fica completo
+        downloading = Path(tempfile.mkdtemp(prefix="download_", dir=wheelhouse))
+        try:
+            args = [
+                "download", requirement, "-d", str(downloading),
+                "--only-binary=:all:",
+                "--find-links", str(wheelhouse)
+            ]
+            if INDEX_URL:
+                args += ["--index-url", INDEX_URL]
+            if docker:
+                args += [
+                    "--platform", SANDBOX_PLATFORM,
+                    "--python-version", SANDBOX_PYTHON_VERSION
+                ]
+            result = _pip(*args)
+            if result.returncode != 0:
+                print(f"[Deps] Sem wheel para '{requirement}': {result.stderr.strip()[-300:]}")
+                return None
+            wheels = sorted(path.name for path in downloading.glob("*.whl"))
+            for name in wheels:
+                os.replace(downloading / name, wheelhouse / name)
+        finally:
+            shutil.rmtree(downloading, ignore_errors=True)
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.write_text("\n".join(wheels))
+        return wheels
+
+
+def _image_exists(image: str) -> bool:
+    result = subprocess.run(["docker", "image", "inspect", image], capture_output=True, timeout=60)
+    return result.returncode == 0
+
+
+def _build_image(image: str, requirements: list[str], wheels: list[str], wheelhouse: Path) -> None:
+    # Camada sobre a imagem base com os pacotes instalados sem rede. O
+    # contexto do build tem só os wheels deste conjunto de pacotes, não o
+    # wheelhouse inteiro
+    context = Path(tempfile.mkdtemp(prefix="build_", dir=wheelhouse))
+    try:
+        for name in wheels:
+            try:
+                os.link(wheelhouse / name, context / name)
+            except OSError:
+                shutil.copyfile(wheelhouse / name, context / name)
+        dockerfile = "\n".join([
+            f"FROM {SANDBOX_IMAGE}",
+            "USER root",
+            "COPY . /tmp/wheels",
+            "RUN pip install --no-index --find-links /tmp/wheels --no-cache-dir "
+            + " ".join(f"'{r}'" for r in requirements) + " && rm -rf /tmp/wheels",
+            "USER sandbox",
+        ])
+        result = subprocess.run(
+            ["docker", "build", "--network", "none", "-t", image, "-f", "-", str(context)],
+            input=dockerfile,
+            capture_output=True,
+            text=True,
+            timeout=TIMEOUT
+        )
+    finally:
+        shutil.rmtree(context, ignore_errors=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao construir {image}: {result.stderr.strip()[-500:]}")
+
+
+def _make_readable(path: Path) -> None:
+    # O mkdtemp cria o diretório com 0700 e o pip respeita o umask do
+    # backend: o uid sem privilégios do sandbox local precisa ler e
+    # atravessar a árvore inteira (mas não escrever nela)
+    for root, dirs, files in os.walk(path):
+        os.chmod(root, 0o755)
+        for name in files:
+            file = os.path.join(root, name)
+            if not os.path.islink(file):
+                os.chmod(file, os.stat(file).st_mode & 0o755 | 0o444)
+
+
+def _install_site(site_dir: Path, requirements: list[str], wheelhouse: Path) -> None:
+    building = Path(tempfile.mkdtemp(prefix=f"{site_dir.name}_", dir=site_dir.parent))
+    try:
+        result = _pip(
+            "install", "--no-index", "--only-binary=:all:", "--find-links", str(wheelhouse),
+            "--target", str(building), *requirements
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Falha ao instalar dependências: {result.stderr.strip()[-500:]}")
+        _make_readable(building)
+        building.replace(site_dir)
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+
+
+def _resolve(requirements: list[str], docker: bool) -> Dependencies:
+    if docker:
+        wheelhouse = WHEELHOUSE_DIR / f"cp{SANDBOX_PYTHON_VERSION.replace('.', '')}-{SANDBOX_PLATFORM}"
+    else:
+        wheelhouse = WHEELHOUSE_DIR / f"host-cp{sys.version_info.major}{sys.version_info.minor}"
+
+    blocked = [r for r in requirements if not _allowed(r)]
+    if blocked:
+        print(f"[Deps] Imports ignorados, fora de SANDBOX_DEPS_ALLOWED: {', '.join(blocked)}")
+    fetched = {r: _fetch(r, wheelhouse, docker) for r in requirements if _allowed(r)}
+    available = [r for r, wheels in fetched.items() if wheels is not None]
+    missing = [r for r in requirements if r not in available]
+    if not available:
+        return Dependencies(missing=missing)
+
+    # Ambiente endereçado pelo conjunto de pacotes: projetos com os mesmos
+    # imports compartilham a mesma imagem (ou site-packages)
+    key = sha256(wheelhouse.name, *available)[:16]
+    with _lock(key):
+        if docker:
+            image = f"{SANDBOX_IMAGE}:deps-{key}"
+            if not _image_exists(image):
+                print(f"[Deps] Construindo {image} com {', '.join(available)}")
+                wheels = sorted({name for r in available for name in fetched[r]})
+                _build_image(image, available, wheels, wheelhouse)
+            return Dependencies(requirements=available, missing=missing, image=image)
+
+        site_dir = SITES_DIR / key
+        if not site_dir.exists():
+            SITES_DIR.mkdir(parents=True, exist_ok=True)
+            # O uid do sandbox atravessa o cache até o site-packages (só +x,
+            # sem listar o conteúdo)
+            for parent in (CACHE_DIR, SITES_DIR):
+                os.chmod(parent, os.stat(parent).st_mode | 0o111)
+            print(f"[Deps] Instalando {', '.join(available)} em {site_dir}")
+            _install_site(site_dir, available, wheelhouse)
+        return Dependencies(requirements=available, missing=missing, site_dir=str(site_dir))
+
+
+async def resolve(files: dict[str, str], backend: str) -> Dependencies:
+    """
+    Prepara o ambiente do sandbox com os pacotes importados pelo projeto.
+
+    Os pacotes vão para um wheelhouse local (a única etapa com rede, feita
+    uma vez por pacote) e são instalados sem rede: numa imagem derivada da
+    do sandbox (backends docker e pool) ou num site-packages usado no
+    PYTHONPATH (backend local), ambos reaproveitados entre runs com o mesmo
+    conjunto de pacotes. Só wheels binários são aceitos (nada do pacote roda
+    no host), vindos de SANDBOX_DEPS_INDEX_URL quando configurado e
+    restritos aos listados em SANDBOX_DEPS_ALLOWED. Pacotes sem wheel ou
+    fora da lista ficam em `missing`; se a preparação falhar, o sandbox roda
+    com a imagem base, como antes.
+
+    Falhas e pacotes permitidos sem wheel não ficam memorizados: o próximo
+    run tenta de novo (um wheel publicado ou a rede de volta resolvem sem
+    reiniciar o backend).
+    """
+    requirements = detect_requirements(files) if MODE == "auto" else []
+    if not requirements:
+        return Dependencies()
+    key = (tuple(requirements), backend != "local")
+    if key in _resolved:
+        return _resolved[key]
+    try:
+        dependencies = await asyncio.to_thread(_resolve, requirements, backend != "local")
+    except Exception as e:
+        print(f"[Deps] Falha ao preparar dependências ({e}) — usando a imagem base")
+        return Dependencies(missing=requirements)
+    # Fora da lista é permanente até reiniciar; sem wheel pode mudar
+    if not any(_allowed(r) for r in dependencies.missing):
+        _resolved[key] = dependencies
+    return dependencies
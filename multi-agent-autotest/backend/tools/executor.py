@@ -1,41 +1,127 @@
+import ast
+import asyncio
 import subprocess
+import time
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from dataclasses import dataclass, field
+from tools.impact import DeltaRun, merge_coverage, merge_junit
+from tools.limits import sandbox_limit
+from tools.line_ranges import LineRanges
+from tools.merge_tests import test_names
+from tools.sandbox import SandboxBackend, get_backend
+from tools.shards import plan_shards, run_sharded
+
+
+@dataclass
+class FileCoverage:
+    statements: int
+    missing: LineRanges  # linhas não cobertas
+    branch_misses: dict[int, list[str]] = field(default_factory=dict)  # linha → destinos não tomados
+    functions: dict[str, float] = field(default_factory=dict)  # "Classe.metodo" → % de linhas cobertas
 
 
 @dataclass
 class CoverageResult:
     success: bool
     coverage_pct: float
-    uncovered_lines: dict[str, list[int]]
+    uncovered_lines: dict[str, LineRanges]
     tests_passed: int = 0
     tests_failed: int = 0
     failed_tests: list = field(default_factory=list)
     error_output: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+    files: dict[str, FileCoverage] = field(default_factory=dict)
+    tests_run: list[str] | None = None  # só na execução parcial: testes executados
+    shards: int = 1
+
+
+# Argumentos do pytest; {code} e {tests} são trocados pelos caminhos
+# enxergados dentro do sandbox. O HTML do coverage não é gerado aqui: fica
+# o .coverage e o HTML é renderizado só se o report for aberto. Cada teste
+# grava seu próprio contexto no .coverage (--cov-context=test), o que permite
+# reexecutar só parte da suíte depois (ver tools/impact.py)
+PYTEST_ARGS = [
+    "{tests}",
+    "--rootdir={tests}",
+    "--cov={code}",
+    "--cov-branch",
+    "--cov-context=test",
+    "--cov-config={tests}/.coveragerc",
+    "--cov-report=xml:{tests}/coverage.xml",
+    "--junitxml={tests}/junit.xml",
+    "-p", "no:cacheprovider",
+    "-v"
+]
+
+# Caminhos relativos à raiz do código no .coverage, para o HTML poder ser
+# gerado fora do sandbox
+COVERAGERC = "[run]\nrelative_files = True\n"
+
+TESTS_FILE = "test_generated.py"
+
+TIMEOUT = 120
+
 
+async def run_tests(code_dir: str, tests_dir: str,
+                    backend: SandboxBackend | None = None,
+                    delta: DeltaRun | None = None,
+                    durations: dict[str, float] | None = None) -> CoverageResult:
+    """
+    Executa os testes no sandbox em uma única invocação do pytest.
+
+    Coverage XML, dados do coverage e JUnit saem do mesmo processo — antes a
+    suíte era executada duas vezes (uma para o coverage e outra só para o
+    junit.xml). O HTML é gerado sob demanda por tools/coverage_html.py.
+
+    O pytest roda no backend de sandbox recebido ou, se omitido, no
+    configurado em SANDBOX_BACKEND (ver tools/sandbox.py). A espera pelo
+    sandbox e o parse dos XMLs não bloqueiam o event loop.
+
+    O tempo de cada fase (fila do sandbox, lease do worker, sandbox — dividido
+    em startup e testes pelo tempo do junit —, parse do coverage, parse do
+    junit e total) é registrado em CoverageResult.timings, em segundos.
+
+    Com `delta` só os testes novos ou alterados são executados; coverage e
+    junit são combinados com os da execução anterior (fase merge) e o
+    resultado equivale ao da suíte completa. Se a combinação falhar, a suíte
+    inteira é executada.
+
+    Com SANDBOX_SHARDS > 1 e testes suficientes, os testes a executar são
+    divididos em shards balanceados pelas `durations` da execução anterior
+    e rodam em sandboxes paralelos (ver tools/shards.py); coverage e junit
+    dos shards são combinados antes do parse. Na suíte completa os shards
+    são montados a partir da coleta do pytest no sandbox (fase collect).
+    """
+    timings: dict[str, float] = {}
+    inicio = time.perf_counter()
 
-def run_tests(code_dir: str, tests_dir: str) -> CoverageResult:
     try:
-        result = subprocess.run(
-            [
-                "docker", "run", "--rm",
-                "--network", "none",
-                "--memory", "512m",
-                "--cpus", "1.0",
-                "-e", "PYTHONPATH=/code",
-                "-v", f"{code_dir}:/code",
-                "-v", f"{tests_dir}:/tests",
-                "autotest-sandbox",
-                "pytest", "/tests",
-                "--cov=/code",
-                "--cov-report=xml:/tests/coverage.xml",
-                "--cov-report=html:/tests/htmlcov",
-                "-v"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120
+        (Path(tests_dir) / ".coveragerc").write_text(COVERAGERC)
+        backend = backend or get_backend()
+        selected = delta.run if delta is not None else None
+        shards = plan_shards(selected or test_names(_read(Path(tests_dir) / TESTS_FILE)), durations or {})
+        if len(shards) > 1 and selected is None:
+            # test_names só enxerga funções e classes Test* de nível superior:
+            # os shards saem dos testes que o próprio pytest coleta (herdados,
+            # classes aninhadas, outras convenções). Se a coleta falhar, a
+            # suíte roda inteira num único sandbox, que reporta o erro
+            fase = time.perf_counter()
+            collected = await _collect(backend, code_dir, tests_dir)
+            timings["collect"] = round(time.perf_counter() - fase, 3)
+            shards = plan_shards(collected, durations or {}) if collected else [[]]
+        if len(shards) > 1:
+            result = await run_sharded(
+                backend, code_dir, tests_dir, [_args(shard) for shard in shards], TIMEOUT, timings
+            )
+        else:
+            async with sandbox_limit:
+                # Espera por uma vaga no limite global de execuções do sandbox
+                timings["queue"] = round(time.perf_counter() - inicio, 3)
+                result = await backend.run(code_dir, tests_dir, _args(selected), TIMEOUT, timings)
+        timings["sandbox"] = round(
+            time.perf_counter() - inicio - timings["queue"] - timings.get("lease", 0)
+            - timings.get("combine", 0) - timings.get("collect", 0), 3
         )
 
         print("[Executor] stdout:", result.stdout)
@@ -44,85 +130,190 @@ def run_tests(code_dir: str, tests_dir: str) -> CoverageResult:
         coverage_file = Path(tests_dir) / "coverage.xml"
         junit_file = Path(tests_dir) / "junit.xml"
 
-        # Roda novamente para gerar o junit.xml
-        subprocess.run(
-            [
-                "docker", "run", "--rm",
-                "--network", "none",
-                "-e", "PYTHONPATH=/code",
-                "-v", f"{code_dir}:/code",
-                "-v", f"{tests_dir}:/tests",
-                "autotest-sandbox",
-                "pytest", "/tests",
-                "--junitxml=/tests/junit.xml",
-                "-q"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-
         coverage_exists = coverage_file.exists()
         if not coverage_exists:
+            timings["total"] = round(time.perf_counter() - inicio, 3)
             return CoverageResult(
                 success=False,
                 coverage_pct=0.0,
                 uncovered_lines={},
-                error_output=result.stderr or result.stdout
+                error_output=result.stderr or result.stdout,
+                timings=timings
             )
 
-        coverage_result = _parse_coverage(coverage_file)
+        if delta is not None:
+            fase = time.perf_counter()
+            try:
+                *_, duration = await asyncio.to_thread(_parse_junit, junit_file)
+                await asyncio.to_thread(merge_coverage, delta, Path(tests_dir), code_dir)
+                await asyncio.to_thread(merge_junit, delta, Path(tests_dir))
+            except Exception as e:
+                print(f"[Executor] Falha ao combinar com a execução anterior ({e!r}) — executando a suíte completa")
+                return await run_tests(code_dir, tests_dir, backend, durations=durations)
+            timings["merge"] = round(time.perf_counter() - fase, 3)
+
+        fase = time.perf_counter()
+        coverage_result = await asyncio.to_thread(_parse_coverage, coverage_file, code_dir)
+        timings["parse_coverage"] = round(time.perf_counter() - fase, 3)
 
         junit_exists = junit_file.exists()
         if junit_exists:
-            passed, failed, failed_tests = _parse_junit(junit_file)
+            fase = time.perf_counter()
+            passed, failed, failed_tests, total_duration = await asyncio.to_thread(_parse_junit, junit_file)
+            timings["parse_junit"] = round(time.perf_counter() - fase, 3)
+            # Na execução parcial o junit combinado soma testes que não rodaram
+            if delta is None:
+                duration = total_duration
+            # O que o sandbox gastou além dos próprios testes é inicialização
+            # (container/processo, imports, coleta e relatórios do coverage)
+            timings["tests"] = round(duration, 3)
+            timings["startup"] = round(max(timings["sandbox"] - duration, 0.0), 3)
             coverage_result.tests_passed = passed
             coverage_result.tests_failed = failed
             coverage_result.failed_tests = failed_tests
 
+        timings["total"] = round(time.perf_counter() - inicio, 3)
+        coverage_result.timings = timings
+        coverage_result.shards = len(shards)
+        if delta is not None:
+            coverage_result.tests_run = delta.run
         return coverage_result
 
     except subprocess.TimeoutExpired:
+        timings["total"] = round(time.perf_counter() - inicio, 3)
         return CoverageResult(
             success=False,
             coverage_pct=0.0,
             uncovered_lines={},
-            error_output="Timeout: execução excedeu 2 minutos"
+            error_output=f"Timeout: execução excedeu {TIMEOUT // 60} minutos",
+            timings=timings
         )
     except Exception as e:
+        timings["total"] = round(time.perf_counter() - inicio, 3)
         return CoverageResult(
             success=False,
             coverage_pct=0.0,
             uncovered_lines={},
-            error_output=str(e)
+            error_output=str(e),
+            timings=timings
         )
 
 
-def _parse_coverage(coverage_xml: Path) -> CoverageResult:
+def _args(tests: list[str] | None) -> list[str]:
+    # Numa execução parcial ou num shard o diretório de testes dá lugar aos
+    # nodeids selecionados
+    if tests is None:
+        return PYTEST_ARGS
+    return [f"{{tests}}/{TESTS_FILE}::{name}" for name in tests] + PYTEST_ARGS[1:]
+
+
+async def _collect(backend: SandboxBackend, code_dir: str, tests_dir: str) -> list[str] | None:
+    """
+    Testes do módulo como o pytest os coleta no sandbox ("TestX::test_y"),
+    sem parametrizações, ou None se a coleta falhar.
+    """
+    args = [f"{{tests}}/{TESTS_FILE}", "--rootdir={tests}", "--collect-only", "-q", "-p", "no:cacheprovider"]
+    async with sandbox_limit:
+        result = await backend.run(code_dir, tests_dir, args, TIMEOUT, {})
+    if result.returncode != 0:
+        print(f"[Executor] Falha na coleta dos testes (código {result.returncode}) — sem shards")
+        return None
+    tests = []
+    for line in result.stdout.splitlines():
+        if line.startswith(f"{TESTS_FILE}::"):
+            name = line.split("::", 1)[1].split("[")[0]
+            if name not in tests:
+                tests.append(name)
+    return tests
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text()
+    except OSError:
+        return ""
+
+
+def _function_spans(source_file: Path) -> list[tuple[str, int, int]]:
+    """(nome, primeira linha do corpo, última linha) das funções e métodos."""
     try:
-        tree = ET.parse(coverage_xml)
-        root = tree.getroot()
+        tree = ast.parse(source_file.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return []
+    spans = []
+    for node in tree.body:
+        items = [(None, node)]
+        if isinstance(node, ast.ClassDef):
+            items = [(node.name, item) for item in node.body]
+        for cls, item in items:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                name = f"{cls}.{item.name}" if cls else item.name
+                spans.append((name, item.body[0].lineno, item.end_lineno))
+    return spans
 
-        line_rate = float(root.attrib.get("line-rate", 0))
-        coverage_pct = round(line_rate * 100, 2)
 
-        uncovered_lines: dict[str, list[int]] = {}
+def _summarize_file(lines: list[tuple[int, int]], branch_misses: dict[int, list[str]],
+                    source_file: Path | None) -> FileCoverage:
+    functions = {}
+    if source_file is not None and source_file.exists():
+        for name, start, end in _function_spans(source_file):
+            statements = [hits for number, hits in lines if start <= number <= end]
+            if statements:
+                covered = sum(1 for hits in statements if hits > 0)
+                functions[name] = round(covered / len(statements) * 100, 2)
+    return FileCoverage(
+        statements=len(lines),
+        missing=LineRanges.from_lines(number for number, hits in lines if hits == 0),
+        branch_misses=branch_misses,
+        functions=functions
+    )
 
-        for package in root.iter("package"):
-            for cls in package.iter("class"):
-                filename = cls.attrib.get("filename", "unknown")
-                missing = [
-                    int(line.attrib["number"])
-                    for line in cls.iter("line")
-                    if line.attrib.get("hits", "0") == "0"
-                ]
-                if missing:
-                    uncovered_lines[filename] = missing
+
+def _parse_coverage(coverage_xml: Path, code_dir: str | None = None) -> CoverageResult:
+    """
+    Lê o coverage.xml em streaming (iterparse): cada <class> (um arquivo) é
+    resumido e descartado assim que termina, então a memória fica limitada
+    ao maior arquivo e não ao relatório inteiro.
+
+    Por arquivo: linhas não cobertas (LineRanges), branches não tomados
+    (--cov-branch) e a cobertura de cada função, calculada com os intervalos
+    do AST das fontes em `code_dir`.
+    """
+    try:
+        coverage_pct = 0.0
+        uncovered_lines: dict[str, LineRanges] = {}
+        files: dict[str, FileCoverage] = {}
+
+        lines: list[tuple[int, int]] = []
+        branch_misses: dict[int, list[str]] = {}
+        for event, elem in ET.iterparse(coverage_xml, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "coverage":
+                    coverage_pct = round(float(elem.attrib.get("line-rate", 0)) * 100, 2)
+                elif elem.tag == "class":
+                    lines, branch_misses = [], {}
+                continue
+
+            if elem.tag == "line":
+                number = int(elem.attrib["number"])
+                lines.append((number, int(elem.attrib.get("hits", "0"))))
+                if elem.attrib.get("missing-branches"):
+                    branch_misses[number] = elem.attrib["missing-branches"].split(",")
+                elem.clear()
+            elif elem.tag == "class":
+                filename = elem.attrib.get("filename", "unknown")
+                source_file = Path(code_dir) / filename if code_dir else None
+                summary = _summarize_file(lines, branch_misses, source_file)
+                files[filename] = summary
+                if summary.missing:
+                    uncovered_lines[filename] = summary.missing
+                elem.clear()
 
         return CoverageResult(
             success=True,
             coverage_pct=coverage_pct,
-            uncovered_lines=uncovered_lines
+            uncovered_lines=uncovered_lines,
+            files=files
         )
 
     except Exception as e:
@@ -134,37 +325,36 @@ def _parse_coverage(coverage_xml: Path) -> CoverageResult:
         )
 
 
-def _parse_junit(junit_xml: Path) -> tuple[int, int, list[str]]:
+def _parse_junit(junit_xml: Path) -> tuple[int, int, list[str], float]:
+    """
+    Lê o junit.xml em streaming, somando todas as <testsuite> e guardando
+    só as mensagens dos testes que falharam.
+    """
     try:
-        tree = ET.parse(junit_xml)
-        root = tree.getroot()
-
-        # Suporta tanto <testsuite> como raiz quanto <testsuites><testsuite>
-        if root.tag == "testsuite":
-            suite = root
-        else:
-            suite = root.find("testsuite")
+        total = failed = 0
+        duration = 0.0
+        failed_tests = []
+        for event, elem in ET.iterparse(junit_xml, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "testsuite":
+                    total += int(elem.attrib.get("tests", 0))
+                    failed += int(elem.attrib.get("failures", 0)) + int(elem.attrib.get("errors", 0))
+                    duration += float(elem.attrib.get("time", 0))
+                continue
 
-        if suite is None:
-            return 0, 0, []
+            if elem.tag == "testcase":
+                node = elem.find("failure")
+                if node is None:
+                    node = elem.find("error")
+                if node is not None:
+                    # Métodos de classes aparecem como "TestX::test_y"
+                    classes = elem.attrib.get("classname", "").split(".")[1:]
+                    name = "::".join(classes + [elem.attrib.get("name", "unknown")])
+                    message = node.attrib.get("message", "")
+                    failed_tests.append(f"{name}: {message}")
+                elem.clear()
 
-        failed_tests = []
-        for testcase in suite.iter("testcase"):
-            failure = testcase.find("failure")
-            error = testcase.find("error")
-            if failure is not None or error is not None:
-                name = testcase.attrib.get("name", "unknown")
-                node = failure if failure is not None else error
-                message = node.attrib.get("message", "")
-                failed_tests.append(f"{name}: {message}")
-
-        total = int(suite.attrib.get("tests", 0))
-        failures = int(suite.attrib.get("failures", 0))
-        errors = int(suite.attrib.get("errors", 0))
-        failed = failures + errors
-        passed = total - failed
-
-        return passed, failed, failed_tests
+        return total - failed, failed, failed_tests, duration
 
     except Exception:
-        return 0, 0, []
\ No newline at end of file
+        return 0, 0, [], 0.0
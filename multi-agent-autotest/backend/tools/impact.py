@@ -0,0 +1,199 @@
+import ast
+import copy
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+
+# "impact": a partir da segunda iteração só roda testes novos ou alterados;
+# "full": sempre a suíte inteira
+TEST_SELECTION = os.getenv("TEST_SELECTION", "impact")
+
+# Versão do schema do .coverage (coverage.sqldata) cujas tabelas são editadas
+# direto para remover contextos; outra versão cai para a execução completa
+COVERAGE_SCHEMA_VERSION = 7
+TIMEOUT = 120
+
+
+@dataclass
+class DeltaRun:
+    """Execução só dos testes novos ou alterados, sobre a cobertura anterior."""
+    baseline_dir: Path
+    run: list[str]    # testes a executar ("test_x" ou "TestY::test_z")
+    drop: list[str]   # testes removidos ou alterados: contextos descartados da base
+
+
+def _is_test(node: ast.stmt) -> bool:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return node.name.startswith("test")
+    return isinstance(node, ast.ClassDef) and node.name.startswith("Test")
+
+
+def _tests(tree: ast.Module) -> dict[str, str]:
+    # Nodeid do pytest ("test_x" ou "TestY::test_z") → AST do teste. O AST
+    # ignora formatação e comentários: só mudanças reais fazem o teste rodar
+    tests = {}
+    for node in tree.body:
+        if not _is_test(node):
+            continue
+        if not isinstance(node, ast.ClassDef):
+            tests[node.name] = ast.dump(node)
+            continue
+        # Bases, decorators, atributos e fixtures da classe valem para todos
+        # os métodos de teste dela
+        context = copy.copy(node)
+        context.body = [item for item in node.body if not _is_test(item)]
+        context = ast.dump(context)
+        for item in node.body:
+            if _is_test(item) and not isinstance(item, ast.ClassDef):
+                tests[f"{node.name}::{item.name}"] = context + ast.dump(item)
+    return tests
+
+
+def _support(tree: ast.Module) -> list[str]:
+    # Tudo que não é teste: imports, fixtures, helpers e código de módulo
+    return [ast.dump(node) for node in tree.body if not _is_test(node)]
+
+
+def plan_delta(baseline_dir: Path, tests_file: str, current: str) -> DeltaRun | None:
+    """
+    Compara o módulo de testes atual com o da execução anterior e decide
+    quais testes precisam rodar de novo.
+
+    Retorna None — execução completa — com TEST_SELECTION=full, quando não
+    há base reaproveitável
+    (sem .coverage ou junit.xml), quando algo além dos testes mudou ou foi
+    removido (imports, fixtures, helpers), quando surge uma fixture autouse
+    ou quando não há nenhum teste novo ou alterado.
+    """
+    if TEST_SELECTION != "impact":
+        return None
+    if not all((baseline_dir / name).exists() for name in (tests_file, ".coverage", "junit.xml")):
+        return None
+    previous = (baseline_dir / tests_file).read_text()
+    try:
+        old_tree, new_tree = ast.parse(previous), ast.parse(current)
+    except SyntaxError:
+        return None
+
+    old_support = _support(old_tree)
+    new_support = _support(new_tree)
+    if any(dump not in new_support for dump in old_support):
+        return None
+    if any("autouse" in dump for dump in new_support if dump not in old_support):
+        return None
+
+    old_tests, new_tests = _tests(old_tree), _tests(new_tree)
+    run = [name for name, source in new_tests.items() if old_tests.get(name) != source]
+    drop = [name for name, source in old_tests.items() if new_tests.get(name) != source]
+    if not run:
+        return None
+    return DeltaRun(baseline_dir=baseline_dir, run=run, drop=drop)
+
+
+def _context_test(context: str) -> str:
+    # "test_generated.py::TestX::test_y[1]|run" → "TestX::test_y"
+    nodeid = context.split("|")[0]
+    return nodeid.split(".py::", 1)[-1].split("[")[0]
+
+
+def merge_coverage(delta: DeltaRun, tests_dir: Path, code_dir: str) -> None:
+    """
+    Junta a cobertura da execução parcial com a da execução anterior.
+
+    Os dados da base são copiados sem os contextos (um por teste, via
+    --cov-context=test) dos testes removidos ou alterados, recebem os dados
+    da execução parcial e substituem o .coverage de `tests_dir`. O
+    coverage.xml é regenerado a partir do resultado.
+    """
+    from coverage import CoverageData
+
+    merged_file = tests_dir / ".coverage.merged"
+    shutil.copyfile(delta.baseline_dir / ".coverage", merged_file)
+
+    dropped = set(delta.drop)
+    db = sqlite3.connect(str(merged_file))
+    try:
+        (version,) = db.execute("SELECT version FROM coverage_schema").fetchone()
+        if version != COVERAGE_SCHEMA_VERSION:
+            raise RuntimeError(f"Schema do .coverage não suportado: {version}")
+        stale = [
+            context_id for context_id, context in db.execute("SELECT id, context FROM context")
+            if context and _context_test(context) in dropped
+        ]
+        db.executemany("DELETE FROM arc WHERE context_id = ?", [(c,) for c in stale])
+        db.executemany("DELETE FROM line_bits WHERE context_id = ?", [(c,) for c in stale])
+        db.commit()
+    finally:
+        db.close()
+
+    merged = CoverageData(basename=str(merged_file))
+    merged.read()
+    delta_data = CoverageData(basename=str(tests_dir / ".coverage"))
+    delta_data.read()
+    merged.update(delta_data)
+    merged.write()
+    merged_file.replace(tests_dir / ".coverage")
+
+    write_coverage_xml(tests_dir, code_dir)
+
+
+def write_coverage_xml(tests_dir: Path, code_dir: str) -> None:
+    """Regenera o coverage.xml de `tests_dir` a partir do .coverage."""
+    # Os caminhos são relativos à raiz do código: o relatório roda a partir dela
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "coverage", "xml",
+            f"--data-file={tests_dir / '.coverage'}",
+            f"--rcfile={tests_dir / '.coveragerc'}",
+            "-o", str(tests_dir / "coverage.xml"),
+            "--ignore-errors"
+        ],
+        cwd=code_dir,
+        capture_output=True,
+        text=True,
+        timeout=TIMEOUT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao gerar coverage.xml combinado: {result.stderr}")
+
+
+def write_junit(cases: list[ET.Element], junit_xml: Path) -> None:
+    """Grava os <testcase> numa única <testsuite> com os totais recalculados."""
+    suite = ET.Element("testsuite", {
+        "name": "pytest",
+        "tests": str(len(cases)),
+        "failures": str(sum(1 for case in cases if case.find("failure") is not None)),
+        "errors": str(sum(1 for case in cases if case.find("error") is not None)),
+        "skipped": str(sum(1 for case in cases if case.find("skipped") is not None)),
+        "time": f"{sum(float(case.attrib.get('time', 0)) for case in cases):.3f}"
+    })
+    suite.extend(cases)
+    root = ET.Element("testsuites")
+    root.append(suite)
+    ET.ElementTree(root).write(junit_xml, encoding="utf-8", xml_declaration=True)
+
+
+def case_test(case: ET.Element) -> str:
+    """Nome do teste de um <testcase>: "test_generated.TestX" + "test_y[1]" → "TestX::test_y"."""
+    parts = case.attrib.get("classname", "").split(".")[1:]
+    return "::".join(parts + [case.attrib.get("name", "")]).split("[")[0]
+
+
+def merge_junit(delta: DeltaRun, tests_dir: Path) -> None:
+    """
+    Reescreve o junit.xml de `tests_dir` com os resultados da execução
+    anterior (menos os testes removidos ou alterados) seguidos dos da
+    execução parcial.
+    """
+    dropped = set(delta.drop)
+    cases = [
+        case for case in ET.parse(delta.baseline_dir / "junit.xml").iter("testcase")
+        if case_test(case) not in dropped
+    ]
+    cases += list(ET.parse(tests_dir / "junit.xml").iter("testcase"))
+    write_junit(cases, tests_dir / "junit.xml")
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import threading
+from collections import deque
+
+
+class Limit:
+    """
+    Limite global de concorrência para um recurso do processo.
+
+    Funciona tanto em código síncrono (`with`) quanto assíncrono
+    (`async with`), com as vagas compartilhadas entre os dois. A espera é
+    uma fila FIFO: quem libera uma vaga a entrega diretamente ao primeiro da
+    fila — uma task é acordada no próprio event loop, sem polling, e uma
+    thread por um Event —, então ninguém fura a fila nem espera além do
+    necessário.
+    """
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self._lock = threading.Lock()
+        self._free = size
+        # threading.Event (threads) ou (loop, future) (tasks)
+        self._waiters: deque = deque()
+        self.in_use = 0
+        self.waiting = 0
+
+    def _try_acquire(self) -> bool:
+        # Chamado com o lock: só pega a vaga direto se não há fila
+        if self._free and not self._waiters:
+            self._free -= 1
+            self.in_use += 1
+            return True
+        return False
+
+    def _hand_off(self, waiter) -> bool:
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return True
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(self._wake, future)
+            return True
+        except RuntimeError:
+            # Event loop já encerrado: a vaga vai para o próximo
+            return False
+
+    def _wake(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            # Task cancelada depois de receber a vaga: devolve
+            self._release()
+        else:
+            future.set_result(None)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_use -= 1
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                self.waiting -= 1
+                if self._hand_off(waiter):
+                    self.in_use += 1
+                    return
+            self._free += 1
+
+    def __enter__(self):
+        with self._lock:
+            if self._try_acquire():
+                return self
+            event = threading.Event()
+            self._waiters.append(event)
+            self.waiting += 1
+        event.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return self
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+            self.waiting += 1
+        future = waiter[1]
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    # Ainda na fila: sai sem ter recebido vaga
+                    self._waiters.remove(waiter)
+                    self.waiting -= 1
+                    raise
+            # A vaga já foi entregue: se o future foi cancelado, _wake a
+            # devolve; se chegou a ser resolvido, devolvemos aqui
+            if not future.cancelled():
+                self._release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._release()
+
+    def stats(self) -> dict:
+        return {"size": self.size, "in_use": self.in_use, "waiting": self.waiting}
+
+
+# Chamadas simultâneas ao LLM somando todos os runs e agentes
+llm_limit = Limit("llm", int(os.getenv("LLM_CONCURRENCY", "8")))
+
+# Execuções simultâneas do pytest no sandbox somando todos os runs
+sandbox_limit = Limit("sandbox", int(os.getenv("SANDBOX_CONCURRENCY", "2")))
@@ -0,0 +1,120 @@
+from bisect import bisect_right
+from typing import Iterable, Iterator
+
+
+class LineRanges:
+    """
+    Conjunto imutável de números de linha guardado como intervalos ordenados
+    e disjuntos: um módulo com 3.000 linhas não cobertas seguidas ocupa um
+    único intervalo, e não 3.000 inteiros.
+
+    Suporta as operações de conjunto (|, &, -) direto sobre os intervalos,
+    pertinência por busca binária e iteração linha a linha. O texto
+    ("12-40, 55, 60-71") é o formato usado nos prompts e nos relatórios JSON.
+    """
+
+    __slots__ = ("_ranges",)
+
+    def __init__(self, ranges: Iterable[tuple[int, int]] = ()):
+        merged: list[tuple[int, int]] = []
+        for start, end in sorted((int(s), int(e)) for s, e in ranges if s <= e):
+            if merged and start <= merged[-1][1] + 1:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        self._ranges = tuple(merged)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[int]) -> "LineRanges":
+        return cls((line, line) for line in lines)
+
+    @classmethod
+    def parse(cls, text: str) -> "LineRanges":
+        """Lê o formato de texto: "12-40, 55, 60-71"."""
+        ranges = []
+        for part in text.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, _, end = part.partition("-")
+            ranges.append((int(start), int(end or start)))
+        return cls(ranges)
+
+    @property
+    def ranges(self) -> tuple[tuple[int, int], ...]:
+        return self._ranges
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self._ranges:
+            yield from range(start, end + 1)
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in self._ranges)
+
+    def __bool__(self) -> bool:
+        return bool(self._ranges)
+
+    def __contains__(self, line: int) -> bool:
+        i = bisect_right(self._ranges, (line, float("inf"))) - 1
+        return i >= 0 and self._ranges[i][0] <= line <= self._ranges[i][1]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, LineRanges) and self._ranges == other._ranges
+
+    def __hash__(self) -> int:
+        return hash(self._ranges)
+
+    def __or__(self, other: "LineRanges") -> "LineRanges":
+        return LineRanges(self._ranges + other._ranges)
+
+    def __and__(self, other: "LineRanges") -> "LineRanges":
+        result = []
+        i = j = 0
+        a, b = self._ranges, other._ranges
+        while i < len(a) and j < len(b):
+            start = max(a[i][0], b[j][0])
+            end = min(a[i][1], b[j][1])
+            if start <= end:
+                result.append((start, end))
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return LineRanges(result)
+
+    def __sub__(self, other: "LineRanges") -> "LineRanges":
+        result = []
+        b = other._ranges
+        j = 0
+        for start, end in self._ranges:
+            while j < len(b) and b[j][1] < start:
+                j += 1
+            k = j
+            while k < len(b) and b[k][0] <= end:
+                if b[k][0] > start:
+                    result.append((start, b[k][0] - 1))
+                start = max(start, b[k][1] + 1)
+                k += 1
+            if start <= end:
+                result.append((start, end))
+        return LineRanges(result)
+
+    def intersects(self, start: int, end: int) -> bool:
+        """Se alguma linha do conjunto está em [start, end] (ex: span de uma função)."""
+        i = bisect_right(self._ranges, (end, float("inf"))) - 1
+        return i >= 0 and self._ranges[i][1] >= start
+
+    def __str__(self) -> str:
+        return ", ".join(
+            str(start) if start == end else f"{start}-{end}"
+            for start, end in self._ranges
+        )
+
+    def __repr__(self) -> str:
+        return f"LineRanges('{self}')"
+
+
+def to_json(uncovered_lines: dict[str, LineRanges]) -> dict[str, str]:
+    """{arquivo: LineRanges} → {arquivo: "12-40, 55"} para os relatórios."""
+    return {filename: str(lines) for filename, lines in uncovered_lines.items()}
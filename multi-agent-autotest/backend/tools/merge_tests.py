@@ -0,0 +1,205 @@
+import ast
+import copy
+
+
+def parses(code: str) -> bool:
+    try:
+        ast.parse(code)
+        return True
+    except SyntaxError:
+        return False
+
+
+def test_names(code: str) -> list[str]:
+    """Nomes das funções de teste de nível superior (e métodos de classes Test*)."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+    names = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name.startswith("test"):
+                names.append(node.name)
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            names.extend(
+                f"{node.name}::{item.name}" for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and item.name.startswith("test")
+            )
+    return names
+
+
+def _signature(node: ast.stmt) -> str:
+    # Representação do nó sem o nome nem posições: dois testes com o mesmo
+    # corpo são considerados duplicados mesmo com nomes diferentes
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        clone = copy.copy(node)
+        clone.name = "_"
+        return ast.dump(clone)
+    return ast.dump(node)
+
+
+def _segment(code: str, node: ast.stmt) -> str:
+    # Preserva o texto original (comentários e formatação), incluindo decorators
+    lines = code.splitlines()
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    return "\n".join(lines[start - 1:node.end_lineno])
+
+
+def _rename(segment: str, node: ast.stmt, new_name: str) -> str:
+    keyword = "class" if isinstance(node, ast.ClassDef) else "def"
+    return segment.replace(f"{keyword} {node.name}", f"{keyword} {new_name}", 1)
+
+
+def drop_tests(code: str, names: set[str]) -> str:
+    """
+    Remove do módulo os testes em `names` ("test_x" ou "TestX::test_y").
+
+    Uma classe que fica sem nenhum método é removida inteira. O restante do
+    texto (imports, fixtures, helpers e comentários) é preservado.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code
+    spans = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name in names:
+            spans.append(node)
+        elif isinstance(node, ast.ClassDef):
+            methods = [
+                item for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and f"{node.name}::{item.name}" in names
+            ]
+            if len(methods) == len(node.body):
+                spans.append(node)
+            else:
+                spans.extend(methods)
+    if not spans:
+        return code
+
+    lines = code.splitlines()
+    removed = set()
+    for node in spans:
+        start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        removed.update(range(start - 1, node.end_lineno))
+    kept = "\n".join(line for i, line in enumerate(lines) if i not in removed)
+    # Linhas em branco acumuladas no lugar dos testes removidos
+    while "\n\n\n\n" in kept:
+        kept = kept.replace("\n\n\n\n", "\n\n\n")
+    return kept.rstrip("\n") + "\n"
+
+
+def _reindent(segment: str, column: int, indent: str) -> str:
+    # Move um trecho da coluna `column` para o recuo `indent`; linhas com
+    # recuo menor (ex: strings multilinha) ficam como estão
+    lines = []
+    for line in segment.splitlines():
+        if not line.strip():
+            lines.append("")
+        elif line[:column].isspace() or column == 0:
+            lines.append(indent + line[column:])
+        else:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _new_members(source: str, nodes: list[ast.stmt], known: list[ast.stmt]) -> list[str]:
+    # Trechos de `nodes` que não existem em `known`, com as regras de
+    # deduplicação e renomeação de merge_tests
+    known_names = {
+        node.name for node in known
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    }
+    known_signatures = {_signature(node) for node in known}
+    segments = []
+    for node in nodes:
+        signature = _signature(node)
+        if signature in known_signatures:
+            continue
+        known_signatures.add(signature)
+
+        segment = _segment(source, node)
+        name = getattr(node, "name", None)
+        if name is not None and name in known_names:
+            if not name.startswith(("test", "Test")):
+                continue
+            suffix = 2
+            while f"{name}_{suffix}" in known_names:
+                suffix += 1
+            segment = _rename(segment, node, f"{name}_{suffix}")
+            name = f"{name}_{suffix}"
+        if name is not None:
+            known_names.add(name)
+        segments.append(segment)
+    return segments
+
+
+def merge_tests(existing: str, delta: str) -> str:
+    """
+    Incorpora as novas funções de teste de `delta` no módulo `existing`.
+
+    - imports novos são inseridos após o último import do módulo existente
+    - testes com o mesmo corpo (AST) de um teste existente são descartados
+    - testes novos com nome já usado são renomeados (sufixo _2, _3, ...)
+    - fixtures e helpers com nome já usado mantêm a versão existente, para
+      não quebrar os testes que já dependem deles
+    - uma classe com o nome de uma classe existente tem os métodos novos
+      incorporados a ela, com as mesmas regras, em vez de virar outra classe
+
+    Se `delta` não for Python válido o módulo existente é devolvido intacto.
+    """
+    if not existing.strip():
+        return delta
+    try:
+        old_tree = ast.parse(existing)
+        new_tree = ast.parse(delta)
+    except SyntaxError:
+        print("[Writer] Delta de testes inválido — mantendo testes existentes")
+        return existing
+
+    known_imports = {
+        ast.unparse(node) for node in old_tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    }
+    classes = {node.name: node for node in old_tree.body if isinstance(node, ast.ClassDef)}
+
+    imports: list[str] = []
+    members: list[ast.stmt] = []
+    # Linha final da classe existente → métodos a inserir depois dela
+    insertions: dict[int, list[str]] = {}
+    for node in new_tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            stmt = ast.unparse(node)
+            if stmt not in known_imports and stmt not in imports:
+                imports.append(stmt)
+        elif isinstance(node, ast.ClassDef) and node.name in classes:
+            target = classes[node.name]
+            indent = " " * target.body[0].col_offset
+            insertions.setdefault(target.end_lineno, []).extend(
+                _reindent(segment, node.body[0].col_offset, indent)
+                for segment in _new_members(delta, node.body, target.body)
+            )
+        else:
+            members.append(node)
+    blocks = _new_members(delta, members, old_tree.body)
+
+    lines = existing.rstrip("\n").splitlines()
+    # De baixo para cima: as inserções não deslocam as que faltam
+    for end in sorted(insertions, reverse=True):
+        added = [line for segment in insertions[end] for line in ["", *segment.splitlines()]]
+        lines = lines[:end] + added + lines[end:]
+    if imports:
+        last_import = max(
+            (node.end_lineno for node in old_tree.body
+             if isinstance(node, (ast.Import, ast.ImportFrom))),
+            default=0
+        )
+        lines = lines[:last_import] + imports + lines[last_import:]
+
+    merged = "\n".join(lines)
+    for block in blocks:
+        merged += "\n\n\n" + block
+    return merged + "\n"
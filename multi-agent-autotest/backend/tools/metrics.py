@@ -0,0 +1,125 @@
+import threading
+
+# Buckets (segundos) dos histogramas de duração: de chamadas rápidas ao
+# LLM até runs longos do sandbox
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+REGISTRY: list = []
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Contador monotônico com labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_labels(self.labels, key)} {value}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    """Histograma com buckets fixos, soma e contagem por combinação de labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DURATION_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # labels -> (contagem por bucket, soma, contagem)
+        self._values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket in zip(self.buckets, counts):
+                    le = _labels(self.labels, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {bucket}")
+                inf = _labels(self.labels, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, key)} {round(total, 6)}")
+                lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+
+def render(gauges: dict[str, tuple[str, dict[tuple[tuple[str, str], ...], float]]] | None = None) -> str:
+    """
+    Exporta as métricas no formato texto do Prometheus.
+
+    `gauges` são valores lidos no momento da coleta (filas, limites, caches):
+    {nome: (descrição, {((label, valor), ...): valor})}.
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    for name, (help, values) in (gauges or {}).items():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in values.items():
+            names = tuple(label for label, _ in labels)
+            label_values = tuple(value for _, value in labels)
+            lines.append(f"{name}{_labels(names, label_values)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# Métricas do pipeline, atualizadas pelos agentes e pelo executor
+node_duration = Histogram(
+    "autotest_node_duration_seconds", "Tempo de parede de cada nó do grafo", ("node",)
+)
+llm_latency = Histogram(
+    "autotest_llm_latency_seconds", "Latência das chamadas ao LLM", ("agent",)
+)
+llm_calls = Counter(
+    "autotest_llm_calls_total", "Chamadas ao LLM por resultado", ("agent", "result")
+)
+llm_tokens = Counter(
+    "autotest_llm_tokens_total", "Tokens enviados e recebidos do LLM", ("agent", "kind")
+)
+sandbox_phase = Histogram(
+    "autotest_sandbox_phase_seconds", "Duração das fases de execução do pytest", ("phase",)
+)
+bytes_written = Counter(
+    "autotest_executor_bytes_written_total", "Bytes gravados pelo executor (código, testes e artefatos)"
+)
+runs = Counter(
+    "autotest_runs_total", "Runs do grafo finalizados", ("status",)
+)
@@ -0,0 +1,256 @@
+import json
+import os
+import queue
+import select
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+SANDBOX_IMAGE = "autotest-sandbox"
+
+# Máximo de pools vivos ao mesmo tempo (um por imagem de dependências, além
+# do da imagem base): acima disso o usado há mais tempo é desligado
+MAX_POOLS = int(os.getenv("SANDBOX_POOL_MAX_IMAGES", "4"))
+
+
+class WorkerError(Exception):
+    """Falha de comunicação com um worker do sandbox."""
+
+
+class SandboxWorker:
+    """
+    Container do sandbox pré-iniciado rodando `sandbox/worker.py`.
+
+    O container sobe uma única vez com as mesmas restrições do `docker run`
+    avulso (sem rede, memória e CPU limitadas). Código e testes são enviados
+    pelo stdin a cada job e os artefatos voltam pelo stdout — não há volumes
+    montados, então nada do host fica exposto ao container.
+    """
+
+    def __init__(self, image: str = SANDBOX_IMAGE, startup_timeout: float = 60):
+        self.name = f"autotest-worker-{uuid.uuid4().hex[:8]}"
+        self.runs = 0
+        self.healthy = True
+        self._proc = subprocess.Popen(
+            [
+                "docker", "run", "--rm", "-i",
+                "--name", self.name,
+                "--network", "none",
+                "--memory", "512m",
+                "--cpus", "1.0",
+                image,
+                "python", "-u", "/opt/worker.py"
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        # Bytes lidos do stdout e ainda não consumidos (linha incompleta)
+        self._buffer = b""
+        try:
+            ready = self._read_line(startup_timeout)
+        except Exception:
+            self.close()
+            raise
+        if not ready.get("ready"):
+            self.close()
+            raise WorkerError(f"Worker {self.name} não inicializou")
+
+    def _read_line(self, timeout: float) -> dict:
+        # Lê direto do fd, com buffer próprio: o select só vale para o que
+        # ainda está no pipe, e um reader bufferizado poderia já ter puxado
+        # a linha para a memória dele
+        deadline = time.monotonic() + timeout
+        fd = self._proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            readable, _, _ = select.select([fd], [], [], max(remaining, 0))
+            if not readable:
+                raise subprocess.TimeoutExpired(self.name, timeout)
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise WorkerError(f"Worker {self.name} encerrou inesperadamente")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def run(self, files: dict[str, str], tests: dict[str, str],
+            args: list[str], timeout: float) -> dict:
+        """
+        Envia um job para o worker e espera a resposta.
+
+        O worker aplica o timeout ao processo do pytest; aqui esperamos uma
+        folga extra para o empacotamento dos artefatos.
+        """
+        job = {"files": files, "tests": tests, "args": args, "timeout": timeout}
+        try:
+            self._proc.stdin.write(json.dumps(job).encode("utf-8") + b"\n")
+            self._proc.stdin.flush()
+            response = self._read_line(timeout + 30)
+        except Exception:
+            self.healthy = False
+            raise
+        finally:
+            self.runs += 1
+
+        # Processos remanescentes de um job: o worker não recebe o próximo
+        if response.get("returncode") == -1 or response.get("timed_out") or response.get("recycle"):
+            self.healthy = False
+        return response
+
+    def close(self) -> None:
+        self.healthy = False
+        subprocess.run(
+            ["docker", "rm", "-f", self.name],
+            capture_output=True,
+            timeout=30
+        )
+        if self._proc.poll() is None:
+            self._proc.kill()
+
+
+class SandboxPool:
+    """
+    Pool de workers do sandbox aquecidos.
+
+    O executor pega um worker emprestado com `lease()`; ao devolver, o worker
+    é reciclado (destruído e substituído por um novo em background) se falhou
+    ou se já atingiu `max_runs` execuções. Depois de `shutdown()` o pool não
+    sobe mais workers, e os que estavam emprestados são destruídos na volta.
+
+    Se um worker não sobe (imagem ausente, Docker fora do ar) e nenhum outro
+    está vivo ou subindo, a falha é entregue a todos que esperam em
+    `lease()`, sem esperar o timeout.
+    """
+
+    def __init__(self, size: int, max_runs: int, image: str = SANDBOX_IMAGE):
+        self.size = size
+        self.max_runs = max_runs
+        self.image = image
+        # Workers livres ou a falha ao subir um, para quem está esperando
+        self._idle: queue.Queue[SandboxWorker | WorkerError] = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._waiting = 0
+        self.closed = False
+
+    def _spawn(self) -> None:
+        try:
+            worker = SandboxWorker(self.image)
+        except Exception as e:
+            print(f"[Pool] Falha ao iniciar worker: {e}")
+            with self._lock:
+                self._started -= 1
+                # Sem nenhum worker vivo ou a caminho, ninguém na fila seria
+                # atendido: cada um recebe a falha (menos os já avisados)
+                if self._started == 0:
+                    for _ in range(self._waiting - self._idle.qsize()):
+                        self._idle.put(WorkerError(f"Falha ao iniciar worker do sandbox: {e}"))
+            return
+        if self.closed:
+            worker.close()
+            return
+        self._idle.put(worker)
+
+    def _spawn_async(self) -> None:
+        threading.Thread(target=self._spawn, daemon=True).start()
+
+    def warm(self) -> None:
+        """Sobe os workers que faltam para completar o tamanho do pool."""
+        with self._lock:
+            missing = 0 if self.closed else self.size - self._started
+            self._started += max(missing, 0)
+        for _ in range(missing):
+            self._spawn_async()
+
+    @contextmanager
+    def lease(self, timeout: float = 120):
+        with self._lock:
+            can_start = not self.closed and self._started < self.size and self._idle.empty()
+            if can_start:
+                self._started += 1
+            self._waiting += 1
+        if can_start:
+            self._spawn()
+
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise WorkerError("Nenhum worker do sandbox disponível")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if isinstance(worker, WorkerError):
+            raise worker
+
+        try:
+            yield worker
+        finally:
+            if self.closed:
+                worker.close()
+            elif worker.healthy and worker.runs < self.max_runs:
+                self._idle.put(worker)
+            else:
+                worker.close()
+                self._spawn_async()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self.closed = True
+            self._started = 0
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(worker, SandboxWorker):
+                worker.close()
+
+
+_pools: OrderedDict[str, SandboxPool] = OrderedDict()
+_pool_lock = threading.Lock()
+
+
+def get_pool(image: str = SANDBOX_IMAGE) -> SandboxPool | None:
+    """
+    Retorna o pool do processo para a imagem, criando-o na primeira chamada.
+
+    Configurado por SANDBOX_POOL_SIZE (0 desliga o pool e volta ao
+    `docker run --rm` por execução) e SANDBOX_POOL_MAX_RUNS. Imagens com
+    dependências de projetos (ver tools/dependencies.py) têm pools próprios,
+    que sobem workers sob demanda; no máximo SANDBOX_POOL_MAX_IMAGES deles
+    ficam vivos, e o usado há mais tempo é desligado para dar lugar a um
+    novo. O pool da imagem base nunca é desligado.
+    """
+    size = int(os.getenv("SANDBOX_POOL_SIZE", "2"))
+    if size <= 0:
+        return None
+    evicted = []
+    with _pool_lock:
+        if image not in _pools:
+            _pools[image] = SandboxPool(
+                size=size,
+                max_runs=int(os.getenv("SANDBOX_POOL_MAX_RUNS", "20")),
+                image=image
+            )
+        _pools.move_to_end(image)
+        for name in list(_pools):
+            if len(_pools) <= max(MAX_POOLS, 1):
+                break
+            if name != SANDBOX_IMAGE and name != image:
+                evicted.append(_pools.pop(name))
+        pool = _pools[image]
+
+    for old in evicted:
+        print(f"[Pool] Desligando o pool de {old.image} (usado há mais tempo)")
+        # Fecha os containers fora da chamada: `docker rm` pode demorar
+        threading.Thread(target=old.shutdown, daemon=True).start()
+    return pool
+
+
+def all_pools() -> list[SandboxPool]:
+    with _pool_lock:
+        return list(_pools.values())
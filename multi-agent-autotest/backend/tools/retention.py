@@ -0,0 +1,102 @@
+import asyncio
+import os
+import shutil
+import tarfile
+import time
+from pathlib import Path
+from tools import workspace
+
+# Limites da pasta de reports; o que passar deles é apagado, do mais antigo
+# para o mais novo
+MAX_AGE = float(os.getenv("REPORTS_MAX_AGE_HOURS", "168")) * 3600
+MAX_COUNT = int(os.getenv("REPORTS_MAX_COUNT", "200"))
+MAX_BYTES = int(float(os.getenv("REPORTS_MAX_MB", "1024")) * 1024 * 1024)
+GC_INTERVAL = float(os.getenv("REPORTS_GC_INTERVAL", "600"))
+
+# Reports modificados há menos tempo que isso pertencem a runs que podem
+# estar em andamento e nunca são apagados
+GRACE = float(os.getenv("REPORTS_GC_GRACE", "3600"))
+
+ARCHIVE_NAME = "iterations.tar.gz"
+
+
+def _size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def compact_run(report_dirs: list[str]) -> None:
+    """
+    Compacta os reports de um run ao final do job.
+
+    Só a última iteração mantém o HTML do coverage (é a única devolvida em
+    report_url). Os artefatos das iterações anteriores — testes, coverage.xml
+    e junit.xml — vão para um único iterations.tar.gz dentro do report final,
+    e as pastas dessas iterações são removidas.
+    """
+    if len(report_dirs) < 2:
+        return
+    final = Path(report_dirs[-1])
+    older = [Path(d) for d in report_dirs[:-1] if Path(d).is_dir()]
+    if not final.is_dir() or not older:
+        return
+
+    archive = final / ARCHIVE_NAME
+    tmp = archive.with_suffix(".tmp")
+    with tarfile.open(tmp, "w:gz") as tar:
+        for iteration, directory in enumerate(older, start=1):
+            for path in sorted(directory.rglob("*")):
+                relative = path.relative_to(directory)
+                if not path.is_file() or relative.parts[0] in ("htmlcov", "__pycache__"):
+                    continue
+                tar.add(path, arcname=f"iteration_{iteration}/{relative}")
+    tmp.replace(archive)
+
+    for directory in older:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"[Retention] {len(older)} iterações compactadas em {archive}")
+
+
+def collect(reports_dir: Path) -> dict:
+    """
+    Aplica os limites de idade, quantidade e tamanho total às pastas run_*
+    e devolve o que foi removido.
+    """
+    agora = time.time()
+    runs = []
+    for path in reports_dir.glob("run_*"):
+        if path.is_dir():
+            runs.append((path.stat().st_mtime, path, _size(path)))
+    runs.sort(key=lambda run: run[0])
+
+    removed, freed = [], 0
+    total_bytes = sum(size for _, _, size in runs)
+    count = len(runs)
+    for mtime, path, size in runs:
+        age = agora - mtime
+        if age < GRACE:
+            break
+        if age <= MAX_AGE and count <= MAX_COUNT and total_bytes <= MAX_BYTES:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(path.name)
+        freed += size
+        total_bytes -= size
+        count -= 1
+
+    if removed:
+        print(f"[Retention] {len(removed)} reports removidos ({freed // 1024} KB liberados)")
+    return {"removed": removed, "freed_bytes": freed, "remaining": count, "total_bytes": total_bytes}
+
+
+async def gc_loop(reports_dir: Path) -> None:
+    """
+    Roda collect periodicamente fora do event loop (startup da API), junto
+    com a coleta dos workspaces do sandbox.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(collect, reports_dir)
+            await asyncio.to_thread(workspace.collect)
+        except Exception as e:
+            print(f"[Retention] Falha na coleta de reports: {e!r}")
+        await asyncio.sleep(GC_INTERVAL)
@@ -0,0 +1,194 @@
+import ast
+from tools.ast_analyzer import dependencies, imported_names
+from tools.line_ranges import LineRanges
+from tools.slicing import match_file
+
+# Decorators que marcam métodos sem implementação real
+ABSTRACT_DECORATORS = {"abstractmethod", "abstractproperty", "overload"}
+
+
+def _decorator_names(node: ast.AST) -> set[str]:
+    names = set()
+    for decorator in getattr(node, "decorator_list", []):
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if isinstance(decorator, ast.Attribute):
+            names.add(decorator.attr)
+        elif isinstance(decorator, ast.Name):
+            names.add(decorator.id)
+    return names
+
+
+def _is_stub(func: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+    # Corpo só com docstring, pass, ... ou raise NotImplementedError
+    for stmt in func.body:
+        if isinstance(stmt, ast.Pass):
+            continue
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+            continue
+        if isinstance(stmt, ast.Raise) and stmt.exc is not None:
+            exc = stmt.exc.func if isinstance(stmt.exc, ast.Call) else stmt.exc
+            if isinstance(exc, ast.Name) and exc.id == "NotImplementedError":
+                continue
+        return False
+    return True
+
+
+def _is_main_guard(node: ast.AST) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+    )
+
+
+def _is_type_checking(node: ast.AST) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and ast.unparse(node.test) in ("TYPE_CHECKING", "typing.TYPE_CHECKING")
+    )
+
+
+def _is_import_fallback(node: ast.AST) -> bool:
+    if not isinstance(node, ast.ExceptHandler) or node.type is None:
+        return False
+    names = node.type.elts if isinstance(node.type, ast.Tuple) else [node.type]
+    return all(
+        isinstance(n, ast.Name) and n.id in ("ImportError", "ModuleNotFoundError")
+        for n in names
+    )
+
+
+def _uses(nodes: list[ast.AST | None], imported: dict[str, str]) -> bool:
+    return any(node is not None and dependencies(node, imported) for node in nodes)
+
+
+def _external_spans(body: list[ast.stmt], imported: dict[str, str],
+                    spans: list[tuple[int, int]]) -> None:
+    # Por instrução: uma instrução simples é externa se usa a dependência; um
+    # bloco (if/for/while/with/match) é externo por inteiro quando o próprio
+    # cabeçalho a usa — os ramos dependem do resultado dela —, senão os
+    # ramos são classificados um a um
+    for stmt in body:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            _external_spans(stmt.body, imported, spans)
+            continue
+
+        if isinstance(stmt, (ast.If, ast.While)):
+            header = [stmt.test]
+        elif isinstance(stmt, (ast.For, ast.AsyncFor)):
+            header = [stmt.target, stmt.iter]
+        elif isinstance(stmt, (ast.With, ast.AsyncWith)):
+            header = [n for item in stmt.items for n in (item.context_expr, item.optional_vars)]
+        elif isinstance(stmt, ast.Match):
+            header = [stmt.subject]
+        elif isinstance(stmt, (ast.Try, ast.TryStar)):
+            header = []
+        else:
+            if dependencies(stmt, imported):
+                spans.append((stmt.lineno, stmt.end_lineno))
+            continue
+
+        if _uses(header, imported):
+            spans.append((stmt.lineno, stmt.end_lineno))
+            continue
+        for field in ("body", "orelse", "finalbody"):
+            _external_spans(getattr(stmt, field, []), imported, spans)
+        for handler in getattr(stmt, "handlers", []):
+            # `except requests.RequestException:` só roda com a dependência falhando
+            if _uses([handler.type], imported):
+                spans.append((handler.lineno, handler.end_lineno))
+            else:
+                _external_spans(handler.body, imported, spans)
+        for case in getattr(stmt, "cases", []):
+            _external_spans(case.body, imported, spans)
+
+
+def classify_lines(content: str, lines: LineRanges) -> dict[str, LineRanges]:
+    """
+    Classifica as linhas não cobertas de um arquivo via AST:
+        - trivial: métodos abstratos/stubs, `if __name__ == "__main__"`,
+          blocos TYPE_CHECKING e fallbacks de ImportError
+        - external: instruções que usam dependências externas (HTTP, banco,
+          filesystem, subprocess...) e os blocos controlados por elas — um
+          `if` puro numa função que também faz I/O continua sendo lógica
+        - logic: todo o resto — lógica que um teste unitário deveria cobrir
+
+    Dispara SyntaxError se o arquivo não puder ser parseado.
+    """
+    tree = ast.parse(content)
+    imported = imported_names(tree)
+    trivial_spans: list[tuple[int, int]] = []
+    external_spans: list[tuple[int, int]] = []
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            if _decorator_names(node) & ABSTRACT_DECORATORS or _is_stub(node):
+                trivial_spans.append((start, node.end_lineno))
+        elif _is_main_guard(node) or _is_type_checking(node) or _is_import_fallback(node):
+            trivial_spans.append((node.lineno, node.end_lineno))
+    _external_spans(tree.body, imported, external_spans)
+
+    trivial = lines & LineRanges(trivial_spans)
+    external = (lines - trivial) & LineRanges(external_spans)
+    return {
+        "trivial": trivial,
+        "external": external,
+        "logic": lines - trivial - external,
+    }
+
+
+def decide(state: dict) -> tuple[bool, str] | None:
+    """
+    Aplica localmente as regras do reviewer.j2.
+
+    Retorna (should_iterate, reason) quando a decisão é determinística, ou
+    None quando o caso é ambíguo — as linhas restantes estão todas em código
+    que depende de recursos externos — e precisa do LLM.
+    """
+    coverage_pct = state["coverage_pct"]
+    threshold = state["threshold"]
+    iteration = state["iteration"]
+    max_iterations = state["max_iterations"]
+    uncovered_lines: dict[str, LineRanges] = state["uncovered_lines"]
+
+    if coverage_pct >= threshold:
+        return False, f"Cobertura de {coverage_pct}% atingiu o threshold de {threshold}%."
+
+    if iteration >= max_iterations:
+        return False, f"Número máximo de iterações ({max_iterations}) atingido."
+
+    if not uncovered_lines:
+        # Execução falhou antes de medir cobertura: vale gerar os testes de novo
+        return True, "Nenhuma cobertura medida na execução anterior — gerando os testes novamente."
+
+    files: dict[str, str] = state.get("files", {})
+    counts = {"trivial": 0, "external": 0, "logic": 0}
+    for coverage_name, lines in uncovered_lines.items():
+        filename = match_file(files, coverage_name)
+        if filename is None:
+            counts["logic"] += len(lines)
+            continue
+        try:
+            classified = classify_lines(files[filename], lines)
+        except SyntaxError:
+            counts["logic"] += len(lines)
+            continue
+        for kind, kind_lines in classified.items():
+            counts[kind] += len(kind_lines)
+
+    if counts["logic"]:
+        return True, (
+            f"Cobertura de {coverage_pct}% abaixo do threshold de {threshold}% "
+            f"e {counts['logic']} linha(s) de lógica ainda não cobertas."
+        )
+
+    if not counts["external"]:
+        return False, (
+            "As linhas restantes são apenas métodos abstratos, stubs ou "
+            "blocos que não são executados em testes unitários."
+        )
+
+    return None
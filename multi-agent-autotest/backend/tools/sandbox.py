@@ -0,0 +1,319 @@
+import asyncio
+import base64
+import io
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from tools.pool import SANDBOX_IMAGE, WorkerError, get_pool
+
+
+class SandboxBackend(ABC):
+    """
+    Interface dos backends de execução do pytest.
+
+    `args` é a lista de argumentos do pytest com os marcadores {code} e
+    {tests}, que cada backend troca pelos caminhos que o processo do pytest
+    enxerga. O retorno segue o formato de `subprocess.CompletedProcess`, e
+    os artefatos (coverage.xml, junit.xml e o arquivo de dados .coverage)
+    devem estar em `tests_dir` ao final da chamada.
+
+    O pytest roda com o código como diretório atual e COVERAGE_FILE apontando
+    para `tests_dir`: com relative_files, os caminhos gravados no .coverage
+    ficam relativos à raiz do código e o HTML pode ser gerado depois, fora
+    do sandbox (ver tools/coverage_html.py).
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    async def run(self, code_dir: str, tests_dir: str, args: list[str],
+                  timeout: float, timings: dict[str, float]) -> subprocess.CompletedProcess:
+        ...
+
+
+async def _exec(cmd: list[str], timeout: float, **kwargs) -> subprocess.CompletedProcess:
+    """
+    Roda um processo com asyncio, sem bloquear o event loop.
+
+    Em caso de timeout mata o processo (e o grupo, se ele for líder de um)
+    e dispara subprocess.TimeoutExpired, como o subprocess.run.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        **kwargs
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        try:
+            # Mata o grupo inteiro, caso algo tenha escapado do processo principal
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            proc.kill()
+        await proc.communicate()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace")
+    )
+
+
+class DockerSandbox(SandboxBackend):
+    """Execução a frio: um `docker run --rm` por chamada."""
+
+    name = "docker"
+
+    def __init__(self, image: str = SANDBOX_IMAGE):
+        self.image = image
+
+    async def run(self, code_dir, tests_dir, args, timeout, timings):
+        args = [a.format(code="/code", tests="/tests") for a in args]
+        return await _exec(
+            [
+                "docker", "run", "--rm",
+                "--network", "none",
+                "--memory", "512m",
+                "--cpus", "1.0",
+                "-e", "PYTHONPATH=/code",
+                "-e", "COVERAGE_FILE=/tests/.coverage",
+                "-w", "/code",
+                "-v", f"{code_dir}:/code:ro",
+                "-v", f"{tests_dir}:/tests",
+                self.image,
+                "pytest", *args
+            ],
+            timeout=timeout
+        )
+
+
+def _read_tree(root: str) -> dict[str, str]:
+    base = Path(root)
+    return {
+        path.relative_to(base).as_posix(): path.read_text()
+        for path in base.rglob("*")
+        if path.is_file() and (path.suffix == ".py" or path.name == ".coveragerc")
+    }
+
+
+class PooledSandbox(SandboxBackend):
+    """
+    Execução em um worker aquecido do pool (ver tools/pool.py).
+
+    Código e testes são enviados ao worker e os artefatos são extraídos de
+    volta em `tests_dir`.
+    """
+
+    name = "pool"
+
+    def __init__(self, image: str = SANDBOX_IMAGE):
+        self.image = image
+
+    async def run(self, code_dir, tests_dir, args, timeout, timings):
+        pool = get_pool(self.image)
+        if pool is None:
+            return await DockerSandbox(self.image).run(code_dir, tests_dir, args, timeout, timings)
+        # O protocolo com o worker é bloqueante (pipes): roda fora do event loop
+        try:
+            return await asyncio.to_thread(
+                self._run_sync, pool, code_dir, tests_dir, args, timeout, timings
+            )
+        except WorkerError as e:
+            print(f"[Pool] {e} — usando docker run")
+            return await DockerSandbox(self.image).run(code_dir, tests_dir, args, timeout, timings)
+
+    def _run_sync(self, pool, code_dir, tests_dir, args, timeout, timings):
+        inicio = time.perf_counter()
+        with pool.lease() as worker:
+            timings["lease"] = round(time.perf_counter() - inicio, 3)
+            response = worker.run(
+                files=_read_tree(code_dir),
+                tests=_read_tree(tests_dir),
+                args=args,
+                timeout=timeout
+            )
+
+        if response.get("timed_out"):
+            raise subprocess.TimeoutExpired("pytest", timeout)
+
+        if response.get("artifacts"):
+            data = base64.b64decode(response["artifacts"])
+            with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
+                tar.extractall(tests_dir, filter="data")
+
+        return subprocess.CompletedProcess(
+            args=args,
+            returncode=response["returncode"],
+            stdout=response["stdout"],
+            stderr=response["stderr"]
+        )
+
+
+class LocalSandbox(SandboxBackend):
+    """
+    Execução em um subprocesso local, sem Docker.
+
+    Pensado para CI e benchmarks onde o socket do Docker não está disponível
+    ou o custo do container domina. O isolamento vem de rlimits aplicados ao
+    processo do pytest:
+        - CPU: limitada ao timeout da execução
+        - memória: espaço de endereçamento limitado (SANDBOX_LOCAL_MEMORY_MB)
+        - sem fork: RLIMIT_NPROC no mínimo
+        - arquivos: tamanho máximo por arquivo e sem core dumps
+        - usuário: quando o backend roda como root (caso do container do
+          backend), o pytest roda com um uid sem privilégios exclusivo da
+          execução (SANDBOX_LOCAL_UID_BASE em diante) — root ignoraria o
+          RLIMIT_NPROC e as permissões de arquivo
+    O processo roda num diretório temporário próprio (jail), com uma cópia
+    privada do código como diretório atual — o workspace compartilhado (ver
+    tools/workspace.py) nunca é exposto com escrita —, HOME e TMPDIR dentro
+    do jail e ambiente mínimo. Não há isolamento de rede — use o backend
+    Docker para código não confiável em produção.
+    """
+
+    name = "local"
+
+    uid_base = int(os.getenv("SANDBOX_LOCAL_UID_BASE", "200000"))
+    uid_count = 1000
+    _uids_in_use: set[int] = set()
+    _uids_lock = threading.Lock()
+
+    def __init__(self, memory_mb: int | None = None, site_dir: str | None = None):
+        self.memory_mb = memory_mb or int(os.getenv("SANDBOX_LOCAL_MEMORY_MB", "1024"))
+        # Pacotes de terceiros do projeto (ver tools/dependencies.py)
+        self.site_dir = site_dir
+
+    @classmethod
+    def _acquire_uid(cls) -> int | None:
+        # Um uid por execução simultânea: o limite de processos é por usuário,
+        # e execuções com uids distintos não alcançam os arquivos umas das outras
+        if os.geteuid() != 0:
+            return None
+        with cls._uids_lock:
+            for uid in range(cls.uid_base, cls.uid_base + cls.uid_count):
+                if uid not in cls._uids_in_use:
+                    cls._uids_in_use.add(uid)
+                    return uid
+        raise RuntimeError("Nenhum uid livre para o sandbox local")
+
+    @classmethod
+    def _release_uid(cls, uid: int | None) -> None:
+        if uid is not None:
+            with cls._uids_lock:
+                cls._uids_in_use.discard(uid)
+
+    def _limits(self, cpu_seconds: int, uid: int | None):
+        memory = self.memory_mb * 1024 * 1024
+
+        def apply():
+            os.setsid()
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+            resource.setrlimit(resource.RLIMIT_FSIZE, (64 * 1024 * 1024,) * 2)
+            resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+            if uid is None:
+                resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+                return
+            # O próprio processo conta para o limite do novo uid: 1 permite o
+            # exec do pytest e bloqueia qualquer fork
+            resource.setrlimit(resource.RLIMIT_NPROC, (1, 1))
+            os.setgroups([])
+            os.setgid(uid)
+            os.setuid(uid)
+
+        return apply
+
+    @staticmethod
+    def _chown_tree(path: str, uid: int, gid: int) -> None:
+        os.chown(path, uid, gid)
+        for root, dirs, files in os.walk(path):
+            for name in dirs + files:
+                os.chown(os.path.join(root, name), uid, gid, follow_symlinks=False)
+
+    async def run(self, code_dir, tests_dir, args, timeout, timings):
+        jail = tempfile.mkdtemp(prefix="sandbox_")
+        home = os.path.join(jail, "home")
+        os.mkdir(home)
+        source_dir = code_dir
+        code_dir = os.path.join(jail, "code")
+        tests_dir = str(Path(tests_dir).resolve())
+        uid = self._acquire_uid()
+
+        try:
+            # Cópia privada: os arquivos do workspace são hardlinks para blobs
+            # compartilhados entre runs, que o código testado não pode alterar
+            await asyncio.to_thread(
+                shutil.copytree, source_dir, code_dir, copy_function=shutil.copyfile
+            )
+            if uid is not None:
+                # Jail e artefatos pertencem ao uid da execução durante o run
+                await asyncio.to_thread(self._chown_tree, jail, uid, uid)
+                await asyncio.to_thread(self._chown_tree, tests_dir, uid, uid)
+            args = [a.format(code=code_dir, tests=tests_dir) for a in args]
+            env = {
+                "PATH": os.environ.get("PATH", ""),
+                "PYTHONPATH": os.pathsep.join(filter(None, [code_dir, self.site_dir])),
+                "COVERAGE_FILE": os.path.join(tests_dir, ".coverage"),
+                "HOME": home,
+                "TMPDIR": home,
+                "PYTHONDONTWRITEBYTECODE": "1"
+            }
+            return await _exec(
+                [sys.executable, "-m", "pytest", *args],
+                timeout=timeout,
+                cwd=code_dir,
+                env=env,
+                preexec_fn=self._limits(int(timeout), uid)
+            )
+        finally:
+            shutil.rmtree(jail, ignore_errors=True)
+            if uid is not None:
+                # Devolve os artefatos ao backend antes de liberar o uid
+                await asyncio.to_thread(self._chown_tree, tests_dir, os.geteuid(), os.getegid())
+                self._release_uid(uid)
+
+
+BACKENDS: dict[str, type[SandboxBackend]] = {
+    DockerSandbox.name: DockerSandbox,
+    PooledSandbox.name: PooledSandbox,
+    LocalSandbox.name: LocalSandbox,
+}
+
+
+def backend_name() -> str:
+    return os.getenv("SANDBOX_BACKEND", PooledSandbox.name)
+
+
+def get_backend(name: str | None = None, dependencies=None) -> SandboxBackend:
+    """
+    Instancia o backend configurado em SANDBOX_BACKEND (padrão: pool).
+
+    Com `dependencies` (ver tools/dependencies.py) os backends em container
+    usam a imagem com os pacotes do projeto e o local, o site-packages deles.
+    """
+    name = name or backend_name()
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Backend de sandbox desconhecido: '{name}'. "
+            f"Opções: {', '.join(BACKENDS)}"
+        )
+    if dependencies is None:
+        return backend()
+    if backend is LocalSandbox:
+        return LocalSandbox(site_dir=dependencies.site_dir)
+    return backend(dependencies.image)
@@ -0,0 +1,149 @@
+import asyncio
+import heapq
+import os
+import shutil
+import subprocess
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from tools.impact import case_test, write_coverage_xml, write_junit
+from tools.limits import sandbox_limit
+from tools.sandbox import SandboxBackend
+
+# Número de execuções paralelas do sandbox em que a suíte é dividida (cada
+# uma com seu container, worker do pool ou processo local). 1 desliga
+SHARDS = int(os.getenv("SANDBOX_SHARDS", "1"))
+
+# Abaixo disso por shard o custo de subir mais um sandbox não compensa
+MIN_TESTS_PER_SHARD = int(os.getenv("SANDBOX_SHARD_MIN_TESTS", "20"))
+
+SHARDS_DIR = "shards"
+
+
+def load_durations(junit_xml: Path) -> dict[str, float]:
+    """Duração de cada teste numa execução anterior (parametrizações somadas)."""
+    durations: dict[str, float] = {}
+    try:
+        for _, elem in ET.iterparse(junit_xml):
+            if elem.tag == "testcase":
+                name = case_test(elem)
+                durations[name] = durations.get(name, 0.0) + float(elem.attrib.get("time", 0))
+                elem.clear()
+    except (OSError, ET.ParseError):
+        return {}
+    return durations
+
+
+def plan_shards(tests: list[str], durations: dict[str, float],
+                shards: int = SHARDS) -> list[list[str]]:
+    """
+    Divide os testes em até `shards` grupos de duração total parecida.
+
+    Guloso LPT: do teste mais lento para o mais rápido, cada um vai para o
+    grupo com menor soma até ali. Testes sem histórico (novos) contam com a
+    média dos conhecidos. Com poucos testes devolve um único grupo.
+    """
+    count = min(shards, len(tests) // max(MIN_TESTS_PER_SHARD, 1))
+    if count <= 1:
+        return [tests]
+
+    known = [durations[name] for name in tests if name in durations]
+    default = sum(known) / len(known) if known else 1.0
+    ordered = sorted(tests, key=lambda name: durations.get(name, default), reverse=True)
+
+    heap = [(0.0, i) for i in range(count)]
+    groups: list[list[str]] = [[] for _ in range(count)]
+    for name in ordered:
+        load, i = heapq.heappop(heap)
+        groups[i].append(name)
+        heapq.heappush(heap, (load + durations.get(name, default), i))
+    return groups
+
+
+async def _run_shard(backend: SandboxBackend, code_dir: str, shard_dir: Path,
+                     args: list[str], timeout: float, timings: dict[str, float]):
+    inicio = time.perf_counter()
+    shard_timings: dict[str, float] = {}
+    async with sandbox_limit:
+        shard_timings["queue"] = round(time.perf_counter() - inicio, 3)
+        result = await backend.run(code_dir, str(shard_dir), args, timeout, shard_timings)
+    # A fila e o lease do conjunto são os do shard que mais esperou
+    for phase in ("queue", "lease"):
+        if phase in shard_timings:
+            timings[phase] = max(timings.get(phase, 0.0), shard_timings[phase])
+    return result
+
+
+def _combine(base: Path, shard_dirs: list[Path], code_dir: str) -> None:
+    from coverage import CoverageData
+
+    (base / ".coverage").unlink(missing_ok=True)
+    combined = CoverageData(basename=str(base / ".coverage"))
+    for shard_dir in shard_dirs:
+        data = CoverageData(basename=str(shard_dir / ".coverage"))
+        data.read()
+        combined.update(data)
+    combined.write()
+    write_coverage_xml(base, code_dir)
+
+    cases = [
+        case for shard_dir in shard_dirs
+        for case in ET.parse(shard_dir / "junit.xml").iter("testcase")
+    ]
+    write_junit(cases, base / "junit.xml")
+
+
+async def run_sharded(backend: SandboxBackend, code_dir: str, tests_dir: str,
+                      shard_args: list[list[str]], timeout: float,
+                      timings: dict[str, float]) -> subprocess.CompletedProcess:
+    """
+    Roda cada shard em paralelo num diretório de testes próprio e combina os
+    artefatos em `tests_dir`: .coverage (CoverageData.update), coverage.xml
+    regenerado e um junit.xml com todos os casos. O tempo da combinação vai
+    para timings["combine"].
+
+    Se algum shard não produzir coverage ou junit (ex: erro de coleta), nada
+    é combinado e a saída dos shards é devolvida para o executor reportar
+    a falha.
+    """
+    base = Path(tests_dir)
+    shard_dirs = []
+    try:
+        for i in range(len(shard_args)):
+            shard_dir = base / SHARDS_DIR / str(i)
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            # Mesmo módulo de testes e .coveragerc em todos: os nodeids e os
+            # contextos do coverage ficam iguais aos de uma execução única
+            for path in base.iterdir():
+                if path.is_file() and (path.suffix == ".py" or path.name == ".coveragerc"):
+                    shutil.copyfile(path, shard_dir / path.name)
+            shard_dirs.append(shard_dir)
+
+        results = await asyncio.gather(
+            *(
+                _run_shard(backend, code_dir, shard_dir, args, timeout, timings)
+                for shard_dir, args in zip(shard_dirs, shard_args)
+            ),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        stdout = "\n".join(f"[shard {i}]\n{r.stdout}" for i, r in enumerate(results))
+        stderr = "\n".join(f"[shard {i}]\n{r.stderr}" for i, r in enumerate(results) if r.stderr)
+        completed = subprocess.CompletedProcess(
+            args=shard_args,
+            returncode=max(r.returncode for r in results),
+            stdout=stdout,
+            stderr=stderr
+        )
+        if not all((d / ".coverage").exists() and (d / "junit.xml").exists() for d in shard_dirs):
+            return completed
+
+        inicio = time.perf_counter()
+        await asyncio.to_thread(_combine, base, shard_dirs, code_dir)
+        timings["combine"] = round(time.perf_counter() - inicio, 3)
+        return completed
+    finally:
+        shutil.rmtree(base / SHARDS_DIR, ignore_errors=True)
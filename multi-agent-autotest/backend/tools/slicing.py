@@ -0,0 +1,218 @@
+import ast
+from tools.line_ranges import LineRanges
+
+Definition = ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef
+
+
+def match_file(files: dict[str, str], coverage_name: str) -> str | None:
+    """
+    Encontra o arquivo enviado correspondente a um nome do coverage.xml,
+    que vem relativo à raiz do código (ex: "pkg/mod.py").
+    """
+    if coverage_name in files:
+        return coverage_name
+    for filename in files:
+        if filename.endswith("/" + coverage_name) or coverage_name.endswith("/" + filename):
+            return filename
+    return None
+
+
+def _span(node: ast.AST) -> tuple[int, int]:
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    return start, node.end_lineno
+
+
+def _called_names(node: ast.AST) -> set[str]:
+    # Nomes chamados diretamente: f(...), obj.f(...), self.f(...)
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            if isinstance(child.func, ast.Name):
+                names.add(child.func.id)
+            elif isinstance(child.func, ast.Attribute):
+                names.add(child.func.attr)
+    return names
+
+
+def _used_names(node: ast.AST) -> set[str]:
+    return {
+        child.id for child in ast.walk(node)
+        if isinstance(child, ast.Name)
+    } | {
+        child.value.id for child in ast.walk(node)
+        if isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name)
+    }
+
+
+def _bound_names(node: ast.stmt) -> set[str]:
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return {(a.asname or a.name).split(".")[0] for a in node.names}
+    if isinstance(node, (ast.Assign, ast.AnnAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return {
+            child.id for target in targets for child in ast.walk(target)
+            if isinstance(child, ast.Name)
+        }
+    return set()
+
+
+class _Module:
+    """Índice das definições de um arquivo: funções, classes e métodos."""
+
+    def __init__(self, content: str):
+        self.tree = ast.parse(content)
+        self.functions: dict[str, Definition] = {}
+        self.methods: dict[str, list[tuple[ast.ClassDef, Definition]]] = {}
+        self.classes: dict[str, ast.ClassDef] = {}
+        for node in self.tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.functions[node.name] = node
+            elif isinstance(node, ast.ClassDef):
+                self.classes[node.name] = node
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        self.methods.setdefault(item.name, []).append((node, item))
+
+    def enclosing(self, lines: LineRanges) -> list[tuple[ast.ClassDef | None, ast.stmt]]:
+        """
+        Funções, métodos e statements de nível superior que contêm alguma das
+        linhas, pela interseção dos intervalos com o span de cada nó.
+        """
+        found = []
+        for node in self.tree.body:
+            start, end = _span(node)
+            if not lines.intersects(start, end):
+                continue
+            if not isinstance(node, ast.ClassDef):
+                found.append((None, node))
+                continue
+            items = [_span(item) for item in node.body]
+            for item, (item_start, item_end) in zip(node.body, items):
+                if lines.intersects(item_start, item_end):
+                    found.append((node, item))
+            # Linhas da classe fora dos itens (ex: linha do `class`)
+            if lines & LineRanges([(start, end)]) - LineRanges(items):
+                found.append((node, node))
+        return found
+
+
+def slice_context(
+    files: dict[str, str],
+    uncovered_lines: dict[str, LineRanges]
+) -> tuple[dict[str, str], set[tuple[str | None, str]]]:
+    """
+    Monta o contexto mínimo para o Escritor nas iterações seguintes.
+
+    Para cada arquivo com linhas não cobertas, mantém apenas:
+        - as funções/métodos (ou statements de nível superior) que contêm
+          as linhas, localizados pelos intervalos de linha do AST
+        - as funções e métodos chamados diretamente por eles (um nível)
+        - o cabeçalho e o __init__ das classes envolvidas ou instanciadas
+        - os imports e constantes de módulo usados nesses trechos
+
+    Cada trecho é precedido por um comentário com o intervalo de linhas
+    original, para o LLM relacionar as linhas não cobertas ao código.
+
+    Retorna os arquivos recortados e o conjunto de (classe, função) mantidos,
+    usado para filtrar a análise. Arquivos que não parseiam entram inteiros.
+    """
+    sliced: dict[str, str] = {}
+    kept: set[tuple[str | None, str]] = set()
+
+    for coverage_name, lines in uncovered_lines.items():
+        filename = match_file(files, coverage_name)
+        if filename is None or not lines:
+            continue
+        content = files[filename]
+        try:
+            module = _Module(content)
+        except SyntaxError:
+            sliced[filename] = content
+            continue
+
+        selected: dict[int, ast.stmt] = {}
+        classes: set[str] = set()
+
+        def select(cls: ast.ClassDef | None, node: ast.stmt) -> None:
+            if id(node) in selected:
+                return
+            selected[id(node)] = node
+            if cls is not None and node is not cls:
+                classes.add(cls.name)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kept.add((cls.name if cls else None, node.name))
+
+        for cls, node in module.enclosing(lines):
+            select(cls, node)
+
+        # Dependências diretas: funções do módulo e métodos chamados
+        for node in list(selected.values()):
+            for name in _called_names(node):
+                if name in module.functions:
+                    select(None, module.functions[name])
+                if name in module.classes:
+                    classes.add(name)
+                for cls, method in module.methods.get(name, []):
+                    select(cls, method)
+
+        # Classes envolvidas: __init__ e, mais abaixo, o cabeçalho
+        for name in classes:
+            for cls, method in module.methods.get("__init__", []):
+                if cls.name == name:
+                    select(cls, method)
+
+        # Imports e constantes de módulo referenciados pelo recorte
+        used = set()
+        for node in selected.values():
+            used |= _used_names(node)
+        for name in classes:
+            cls = module.classes[name]
+            for expr in cls.bases + cls.decorator_list:
+                used |= _used_names(expr)
+        for node in module.tree.body:
+            if _bound_names(node) & used:
+                selected.setdefault(id(node), node)
+
+        spans = [_span(node) for node in selected.values()]
+        for name in classes:
+            # Cabeçalho da classe: decorators, linha do `class`, docstring e
+            # atributos de classe até o primeiro método
+            cls = module.classes[name]
+            start, _ = _span(cls)
+            header_end = cls.lineno
+            for item in cls.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    break
+                header_end = item.end_lineno
+            spans.append((start, header_end))
+
+        # Ordena pelo início e descarta trechos contidos em outro já mantido
+        # (ex: método de uma classe que entrou inteira)
+        source = content.splitlines()
+        segments: list[str] = []
+        last_end = 0
+        for start, end in sorted(spans, key=lambda span: (span[0], -span[1])):
+            if end <= last_end:
+                continue
+            segments.append(f"# linhas {start}-{end}\n" + "\n".join(source[start - 1:end]))
+            last_end = end
+
+        sliced[filename] = "\n\n".join(segments)
+
+    return sliced, kept
+
+
+def filter_analysis(
+    analysis: dict[str, list],
+    sliced: dict[str, str],
+    kept: set[tuple[str | None, str]]
+) -> dict[str, list]:
+    """Mantém na análise apenas as funções presentes no recorte."""
+    return {
+        filename: [
+            f for f in functions
+            if (f.get("class"), f.get("name")) in kept
+        ]
+        for filename, functions in analysis.items()
+        if filename in sliced
+    }
@@ -0,0 +1,146 @@
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+from tools.cache import CACHE_DIR, sha256
+
+# Blobs (conteúdo dos arquivos, endereçados pelo hash) e workspaces montados
+# a partir deles com hardlinks
+WORKSPACE_DIR = Path(os.getenv("WORKSPACE_DIR", CACHE_DIR / "workspaces"))
+BLOBS_DIR = WORKSPACE_DIR / "blobs"
+TREES_DIR = WORKSPACE_DIR / "trees"
+
+# Workspaces sem uso há mais tempo que isso são removidos pela coleta
+MAX_IDLE = float(os.getenv("WORKSPACE_MAX_IDLE_HOURS", "24")) * 3600
+
+READY_MARKER = ".ready"
+# (inode, tamanho, mtime) de cada arquivo do workspace quando foi montado
+MANIFEST = ".manifest.json"
+
+_lock = threading.Lock()
+
+
+def _blob(content: bytes, digest: str) -> tuple[Path, int]:
+    # Grava o blob uma única vez; devolve o caminho e os bytes escritos. Um
+    # blob existente só é reaproveitado se o conteúdo ainda confere
+    path = BLOBS_DIR / digest[:2] / digest
+    try:
+        if path.read_bytes() == content:
+            return path, 0
+        print(f"[Workspace] Blob {digest[:12]} corrompido — regravando")
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    # Somente leitura: o mesmo inode aparece em todos os workspaces
+    os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(tmp, path)
+    return path, len(content)
+
+
+def _link(blob: Path, target: Path) -> None:
+    try:
+        os.link(blob, target)
+    except OSError:
+        # Sistema de arquivos sem hardlink ou outro dispositivo: cópia
+        shutil.copyfile(blob, target)
+
+
+def _signature(path: Path) -> list[int]:
+    info = path.stat()
+    return [info.st_ino, info.st_size, info.st_mtime_ns]
+
+
+def _intact(tree: Path, files: dict[str, str]) -> bool:
+    # Confere inode, tamanho e mtime de cada arquivo com os do momento da
+    # montagem: qualquer escrita no workspace (ou no blob) invalida o reuso
+    try:
+        manifest = json.loads((tree / MANIFEST).read_text())
+        return manifest.keys() == files.keys() and all(
+            _signature(tree / name) == signature for name, signature in manifest.items()
+        )
+    except (OSError, ValueError):
+        return False
+
+
+def materialize(files: dict[str, str]) -> tuple[Path, int]:
+    """
+    Devolve um diretório com os arquivos do projeto, montado uma única vez.
+
+    O workspace é endereçado pelo conteúdo: o mesmo conjunto de arquivos
+    (em qualquer iteração ou run) resolve para o mesmo diretório, que só é
+    montado na primeira vez — cada arquivo vira um hardlink para o blob com
+    o seu hash. Nas chamadas seguintes nada é escrito: só o mtime do
+    workspace é atualizado, para a coleta saber que ele está em uso. Antes
+    do reuso os arquivos são conferidos com o manifesto da montagem; um
+    workspace alterado é montado de novo, e blobs são conferidos pelo
+    conteúdo antes de entrarem num workspace novo.
+
+    O diretório é compartilhado e nunca deve ser exposto com escrita ao
+    código testado: o Docker o monta somente leitura e o backend local
+    trabalha numa cópia.
+    Retorna o caminho e os bytes gravados em disco (0 quando reaproveitado).
+    """
+    digests = {name: sha256(content) for name, content in files.items()}
+    key = sha256(*(f"{name}:{digests[name]}" for name in sorted(digests)))
+    tree = TREES_DIR / key[:2] / key
+
+    with _lock:
+        if (tree / READY_MARKER).exists():
+            if _intact(tree, files):
+                os.utime(tree)
+                return tree, 0
+            print(f"[Workspace] Workspace {tree.name[:12]} alterado — montando de novo")
+
+        tree.parent.mkdir(parents=True, exist_ok=True)
+        building = Path(tempfile.mkdtemp(prefix=f"{key[:12]}_", dir=tree.parent))
+        written = 0
+        try:
+            for name, content in files.items():
+                blob, size = _blob(content.encode("utf-8"), digests[name])
+                written += size
+                target = building / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _link(blob, target)
+            manifest = {name: _signature(building / name) for name in files}
+            (building / MANIFEST).write_text(json.dumps(manifest))
+            (building / READY_MARKER).touch()
+            shutil.rmtree(tree, ignore_errors=True)
+            building.replace(tree)
+        except BaseException:
+            shutil.rmtree(building, ignore_errors=True)
+            raise
+
+    print(f"[Workspace] {len(files)} arquivos montados em {tree.name[:12]} ({written // 1024} KB novos)")
+    return tree, written
+
+
+def collect() -> dict:
+    """
+    Remove workspaces sem uso há mais de WORKSPACE_MAX_IDLE_HOURS e os blobs
+    que ficaram sem nenhum hardlink.
+    """
+    agora = time.time()
+    removed_trees = removed_blobs = 0
+    with _lock:
+        for tree in TREES_DIR.glob("*/*"):
+            if tree.is_dir() and agora - tree.stat().st_mtime > MAX_IDLE:
+                shutil.rmtree(tree, ignore_errors=True)
+                removed_trees += 1
+        for blob in BLOBS_DIR.glob("*/*"):
+            # Um único link é o do próprio blob store: nenhum workspace o usa.
+            # Workspaces montados por cópia não seguram o blob
+            info = blob.stat()
+            if info.st_nlink == 1 and agora - info.st_mtime > MAX_IDLE:
+                blob.unlink(missing_ok=True)
+                removed_blobs += 1
+
+    if removed_trees or removed_blobs:
+        print(f"[Workspace] {removed_trees} workspaces e {removed_blobs} blobs removidos")
+    return {"removed_trees": removed_trees, "removed_blobs": removed_blobs}
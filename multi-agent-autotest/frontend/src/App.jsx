@@ -15,8 +15,12 @@ export default function App() {
   const [dragOver, setDragOver] = useState(false);
   const inputRef = useRef();
 
+  const ARCHIVE_EXTS = [".zip", ".tar.gz", ".tgz", ".tar"];
+  const isArchive = (f) => ARCHIVE_EXTS.some((ext) => f.name.toLowerCase().endsWith(ext));
+
   const handleFiles = (incoming) => {
-    const pyFiles = Array.from(incoming).filter((f) => f.name.endsWith(".py"));
+    // Arquivos .py ou um projeto compactado (extraído no backend)
+    const pyFiles = Array.from(incoming).filter((f) => f.name.endsWith(".py") || isArchive(f));
     setFiles((prev) => {
       const names = new Set(prev.map((f) => f.name));
       return [...prev, ...pyFiles.filter((f) => !names.has(f.name))];
@@ -31,30 +35,45 @@ export default function App() {
     setLoading(true);
     setReport(null);
     setError(null);
-
-    // Simula progressão visual entre etapas enquanto aguarda resposta
-    let etapaIdx = 0;
     setEtapaAtual(ETAPAS[0]);
-    const intervalo = setInterval(() => {
-      etapaIdx = (etapaIdx + 1) % ETAPAS.length;
-      setEtapaAtual(ETAPAS[etapaIdx]);
-    }, 4000);
 
     const form = new FormData();
-    files.forEach((f) => form.append("files", f));
+    files.forEach((f) => form.append(isArchive(f) ? "archive" : "files", f));
     form.append("threshold", threshold);
     form.append("max_iterations", 5);
 
+    const finalizar = () => {
+      setLoading(false);
+      setEtapaAtual(null);
+    };
+
     try {
-      const res = await fetch(`${API_URL}/analyze`, { method: "POST", body: form });
+      // Submete o job e acompanha o progresso real de cada agente via SSE
+      const res = await fetch(`${API_URL}/jobs`, { method: "POST", body: form });
       if (!res.ok) throw new Error((await res.json()).detail);
-      setReport(await res.json());
+      const { job_id } = await res.json();
+
+      const eventos = new EventSource(`${API_URL}/jobs/${job_id}/events`);
+      eventos.addEventListener("node_start", (e) => setEtapaAtual(JSON.parse(e.data).node));
+      eventos.addEventListener("done", (e) => {
+        eventos.close();
+        setReport(JSON.parse(e.data).report);
+        finalizar();
+      });
+      eventos.addEventListener("error", (e) => {
+        // Erro do job (com payload) ou queda da conexão (sem payload)
+        if (e.data) {
+          eventos.close();
+          setError(JSON.parse(e.data).detail);
+          finalizar();
+        } else if (eventos.readyState === EventSource.CLOSED) {
+          setError("Conexão com o servidor perdida.");
+          finalizar();
+        }
+      });
     } catch (e) {
       setError(e.message);
-    } finally {
-      clearInterval(intervalo);
-      setLoading(false);
-      setEtapaAtual(null);
+      finalizar();
     }
   };
 
@@ -233,8 +252,8 @@ export default function App() {
               onDragLeave={() => setDragOver(false)}
               onDrop={(e) => { e.preventDefault(); setDragOver(false); handleFiles(e.dataTransfer.files); }}
             >
-              <p>Arraste arquivos <strong>.py</strong> aqui<br />ou clique para selecionar</p>
-              <input ref={inputRef} type="file" accept=".py" multiple style={{ display: "none" }} onChange={(e) => handleFiles(e.target.files)} />
+              <p>Arraste arquivos <strong>.py</strong> ou um projeto <strong>.zip</strong>/<strong>.tar.gz</strong> aqui<br />ou clique para selecionar</p>
+              <input ref={inputRef} type="file" accept=".py,.zip,.tar.gz,.tgz,.tar" multiple style={{ display: "none" }} onChange={(e) => handleFiles(e.target.files)} />
             </div>
           </div>
 
@@ -375,7 +394,7 @@ export default function App() {
                         <div className="uncovered-file" key={file}>
                           <div className="fname">{file}</div>
                           <div className="lines">
-                            {lines.map((l) => <span className="line-badge" key={l}>L{l}</span>)}
+                            {lines.split(", ").map((l) => <span className="line-badge" key={l}>L{l}</span>)}
                           </div>
                         </div>
                       ))}